@@ -0,0 +1,364 @@
+# benchmark.py
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+# Headless by default; must be set before Qt is imported
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtCore import QObject, QRect, QThread, pyqtSignal, pyqtSlot, QT_VERSION_STR
+from PyQt6.QtWidgets import QApplication, QGroupBox, QVBoxLayout, QWidget
+import pymodbus
+
+from block_planner import LinkTiming, plan_read_blocks
+from drive_simulator import SimulatedBus
+from drive_snapshot import snapshot_entries
+from register_catalog import load_register_catalog
+from register_codec import BlockCodec, compile_register_codecs
+import main
+
+BENCHMARK_FORMAT = 1
+DEFAULT_BAUDRATE = 19200
+SLAVE_ID = 1
+
+
+def _stats(samples, items, unit, repeat):
+    samples_ms = [s * 1000 for s in samples]
+    return {
+        'unit': unit,
+        'items': items,  # units per timed run, e.g. registers decoded
+        'repeat': repeat,
+        'min_ms': min(samples_ms),
+        'median_ms': statistics.median(samples_ms),
+        'mean_ms': statistics.fmean(samples_ms),
+        'max_ms': max(samples_ms),
+    }
+
+
+def measure(fn, repeat, items=1, unit='run', setup=None):
+    """Times fn() repeat times (after one warm-up run); setup() runs untimed before each."""
+    if setup is not None:
+        setup()
+    fn()
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return _stats(samples, items, unit, repeat)
+
+
+class Benchmarks:
+    """
+    The benchmark cases. Bus cases run a ModbusWorker on the calling thread
+    against the in-process drive simulator: 'bus.*' without wire timing
+    (what the host spends per job), 'wire.*' with the simulated transfer
+    time at DEFAULT_BAUDRATE (what the job takes on a real line).
+    """
+
+    def __init__(self, app, repeat):
+        self.app = app
+        self.repeat = repeat
+        self.catalog = load_register_catalog()
+        self.codecs = compile_register_codecs(self.catalog.entries)
+        self.entries = self.catalog.valid_entries()
+        self.timing = LinkTiming(DEFAULT_BAUDRATE)
+        # The largest parameter tab, and the registers the monitor polls
+        groups = [g for g in self.catalog.group_names() if g != main.MONITOR_GROUP]
+        self.tab_group = max(groups, key=lambda g: len(self.catalog.group_entries(g)))
+        self.tab_entries = self.catalog.group_entries(self.tab_group)
+        self.monitor_entries = self.catalog.group_entries(main.MONITOR_GROUP)
+
+    def cases(self):
+        return {
+            'plan.all_registers': self.plan_all_registers,
+            'decode.block_codec': self.decode_block_codec,
+            'decode.register_codec': self.decode_register_codec,
+            'bus.read_tab': lambda: self.read_tab(False),
+            'bus.snapshot': lambda: self.snapshot(False),
+            'bus.write_batch': lambda: self.write_batch(False),
+            'bus.monitor_cycle': lambda: self.monitor_cycle(False),
+            'wire.read_tab': lambda: self.read_tab(True),
+            'wire.monitor_cycle': lambda: self.monitor_cycle(True),
+            'signal.read_results': self.signal_delivery,
+            'ui.set_value': self.set_value,
+            'ui.apply_monitor_sample': self.apply_monitor_sample,
+            'ui.flow_layout': self.flow_layout,
+        }
+
+    # --- Planning and decoding ---
+
+    def plan_all_registers(self):
+        return measure(lambda: plan_read_blocks(self.entries, self.timing), self.repeat,
+                       len(self.entries), 'register')
+
+    def _blocks_with_words(self):
+        drive = SimulatedBus.with_drives(self.catalog, [SLAVE_ID]).drives[0]
+        blocks = plan_read_blocks(self.entries, self.timing, coalesce=False)
+        return [(b, drive.read_registers(b['start_address'], b['word_count'])) for b in blocks]
+
+    def decode_block_codec(self):
+        blocks = [(BlockCodec(b['start_address'], b['word_count'], [self.codecs[c['id']] for c in b['configs']]), words)
+                  for b, words in self._blocks_with_words()]
+
+        def run():
+            results = {}
+            for codec, words in blocks:
+                codec.decode_into(words, results)
+        return measure(run, self.repeat, len(self.entries), 'register')
+
+    def decode_register_codec(self):
+        registers = []
+        for block, words in self._blocks_with_words():
+            for cfg in block['configs']:
+                codec = self.codecs[cfg['id']]
+                offset = cfg['address'] - block['start_address']
+                registers.append((codec, words[offset:offset + codec.words]))
+
+        def run():
+            for codec, words in registers:
+                codec.decode(words)
+        return measure(run, self.repeat, len(registers), 'register')
+
+    # --- Bus jobs on the simulator ---
+
+    def _worker(self, wire_timing):
+        bus = SimulatedBus.with_drives(self.catalog, [SLAVE_ID], DEFAULT_BAUDRATE, simulate_timing=wire_timing)
+        worker = main.ModbusWorker('SIM', DEFAULT_BAUDRATE, 'N', 1, 1, codecs=self.codecs, slave_ids=[SLAVE_ID],
+                                   client_factory=bus.client)
+        worker.client.connect()
+        # Learn the drive's holes first, as a long-running session would have
+        worker.read_multiple_registers(self.entries, slave_ids=[SLAVE_ID])
+        return worker, bus.drives[0]
+
+    def _repeat(self, wire_timing):
+        return min(self.repeat, 5) if wire_timing else self.repeat
+
+    def read_tab(self, wire_timing):
+        worker, _ = self._worker(wire_timing)
+        return measure(lambda: worker.read_multiple_registers(self.tab_entries, slave_ids=[SLAVE_ID]),
+                       self._repeat(wire_timing), len(self.tab_entries), 'register')
+
+    def snapshot(self, wire_timing):
+        worker, _ = self._worker(wire_timing)
+        entries = snapshot_entries(self.catalog)
+        return measure(lambda: worker.read_snapshot(entries, SLAVE_ID), self._repeat(wire_timing),
+                       len(entries), 'register')
+
+    def write_batch(self, wire_timing):
+        worker, drive = self._worker(wire_timing)
+        # Rewrite the current values: always valid, and leaves the drive unchanged
+        writes = [(e, drive.value(e.id)) for e in self.tab_entries if not e.read_only]
+        return measure(lambda: worker.write_logical_values(writes, SLAVE_ID), self._repeat(wire_timing),
+                       len(writes), 'register')
+
+    def monitor_cycle(self, wire_timing):
+        worker, _ = self._worker(wire_timing)
+        # Plan the cycle, then drive it by hand instead of by the timer
+        worker.start_monitoring(self.monitor_entries, 1.0)
+        worker.stop_monitoring()
+        return measure(worker.run_monitor_cycle, self._repeat(wire_timing), len(self.monitor_entries), 'register')
+
+    # --- Cross-thread signal delivery ---
+
+    def signal_delivery(self):
+        count = 2000
+        payload = {e.id: 0 for e in self.monitor_entries}
+        emitter = _Emitter()
+        thread = QThread()
+        emitter.moveToThread(thread)
+        thread.start()
+        received = [0]
+
+        def on_results(port, slave_id, results):
+            received[0] += 1
+        emitter.read_results.connect(on_results)
+
+        def run():
+            received[0] = 0
+            emitter.start_requested.emit(count, payload)
+            while received[0] < count:
+                self.app.processEvents()
+        try:
+            return measure(run, self.repeat, count, 'signal')
+        finally:
+            thread.quit()
+            thread.wait()
+
+    # --- UI apply paths ---
+
+    def _register_widgets(self, entries):
+        page = QWidget()
+        layout = QVBoxLayout(page)
+        widgets = []
+        flow = main.FlowLayout(spacing=10)
+        box = QGroupBox("benchmark")
+        box.setLayout(flow)
+        for entry in entries:
+            container = QGroupBox(entry.id)
+            container_layout = QVBoxLayout(container)
+            widget = main.RegisterWidget(entry)
+            container_layout.addWidget(widget)
+            flow.addWidget(container)
+            widgets.append(widget)
+        layout.addWidget(box)
+        page.resize(1200, 800)
+        page.show()
+        self.app.processEvents()
+        return page, flow, widgets
+
+    def set_value(self):
+        entries = self.tab_entries + self.monitor_entries
+        page, _, widgets = self._register_widgets(entries)
+        drive = SimulatedBus.with_drives(self.catalog, [SLAVE_ID]).drives[0]
+        values = [drive.value(w.config['id']) for w in widgets]
+        flip = [0]
+
+        def run():
+            # Alternate between two values so every call really changes the widget
+            flip[0] ^= 1
+            for widget, value in zip(widgets, values):
+                widget.set_value(value if flip[0] else value + (1 if value < widget.config.value_range[1] else -1))
+        try:
+            return measure(run, self.repeat, len(widgets), 'widget')
+        finally:
+            page.close()
+
+    def apply_monitor_sample(self):
+        worker, _ = self._worker(False)
+        samples = []
+        worker.monitor_sample.connect(lambda port, slave_id, ts, values: samples.append((port, slave_id, ts, values)))
+        worker.start_monitoring(self.monitor_entries, 1.0)
+        worker.stop_monitoring()
+        for _ in range(2):
+            worker.run_monitor_cycle()
+
+        # The window opens its port on a simulator of its own; only the drive list matters here
+        window = main.MainWindow(simulator=SimulatedBus.with_drives(self.catalog, [SLAVE_ID], DEFAULT_BAUDRATE,
+                                                                    simulate_timing=False))
+        window.show()
+        window.tabs.setCurrentIndex(self.catalog.group_names().index(main.MONITOR_GROUP))
+        window.slave_ids_edit.setText(str(SLAVE_ID))
+        window.connect_device()
+        self.app.processEvents()
+        flip = [0]
+
+        def run():
+            flip[0] ^= 1
+            window.on_monitor_sample(*samples[flip[0]])
+        try:
+            return measure(run, self.repeat, len(self.monitor_entries), 'register')
+        finally:
+            window.close()
+
+    def flow_layout(self):
+        page, flow, widgets = self._register_widgets(self.tab_entries)
+        widths = [0]
+
+        def run():
+            widths[0] = 1400 if widths[0] == 800 else 800
+            flow.heightForWidth(widths[0])
+            flow.setGeometry(QRect(0, 0, widths[0], 2000))
+        try:
+            return measure(run, self.repeat, len(widgets), 'widget')
+        finally:
+            page.close()
+
+
+class _Emitter(QObject):
+    """Emits read_results from its own thread, like ModbusWorker after every block."""
+    read_results = pyqtSignal(str, int, object)
+    start_requested = pyqtSignal(int, object)
+
+    def __init__(self):
+        super().__init__()
+        self.start_requested.connect(self.run)
+
+    @pyqtSlot(int, object)
+    def run(self, count, payload):
+        for _ in range(count):
+            self.read_results.emit('SIM', SLAVE_ID, dict(payload))
+
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(results, baseline, tolerance):
+    """Prints the median change per case against baseline; returns the cases slower by more than tolerance."""
+    regressions = []
+    print(f"{'case':28} {'baseline ms':>12} {'now ms':>12} {'change':>8}")
+    for name, result in results['benchmarks'].items():
+        old = baseline.get('benchmarks', {}).get(name)
+        if old is None:
+            print(f"{name:28} {'-':>12} {result['median_ms']:12.3f}")
+            continue
+        ratio = result['median_ms'] / old['median_ms'] if old['median_ms'] else float('inf')
+        flag = ''
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+            flag = '  <-- 回退'
+        print(f"{name:28} {old['median_ms']:12.3f} {result['median_ms']:12.3f} {ratio - 1:+8.1%}{flag}")
+    return regressions
+
+
+def run(argv=None):
+    parser = argparse.ArgumentParser(description="HSX2M 调试工具性能基准 (使用模拟驱动器, 无需硬件)")
+    parser.add_argument('-o', '--output', help="结果 JSON 文件 (默认输出到标准输出)")
+    parser.add_argument('-n', '--repeat', type=int, default=20, help="每项重复次数")
+    parser.add_argument('-k', '--only', help="只运行名称包含此文字的项目, 逗号分隔")
+    parser.add_argument('--compare', help="与之前的结果 JSON 比较")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="中位数变慢超过此比例视为回退")
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    benchmarks = Benchmarks(app, args.repeat)
+    selected = [s.strip() for s in args.only.split(',')] if args.only else None
+    results = {
+        'format': BENCHMARK_FORMAT,
+        'meta': {
+            'revision': _git_revision(),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'qt': QT_VERSION_STR,
+            'pymodbus': pymodbus.__version__,
+            'platform': platform.platform(),
+            'qpa_platform': os.environ.get('QT_QPA_PLATFORM'),
+            'baudrate': DEFAULT_BAUDRATE,
+        },
+        'benchmarks': {},
+    }
+    for name, case in benchmarks.cases().items():
+        if selected and not any(s in name for s in selected):
+            continue
+        print(f"{name} ...", file=sys.stderr)
+        results['benchmarks'][name] = case()
+
+    text = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    elif not args.compare:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run())
@@ -0,0 +1,131 @@
+# block_planner.py
+import bisect
+
+# Modbus application protocol: FC03 may return at most 125 registers per request,
+# FC16 may write at most 123 (the request PDU carries 2 bytes per register)
+MODBUS_MAX_READ_WORDS = 125
+MODBUS_MAX_WRITE_WORDS = 123
+
+
+def register_word_count(reg_type):
+    return 2 if reg_type in ('u32', 's32') else 1
+
+
+class LinkTiming:
+    """
+    Time model of one Modbus RTU exchange on a serial line.
+    Used by the planner to weigh "one more request" against "read the gap".
+    """
+
+    def __init__(self, baudrate, parity='N', stopbits=1, response_delay=0.005):
+        self.baudrate = baudrate
+        # start bit + 8 data bits + optional parity bit + stop bits
+        bits_per_char = 1 + 8 + (0 if parity == 'N' else 1) + stopbits
+        self.char_time = bits_per_char / baudrate
+        # RTU frames are separated by 3.5 character times (fixed 1.75 ms above 19200 baud)
+        self.frame_gap = 3.5 * self.char_time if baudrate <= 19200 else 0.00175
+        self.response_delay = response_delay
+
+    def read_time(self, word_count):
+        """Seconds for one FC03 request (8 bytes) and its reply (5 + 2n bytes)."""
+        return self.wire_time(8, 5 + 2 * word_count) + self.response_delay
+
+    def wire_time(self, request_bytes, response_bytes):
+        """Seconds both frames of an exchange spend on the line, without the drive's turnaround."""
+        return (request_bytes + response_bytes) * self.char_time + 2 * self.frame_gap
+
+
+def plan_read_blocks(configs, timing=None, holes=(), max_words=MODBUS_MAX_READ_WORDS, coalesce=True):
+    """
+    Groups register configs into FC03 read blocks with the lowest total bus time.
+
+    Blocks may bridge unrequested addresses when that is cheaper than another
+    request (per `timing`), but never bridge an address in `holes` and never
+    span more than `max_words` (capped at the protocol limit), so long
+    ranges are split into consecutive requests. With coalesce=False only exactly adjacent
+    registers are merged. Returns a list of
+    {'start_address', 'word_count', 'configs'} dicts sorted by address; each
+    config's offset inside its block is `cfg['address'] - start_address`.
+    """
+    if not configs:
+        return []
+    # A 32-bit register must always fit in one request
+    max_words = max(2, min(max_words, MODBUS_MAX_READ_WORDS))
+    if timing is None:
+        timing = LinkTiming(19200)
+
+    items = sorted(configs, key=lambda c: c['address'])
+    starts = [c['address'] for c in items]
+    ends = [c['address'] + register_word_count(c['type']) for c in items]
+    covered = set()
+    for start, end in zip(starts, ends):
+        covered.update(range(start, end))
+    gap_holes = sorted(h for h in holes if h not in covered)
+
+    def gap_has_hole(lo, hi):
+        i = bisect.bisect_left(gap_holes, lo)
+        return i < len(gap_holes) and gap_holes[i] < hi
+
+    # best[i]: cheapest plan for items[:i]; cut[i]: first item of the last block
+    n = len(items)
+    best = [0.0] + [float('inf')] * n
+    cut = [0] * (n + 1)
+    for i in range(1, n + 1):
+        block_end = ends[i - 1]
+        for j in range(i - 1, -1, -1):
+            if j < i - 1:
+                # Extending the block leftwards over the gap before items[j + 1]
+                gap_lo, gap_hi = ends[j], starts[j + 1]
+                if gap_hi > gap_lo and (not coalesce or gap_has_hole(gap_lo, gap_hi)):
+                    break
+                block_end = max(block_end, ends[j])
+            span = block_end - starts[j]
+            if span > max_words:
+                break
+            cost = best[j] + timing.read_time(span)
+            if cost < best[i]:
+                best[i], cut[i] = cost, j
+
+    blocks = []
+    i = n
+    while i > 0:
+        j = cut[i]
+        start = starts[j]
+        blocks.append({
+            'start_address': start,
+            'word_count': max(ends[j:i]) - start,
+            'configs': items[j:i],
+        })
+        i = j
+    blocks.reverse()
+    return blocks
+
+
+def plan_write_blocks(writes, max_words=MODBUS_MAX_WRITE_WORDS):
+    """
+    Groups (config, words) pairs into FC16 write blocks.
+
+    Unlike reads, a write can never bridge a gap (it would overwrite the
+    registers in between), so only exactly adjacent registers are merged,
+    up to `max_words` (capped at the protocol limit) per request. A
+    register written twice keeps its last value. Returns a list of
+    {'start_address', 'words', 'items'} dicts sorted by address, where
+    `words` is the request payload and `items` the (config, words) pairs
+    it carries.
+    """
+    max_words = max(2, min(max_words, MODBUS_MAX_WRITE_WORDS))
+    latest = {}
+    for config, words in writes:
+        latest[config['id']] = (config, list(words))
+    items = sorted(latest.values(), key=lambda item: item[0]['address'])
+
+    blocks = []
+    for config, words in items:
+        block = blocks[-1] if blocks else None
+        if (block is not None and config['address'] == block['start_address'] + len(block['words'])
+                and len(block['words']) + len(words) <= max_words):
+            block['words'].extend(words)
+            block['items'].append((config, words))
+        else:
+            blocks.append({'start_address': config['address'], 'words': list(words), 'items': [(config, words)]})
+    return blocks
@@ -0,0 +1,237 @@
+# bus_metrics.py
+import json
+import time
+from array import array
+
+from pymodbus.exceptions import InvalidMessageReceivedException, ModbusIOException
+
+FC_READ_HOLDING_REGISTERS = 0x03
+FC_WRITE_MULTIPLE_REGISTERS = 0x10
+FUNCTION_NAMES = {FC_READ_HOLDING_REGISTERS: "读 (03)", FC_WRITE_MULTIPLE_REGISTERS: "写 (10)"}
+
+# Transaction outcomes
+OUTCOME_OK = 'ok'
+OUTCOME_EXCEPTION = 'exception'  # the drive answered with a Modbus exception response
+OUTCOME_TIMEOUT = 'timeout'  # no (complete) reply
+OUTCOME_CRC = 'crc'  # a reply that failed the CRC or framing check
+OUTCOME_ERROR = 'error'  # anything else, e.g. the port went away
+
+# RTU frame sizes: address + function code + CRC, plus the PDU body
+_EXCEPTION_FRAME_BYTES = 5
+
+
+def rtu_request_bytes(function_code, word_count):
+    if function_code == FC_WRITE_MULTIPLE_REGISTERS:
+        return 9 + 2 * word_count
+    return 8
+
+
+def rtu_response_bytes(function_code, word_count):
+    if function_code == FC_READ_HOLDING_REGISTERS:
+        return 5 + 2 * word_count
+    return 8
+
+
+def classify_error(error):
+    """Outcome of a transaction that raised error."""
+    if isinstance(error, InvalidMessageReceivedException) or 'CRC' in str(error):
+        return OUTCOME_CRC
+    if isinstance(error, ModbusIOException):
+        return OUTCOME_TIMEOUT
+    return OUTCOME_ERROR
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram of integer microseconds with constant relative
+    precision: values below 2**sub_bits get a bucket each, every octave
+    above is split into 2**(sub_bits - 1) equal buckets (about 3 % wide
+    with the default 6 bits). record() is a few integer operations on a
+    flat array, so it can run on every transaction; values above
+    max_value are clamped into the last bucket.
+    """
+    __slots__ = ('sub_bits', 'max_value', 'counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self, sub_bits=6, max_value=60_000_000):
+        self.sub_bits = sub_bits
+        self.max_value = max_value
+        self.reset()
+
+    def reset(self):
+        self.counts = array('Q', bytes(8 * (self._index(self.max_value) + 1)))
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def _index(self, value):
+        if value < 1 << self.sub_bits:
+            return value
+        shift = value.bit_length() - self.sub_bits
+        half = 1 << (self.sub_bits - 1)
+        return (1 << self.sub_bits) + (shift - 1) * half + (value >> shift) - half
+
+    def _bucket_value(self, index):
+        """Midpoint of the values that fall into bucket index."""
+        if index < 1 << self.sub_bits:
+            return index
+        half = 1 << (self.sub_bits - 1)
+        shift, offset = divmod(index - (1 << self.sub_bits), half)
+        shift += 1
+        low = (half + offset) << shift
+        return low + ((1 << shift) - 1) // 2
+
+    def record(self, value):
+        value = min(max(int(value), 0), self.max_value)
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, p):
+        """Value at percentile p (0-100), within the bucket precision; None if empty."""
+        if not self.count:
+            return None
+        rank = max(1, -(-self.count * p // 100))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(max(self._bucket_value(index), self.min), self.max)
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def merge(self, other):
+        for index, n in enumerate(other.counts):
+            if n:
+                self.counts[index] += n
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+
+def _ms(micros):
+    return None if micros is None else micros / 1000
+
+
+class _TransactionStats:
+    __slots__ = ('requests', 'ok', 'exceptions', 'timeouts', 'crc_errors', 'errors', 'retries',
+                 'request_bytes', 'response_bytes', 'latency', 'recent')
+
+    def __init__(self):
+        self.requests = self.ok = self.exceptions = self.timeouts = 0
+        self.crc_errors = self.errors = self.retries = 0
+        self.request_bytes = self.response_bytes = 0
+        self.latency = LatencyHistogram()  # since connect
+        self.recent = LatencyHistogram()  # since the last report
+
+
+class BusMetrics:
+    """
+    Transaction counters and round-trip histograms of one port, per
+    (slave id, function code). Recorded on the worker thread; report()
+    returns a plain-data summary and starts a new "recent" window, so a
+    degrading line shows up in the recent percentiles long before it moves
+    the totals.
+
+    Byte counts are RTU frame sizes computed from the request, not
+    measured on the wire.
+    """
+
+    def __init__(self):
+        self._stats = {}
+        self.started = time.time()
+
+    def _get(self, slave_id, function_code):
+        key = (slave_id, function_code)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = _TransactionStats()
+        return stats
+
+    def record(self, slave_id, function_code, seconds, word_count, outcome):
+        stats = self._get(slave_id, function_code)
+        stats.requests += 1
+        stats.request_bytes += rtu_request_bytes(function_code, word_count)
+        if outcome == OUTCOME_OK:
+            stats.ok += 1
+            stats.response_bytes += rtu_response_bytes(function_code, word_count)
+        elif outcome == OUTCOME_EXCEPTION:
+            stats.exceptions += 1
+            stats.response_bytes += _EXCEPTION_FRAME_BYTES
+        elif outcome == OUTCOME_TIMEOUT:
+            stats.timeouts += 1
+        elif outcome == OUTCOME_CRC:
+            stats.crc_errors += 1
+        else:
+            stats.errors += 1
+        if outcome in (OUTCOME_OK, OUTCOME_EXCEPTION):
+            # Only answered requests measure the line; a timeout measures the timeout setting
+            micros = int(seconds * 1e6)
+            stats.latency.record(micros)
+            stats.recent.record(micros)
+
+    def record_retry(self, slave_id, function_code):
+        self._get(slave_id, function_code).retries += 1
+
+    def reset(self):
+        self._stats.clear()
+        self.started = time.time()
+
+    def report(self):
+        """
+        Returns [{'slave', 'function', counters..., 'p50_ms', 'p90_ms',
+        'p99_ms', 'max_ms', 'mean_ms' (since connect), 'recent_p50_ms',
+        'recent_p99_ms', 'recent_max_ms', 'recent_count'}] sorted by slave
+        and function, and clears the recent windows.
+        """
+        rows = []
+        for (slave_id, function_code), stats in sorted(self._stats.items()):
+            latency, recent = stats.latency, stats.recent
+            rows.append({
+                'slave': slave_id,
+                'function': function_code,
+                'requests': stats.requests,
+                'ok': stats.ok,
+                'exceptions': stats.exceptions,
+                'timeouts': stats.timeouts,
+                'crc_errors': stats.crc_errors,
+                'errors': stats.errors,
+                'retries': stats.retries,
+                'request_bytes': stats.request_bytes,
+                'response_bytes': stats.response_bytes,
+                'p50_ms': _ms(latency.percentile(50)),
+                'p90_ms': _ms(latency.percentile(90)),
+                'p99_ms': _ms(latency.percentile(99)),
+                'max_ms': _ms(latency.max),
+                'mean_ms': _ms(latency.mean()),
+                'recent_count': recent.count,
+                'recent_p50_ms': _ms(recent.percentile(50)),
+                'recent_p99_ms': _ms(recent.percentile(99)),
+                'recent_max_ms': _ms(recent.max),
+            })
+            recent.reset()
+        return rows
+
+
+class MetricsFile:
+    """Appends each port's metrics report to a file as one JSON object per line."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def write(self, port, rows):
+        self._file.write(json.dumps({'time': time.time(), 'port': port, 'metrics': rows}, ensure_ascii=False) + '\n')
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
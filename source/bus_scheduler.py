@@ -0,0 +1,73 @@
+# bus_scheduler.py
+
+# FU500 (通讯地址) range: several drives share one RS-485 line under different addresses
+SLAVE_ID_RANGE = (1, 254)
+
+
+def parse_slave_ids(text):
+    """Parses "1-4,6" into [1, 2, 3, 4, 6]; raises ValueError if malformed or out of range."""
+    ids = set()
+    for part in text.replace('，', ',').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            lo, hi = (int(p) for p in part.split('-', 1))
+        else:
+            lo = hi = int(part)
+        if lo > hi or lo < SLAVE_ID_RANGE[0] or hi > SLAVE_ID_RANGE[1]:
+            raise ValueError(f"从站地址超出范围 {SLAVE_ID_RANGE[0]}-{SLAVE_ID_RANGE[1]}: '{part}'")
+        ids.update(range(lo, hi + 1))
+    if not ids:
+        raise ValueError("未指定从站地址")
+    return sorted(ids)
+
+
+class SlaveScheduler:
+    """
+    Weighted round-robin over the block plans of several slaves on one bus.
+
+    Every slave has its own list of read blocks. One cycle reads each plan
+    once; blocks are interleaved so that no drive waits for another drive's
+    whole plan, and a slave with weight w gets up to w blocks per turn.
+    """
+
+    def __init__(self):
+        self._plans = {}  # slave_id -> [blocks]
+        self._weights = {}
+
+    def set_plan(self, slave_id, blocks, weight=1):
+        self._plans[slave_id] = list(blocks)
+        self._weights[slave_id] = max(1, int(weight))
+
+    def remove(self, slave_id):
+        self._plans.pop(slave_id, None)
+        self._weights.pop(slave_id, None)
+
+    def clear(self):
+        self._plans.clear()
+        self._weights.clear()
+
+    def slave_ids(self):
+        return list(self._plans)
+
+    def block_count(self):
+        return sum(len(blocks) for blocks in self._plans.values())
+
+    def cycle(self):
+        """
+        Yields (slave_id, block, is_last) for one full cycle; is_last marks
+        the final block of that slave's plan, i.e. its sample is complete.
+        """
+        positions = {slave: 0 for slave, blocks in self._plans.items() if blocks}
+        while positions:
+            for slave in list(positions):
+                blocks = self._plans[slave]
+                pos = positions[slave]
+                for block in blocks[pos: pos + self._weights[slave]]:
+                    pos += 1
+                    yield slave, block, pos == len(blocks)
+                if pos >= len(blocks):
+                    del positions[slave]
+                else:
+                    positions[slave] = pos
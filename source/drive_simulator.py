@@ -0,0 +1,438 @@
+# drive_simulator.py
+import math
+import os
+import select
+import struct
+import sys
+import threading
+import time
+import types
+
+try:
+    import termios
+    import tty
+except ImportError:  # Windows: no pty transport, the in-process one still works
+    termios = tty = None
+
+from pymodbus.exceptions import ModbusIOException
+from pymodbus.pdu import ExceptionResponse
+from pymodbus.pdu.register_message import (ReadHoldingRegistersResponse, WriteMultipleRegistersResponse,
+                                           WriteSingleRegisterResponse)
+
+from block_planner import MODBUS_MAX_READ_WORDS, MODBUS_MAX_WRITE_WORDS, LinkTiming
+from register_codec import RegisterCodec
+
+# Modbus exception codes
+ILLEGAL_FUNCTION = 0x01
+ILLEGAL_DATA_ADDRESS = 0x02
+ILLEGAL_DATA_VALUE = 0x03
+
+READ_HOLDING_REGISTERS = 0x03
+WRITE_SINGLE_REGISTER = 0x06
+WRITE_MULTIPLE_REGISTERS = 0x10
+
+# Line settings as the communication parameters store them (FU502 stop bits, FU503 parity, FU504 baud rate)
+STOPBITS_CODES = {1: 0, 2: 1}
+PARITY_CODES = {'N': 0, 'O': 1, 'E': 2}
+BAUDRATE_CODES = {2400: 0, 4800: 1, 9600: 2, 19200: 3, 38400: 4, 57600: 5}
+
+# Value reported by AU-00 (software version)
+SIMULATED_SOFTWARE_VERSION = 9001
+
+_TYPE_RANGES = {
+    'u16': (0, 0xFFFF), 's16': (-0x8000, 0x7FFF), 'enum16': (0, 0xFFFF), 'bit_field': (0, 0xFFFF),
+    'u32': (0, 0xFFFFFFFF), 's32': (-0x80000000, 0x7FFFFFFF),
+}
+
+
+def _clamp(value, lo, hi):
+    return lo if value < lo else hi if value > hi else value
+
+
+class SimulatedDrive:
+    """
+    One HSX2M slave built from the register catalog.
+
+    Only the catalog's valid registers exist: a request touching any other
+    address, a write to a read-only register, to half of a 32-bit register
+    or with a value outside the register's range or options gets the
+    exception response a drive would send. Values are kept as words and
+    encoded with the registers' own codecs, so word order is honored.
+    SU-xx monitor registers are not stored but computed from the clock on
+    every read (a sine per register, a counting pattern for I/O bit
+    fields). The line settings the drive answers on are its FU502-FU504
+    values, and FU500 is its slave id.
+    """
+
+    def __init__(self, catalog, slave_id=1, baudrate=19200, parity='N', stopbits=1, clock=time.monotonic):
+        self.clock = clock
+        self._entries = {}  # word address -> RegisterEntry covering it
+        self._codecs = {}
+        self._waves = {}  # id -> (offset, amplitude, frequency, phase) of SU-xx registers
+        self.words = {}
+        for index, entry in enumerate(catalog.valid_entries()):
+            self._codecs[entry.id] = RegisterCodec(entry)
+            for address in range(entry.address, entry.end_address):
+                self._entries[address] = entry
+            if entry.id.startswith('SU-'):
+                self._waves[entry.id] = self._wave(entry, index)
+            else:
+                self._store(entry, self._initial_value(entry))
+        self.set_value('FU500', slave_id)
+        self.set_line_settings(baudrate, parity, stopbits)
+
+    @staticmethod
+    def _initial_value(entry):
+        if entry.id == 'AU-00':
+            return SIMULATED_SOFTWARE_VERSION
+        if entry.options:
+            return min(entry.options)
+        lo, hi = _TYPE_RANGES[entry.type]
+        return _clamp(0, max(lo, entry.value_range[0]), min(hi, entry.value_range[1]))
+
+    @staticmethod
+    def _wave(entry, index):
+        lo, hi = _TYPE_RANGES[entry.type]
+        if entry.range:
+            lo, hi = max(lo, entry.value_range[0]), min(hi, entry.value_range[1])
+        amplitude = min(1000, (hi - lo) // 2)
+        offset = _clamp(0, lo + amplitude, hi - amplitude)
+        return offset, amplitude, 0.2 + 0.1 * (index % 8), index * 0.7
+
+    def _store(self, entry, value):
+        for address, word in zip(range(entry.address, entry.end_address), self._codecs[entry.id].encode(value)):
+            self.words[address] = word
+
+    def _wave_words(self, entry, now):
+        offset, amplitude, frequency, phase = self._waves[entry.id]
+        if entry.type == 'bit_field':
+            value = int(now * frequency * 4) & 0xFF
+        else:
+            value = round(offset + amplitude * math.sin(2 * math.pi * frequency * now + phase))
+        return self._codecs[entry.id].encode(value)
+
+    @property
+    def slave_id(self):
+        return self.value('FU500')
+
+    def value(self, reg_id):
+        codec = self._codecs[reg_id]
+        return codec.decode(self.read_registers(codec.address, codec.words))
+
+    def set_value(self, reg_id, value):
+        """Sets a register directly, bypassing the checks a bus write gets."""
+        codec = self._codecs[reg_id]
+        self._store(self._entries[codec.address], value)
+
+    def line_settings(self):
+        """(baudrate, parity, stopbits) from FU504, FU503, FU502."""
+        def find(codes, value):
+            return next(k for k, v in codes.items() if v == value)
+        return (find(BAUDRATE_CODES, self.value('FU504')), find(PARITY_CODES, self.value('FU503')),
+                find(STOPBITS_CODES, self.value('FU502')))
+
+    def set_line_settings(self, baudrate, parity='N', stopbits=1):
+        self.set_value('FU504', BAUDRATE_CODES[baudrate])
+        self.set_value('FU503', PARITY_CODES[parity])
+        self.set_value('FU502', STOPBITS_CODES[stopbits])
+
+    def read_registers(self, address, count):
+        """Returns the words at address..address+count, or an exception code."""
+        if not 1 <= count <= MODBUS_MAX_READ_WORDS:
+            return ILLEGAL_DATA_VALUE
+        words = []
+        now = None
+        end = address + count
+        while address < end:
+            entry = self._entries.get(address)
+            if entry is None:
+                return ILLEGAL_DATA_ADDRESS
+            if entry.id in self._waves:
+                if now is None:
+                    now = self.clock()
+                entry_words = self._wave_words(entry, now)
+            else:
+                entry_words = [self.words[a] for a in range(entry.address, entry.end_address)]
+            words.extend(entry_words[address - entry.address:end - entry.address])
+            address = entry.end_address
+        return words
+
+    def write_registers(self, address, words):
+        """Writes words at address; returns None or an exception code. Nothing is written if any register fails."""
+        if not 1 <= len(words) <= MODBUS_MAX_WRITE_WORDS:
+            return ILLEGAL_DATA_VALUE
+        start, end = address, address + len(words)
+        writes = []
+        while address < end:
+            entry = self._entries.get(address)
+            if entry is None or entry.read_only or entry.address != address or entry.end_address > end:
+                return ILLEGAL_DATA_ADDRESS
+            codec = self._codecs[entry.id]
+            offset = address - start
+            value = codec.decode(words[offset:offset + codec.words])
+            if entry.options:
+                if value not in entry.options:
+                    return ILLEGAL_DATA_VALUE
+            elif not entry.value_range[0] <= value <= entry.value_range[1]:
+                return ILLEGAL_DATA_VALUE
+            writes.append((entry, value))
+            address = entry.end_address
+        for entry, value in writes:
+            self._store(entry, value)
+        return None
+
+
+class SimulatedBus:
+    """
+    An RS-485 line with simulated drives on it. A drive only answers a
+    request sent with its own line settings, like a real one; with
+    simulate_timing, every transaction also takes as long as it would on
+    the wire at that baud rate (LinkTiming), and a request nobody answers
+    takes the client's timeout.
+    """
+
+    def __init__(self, drives=(), simulate_timing=True):
+        self.simulate_timing = simulate_timing
+        self._drives = list(drives)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def with_drives(cls, catalog, slave_ids=(1,), baudrate=19200, parity='N', stopbits=1, simulate_timing=True):
+        return cls([SimulatedDrive(catalog, slave_id, baudrate, parity, stopbits) for slave_id in slave_ids],
+                   simulate_timing)
+
+    @property
+    def drives(self):
+        return list(self._drives)
+
+    def add_drive(self, drive):
+        with self._lock:
+            self._drives.append(drive)
+
+    def _drive(self, slave_id, line_settings):
+        for drive in self._drives:
+            if drive.slave_id == slave_id and drive.line_settings() == line_settings:
+                return drive
+        return None
+
+    def transact(self, slave_id, function_code, address, payload, line_settings):
+        """
+        Runs one request against the line; payload is the word count of a
+        read or the words of a write. Returns None (no reply), the reply
+        words / True, or an exception code (int). Slave 0 writes to every
+        drive on these line settings and never gets a reply.
+        """
+        with self._lock:
+            if slave_id == 0:
+                if function_code != READ_HOLDING_REGISTERS:
+                    for drive in self._drives:
+                        if drive.line_settings() == line_settings:
+                            drive.write_registers(address, payload)
+                return None
+            drive = self._drive(slave_id, line_settings)
+            if drive is None:
+                return None
+            if function_code == READ_HOLDING_REGISTERS:
+                return drive.read_registers(address, payload)
+            if function_code in (WRITE_SINGLE_REGISTER, WRITE_MULTIPLE_REGISTERS):
+                return drive.write_registers(address, payload) or True
+            return ILLEGAL_FUNCTION
+
+    def client(self, port='SIM', baudrate=19200, parity='N', stopbits=1, timeout=1, **kwargs):
+        """A ModbusSerialClient stand-in on this line; takes the same keyword arguments."""
+        return SimulatedClient(self, port, baudrate, parity, stopbits, timeout)
+
+
+class SimulatedClient:
+    """
+    In-process replacement for ModbusSerialClient on a SimulatedBus: the
+    subset of its interface ModbusWorker uses, returning pymodbus response
+    objects (or raising ModbusIOException when no drive answers).
+    """
+
+    def __init__(self, bus, port='SIM', baudrate=19200, parity='N', stopbits=1, timeout=1):
+        self.bus = bus
+        self.port = port
+        # Same place as ModbusSerialClient, where a caller may change it between requests
+        self.comm_params = types.SimpleNamespace(timeout_connect=timeout)
+        self.line_settings = (baudrate, parity, stopbits)
+        self.timing = LinkTiming(baudrate, parity, stopbits)
+        self._open = False
+
+    def connect(self):
+        self._open = True
+        return True
+
+    def close(self):
+        self._open = False
+
+    def is_socket_open(self):
+        return self._open
+
+    def _transact(self, slave, function_code, address, payload, request_words, reply_words):
+        if not self._open:
+            raise ModbusIOException("Client is not connected")
+        reply = self.bus.transact(slave, function_code, address, payload, self.line_settings)
+        if self.bus.simulate_timing:
+            if reply is None:
+                time.sleep(self.comm_params.timeout_connect)
+            else:
+                words = reply_words if isinstance(reply, (list, bool)) else 0
+                time.sleep(self.timing.read_time(0) + 2 * (request_words + words) * self.timing.char_time)
+        if reply is None:
+            if slave == 0:
+                return None
+            raise ModbusIOException(f"No response received from slave {slave} on {self.port}")
+        if isinstance(reply, int) and not isinstance(reply, bool):
+            return ExceptionResponse(function_code, reply, slave=slave)
+        return reply
+
+    def read_holding_registers(self, address, count=1, slave=1):
+        reply = self._transact(slave, READ_HOLDING_REGISTERS, address, count, 0, count)
+        if isinstance(reply, list):
+            return ReadHoldingRegistersResponse(dev_id=slave, address=address, count=count, registers=reply)
+        return reply
+
+    def write_registers(self, address, values, slave=1):
+        values = list(values)
+        reply = self._transact(slave, WRITE_MULTIPLE_REGISTERS, address, values, len(values), 0)
+        if reply is True:
+            return WriteMultipleRegistersResponse(dev_id=slave, address=address, count=len(values))
+        return reply
+
+    def write_register(self, address, value, slave=1):
+        reply = self._transact(slave, WRITE_SINGLE_REGISTER, address, [value], 1, 0)
+        if reply is True:
+            return WriteSingleRegisterResponse(dev_id=slave, address=address, registers=[value])
+        return reply
+
+
+def modbus_crc(data):
+    crc = 0xFFFF
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+    return struct.pack('<H', crc)
+
+
+_TERMIOS_BAUDRATES = {getattr(termios, f"B{b}"): b for b in BAUDRATE_CODES if hasattr(termios, f"B{b}")} \
+    if termios else {}
+
+
+class PtyServer:
+    """
+    Serves a SimulatedBus as Modbus RTU on a pseudo terminal, for clients
+    that need a real serial device (the app itself, other tools): open
+    `device` as the serial port. The line settings a request is sent with
+    are read from the terminal attributes the client set, and the reply is
+    delayed by its time on the wire. Linux ptys do not keep a parity
+    setting (even parity is refused outright), so a drive served here
+    should use parity N.
+    """
+
+    def __init__(self, bus):
+        if termios is None:
+            raise OSError("此平台不支持伪终端")
+        self.bus = bus
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        self.device = os.ttyname(self._slave)
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=f"PtyServer({self.device})", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+        os.close(self._master)
+        os.close(self._slave)
+
+    def _line_settings(self):
+        _, _, cflag, _, ispeed, _, _ = termios.tcgetattr(self._slave)
+        parity = 'N' if not cflag & termios.PARENB else 'O' if cflag & termios.PARODD else 'E'
+        return _TERMIOS_BAUDRATES.get(ispeed, 0), parity, 2 if cflag & termios.CSTOPB else 1
+
+    def _run(self):
+        buffer = b''
+        while self._running:
+            ready, _, _ = select.select([self._master], [], [], 0.05)
+            if not ready:
+                buffer = b''  # a silent line ends any partial frame
+                continue
+            buffer += os.read(self._master, 512)
+            while buffer:
+                length = self._frame_length(buffer)
+                if length is None or len(buffer) < length:
+                    break
+                frame, buffer = buffer[:length], buffer[length:]
+                if modbus_crc(frame[:-2]) == frame[-2:]:
+                    self._answer(frame[:-2])
+
+    @staticmethod
+    def _frame_length(buffer):
+        if len(buffer) < 2:
+            return None
+        if buffer[1] in (READ_HOLDING_REGISTERS, WRITE_SINGLE_REGISTER):
+            return 8
+        if buffer[1] == WRITE_MULTIPLE_REGISTERS:
+            return 9 + buffer[6] if len(buffer) >= 7 else None
+        return len(buffer)  # unsupported function: whatever has arrived
+
+    def _answer(self, request):
+        slave_id, function_code = request[0], request[1]
+        line_settings = self._line_settings()
+        if function_code == READ_HOLDING_REGISTERS:
+            address, count = struct.unpack('>HH', request[2:6])
+            reply = self.bus.transact(slave_id, function_code, address, count, line_settings)
+            body = bytes((len(reply) * 2,)) + struct.pack(f'>{len(reply)}H', *reply) \
+                if isinstance(reply, list) else None
+        elif function_code == WRITE_SINGLE_REGISTER:
+            address, value = struct.unpack('>HH', request[2:6])
+            reply = self.bus.transact(slave_id, function_code, address, [value], line_settings)
+            body = request[2:6]
+        elif function_code == WRITE_MULTIPLE_REGISTERS:
+            address, count = struct.unpack('>HH', request[2:6])
+            words = list(struct.unpack(f'>{count}H', request[7:7 + 2 * count]))
+            reply = self.bus.transact(slave_id, function_code, address, words, line_settings)
+            body = request[2:6]
+        else:
+            reply = self.bus.transact(slave_id, function_code, 0, None, line_settings)
+            body = None
+        if reply is None:
+            return
+        if isinstance(reply, int) and not isinstance(reply, bool):
+            response = bytes((slave_id, function_code | 0x80, reply))
+        else:
+            response = bytes((slave_id, function_code)) + body
+        if self.bus.simulate_timing and line_settings[0]:
+            timing = LinkTiming(*line_settings)
+            time.sleep(timing.response_delay + (len(request) + len(response) + 4) * timing.char_time)
+        os.write(self._master, response + modbus_crc(response))
+
+
+def main(argv):
+    """python drive_simulator.py [slave ids, e.g. 1-4] [baudrate]: serves simulated drives on a pty."""
+    from bus_scheduler import parse_slave_ids
+    from register_catalog import load_register_catalog
+
+    slave_ids = parse_slave_ids(argv[1]) if len(argv) > 1 else [1]
+    baudrate = int(argv[2]) if len(argv) > 2 else 19200
+    bus = SimulatedBus.with_drives(load_register_catalog(), slave_ids, baudrate)
+    server = PtyServer(bus).start()
+    print(f"模拟驱动器 (从站 {argv[1] if len(argv) > 1 else 1}, {baudrate} bit/s) 串口: {server.device}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,120 @@
+# drive_snapshot.py
+import hashlib
+import struct
+import sys
+import time
+from array import array
+
+from register_catalog import COMMAND_REGISTER_IDS, PASSWORD_REGISTER_IDS
+
+SNAPSHOT_MAGIC = b'HSXS'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = '.hsxs'
+# magic, version, slave id, layout hash, created (unix time), word count
+_HEADER = struct.Struct('<4sHH8sdI')
+
+# Groups a restore leaves alone: the target drive keeps its own bus address and baud rate
+RESTORE_SKIPPED_GROUPS = ('通讯参数',)
+# Registers a snapshot never holds: replaying a command mid-restore would run it
+# (and fail verification once it clears itself), and passwords are not parameters
+RESTORE_SKIPPED_IDS = COMMAND_REGISTER_IDS + PASSWORD_REGISTER_IDS
+
+
+def layout_hash(entries):
+    """8-byte digest of the register layout (id, address, type, word order) a snapshot depends on."""
+    digest = hashlib.sha256()
+    for e in sorted(entries, key=lambda e: e['address']):
+        digest.update(f"{e['id']}:{e['address']}:{e['type']}:{e.get('word_order', 'big')};".encode())
+    return digest.digest()[:8]
+
+
+def snapshot_entries(catalog):
+    """The registers a snapshot holds: every valid, writable register except RESTORE_SKIPPED_IDS, by address."""
+    return [e for e in catalog.valid_entries() if not e.read_only and e.id not in RESTORE_SKIPPED_IDS]
+
+
+def _le_bytes(words):
+    if sys.byteorder != 'little':
+        words = array('H', words)
+        words.byteswap()
+    return words.tobytes()
+
+
+def _le_array(data):
+    words = array('H')
+    words.frombytes(data)
+    if sys.byteorder != 'little':
+        words.byteswap()
+    return words
+
+
+class DriveSnapshot:
+    """
+    Raw parameter words of one drive, as two parallel arrays (word address,
+    word value) plus the hash of the register layout they were read with.
+
+    File format (little-endian): a fixed header (magic, version, slave id,
+    layout hash, creation time, word count) followed by the address array
+    and the value array, 2 bytes per word each.
+    """
+    __slots__ = ('slave_id', 'layout', 'created', 'addresses', 'words')
+
+    def __init__(self, slave_id, layout, addresses, words, created=None):
+        if len(addresses) != len(words):
+            raise ValueError("Address and value arrays differ in length")
+        self.slave_id = slave_id
+        self.layout = layout
+        self.created = time.time() if created is None else created
+        self.addresses = array('H', addresses)
+        self.words = array('H', words)
+
+    def __len__(self):
+        return len(self.addresses)
+
+    @classmethod
+    def from_values(cls, entries, values, codecs, slave_id=1):
+        """Builds a snapshot from {id: value} read for entries; registers without a value are left out."""
+        addresses, words = array('H'), array('H')
+        for e in sorted(entries, key=lambda e: e['address']):
+            value = values.get(e['id'])
+            if value is None or isinstance(value, Exception):
+                continue
+            raw = codecs[e['id']].encode(value)
+            addresses.extend(range(e['address'], e['address'] + len(raw)))
+            words.extend(raw)
+        return cls(slave_id, layout_hash(entries), addresses, words)
+
+    def values(self, entries, codecs):
+        """Returns [(entry, value)] for every entry whose words are all in the snapshot."""
+        stored = dict(zip(self.addresses, self.words))
+        result = []
+        for e in entries:
+            codec = codecs[e['id']]
+            raw = [stored.get(address) for address in range(e['address'], e['address'] + codec.words)]
+            if None not in raw:
+                result.append((e, codec.decode(raw)))
+        return result
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, self.slave_id, self.layout,
+                                 self.created, len(self.addresses)))
+            f.write(_le_bytes(self.addresses))
+            f.write(_le_bytes(self.words))
+
+    @classmethod
+    def load(cls, path):
+        """Reads a snapshot file; raises ValueError if it is not one or is truncated."""
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) < _HEADER.size:
+            raise ValueError("文件过短, 不是参数快照")
+        magic, version, slave_id, layout, created, count = _HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("不是参数快照文件")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"不支持的快照版本 {version}")
+        body = data[_HEADER.size:]
+        if len(body) != 4 * count:
+            raise ValueError("快照文件不完整")
+        return cls(slave_id, layout, _le_array(body[:2 * count]), _le_array(body[2 * count:]), created)
@@ -0,0 +1,77 @@
+# log_events.py
+import time
+
+DEBUG = 'debug'
+INFO = 'info'
+WARN = 'warn'
+ERROR = 'error'
+# Levels from least to most severe; a threshold keeps its level and everything above
+LOG_LEVELS = (DEBUG, INFO, WARN, ERROR)
+LEVEL_RANKS = {level: rank for rank, level in enumerate(LOG_LEVELS)}
+
+# Message text per event code. Templates see the event's fields (port,
+# slave, address, count, duration_ms) and its detail keywords.
+EVENT_TEMPLATES = {
+    'message': "{text}",
+    'cache_hit': "从站{slave}: {count} 个寄存器取自缓存",
+    'job_cancelled': "读取任务 #{job_id} 已取消",
+    'snapshot_read': "读取参数快照 从站{slave}: {registers} 个寄存器, {count} 次读取",
+    'block_read': "批量读取: 从站={slave}, 地址={address}, 数量={count}, 耗时={duration_ms:.1f} ms",
+    'block_read_failed': "块读取失败: 从站={slave}, 地址={address}, 错误: {error}",
+    'block_rejected': "块读取被拒绝, 拆分重试: 从站={slave}, 地址={address}, 数量={count}",
+    'holes_learned': "记录不可读地址: {holes}",
+    'block_decode_failed': "块解码失败: 从站={slave}, 地址={address}, 错误: {error}",
+    'monitor_started': "开始监控 {registers} 个寄存器 × {slaves} 个从站 @ {rate_hz:g} Hz, 每周期 {count} 次读取",
+    'monitor_rate_limited': "采样频率 {rate_hz:g} Hz 超出总线能力 (每周期约 {cycle_ms:.1f} ms), 按 {max_hz:.1f} Hz 监控",
+    'monitor_stopped': "监控已停止",
+    'connected': "串口 {port} 已连接。",
+    'connect_failed': "连接串口 {port} 失败: {error}",
+    'disconnected': "连接已断开 {port}。",
+    'write': "写入 从站{slave} {reg_id} (地址: {address}) 值: {value}",
+    'write_ok': "写入成功: 从站{slave} {reg_id} = {value}",
+    'write_failed': "写入 从站{slave} {reg_id} 失败: {error}",
+    'batch_write': "批量写入 从站{slave}: {registers} 个寄存器, {count} 次请求",
+    'block_write_failed': "块写入失败: 从站={slave}, 地址={address}, 数量={count}, 错误: {error}",
+    'write_verified': "回读校验 从站{slave}: {matched}/{count} 一致",
+}
+
+
+def level_rank(level):
+    """Unknown levels rank as info, so they are never filtered out by mistake."""
+    return LEVEL_RANKS.get(level, LEVEL_RANKS[INFO])
+
+
+class LogEvent:
+    """
+    One log entry as data: level, event code and the transaction fields it
+    concerns (port, slave, address, count, duration in seconds), plus free
+    detail keywords for the template. The text is only rendered by
+    message(), i.e. by a sink that actually shows or stores the event.
+    """
+    __slots__ = ('time', 'level', 'code', 'port', 'slave', 'address', 'count', 'duration', 'detail')
+
+    def __init__(self, level, code, port=None, slave=None, address=None, count=None, duration=None, **detail):
+        self.time = time.time()
+        self.level = level
+        self.code = code
+        self.port = port
+        self.slave = slave
+        self.address = address
+        self.count = count
+        self.duration = duration
+        self.detail = detail
+
+    @classmethod
+    def text(cls, level, message):
+        """An event that is just a preformatted message."""
+        return cls(level, 'message', text=message)
+
+    def message(self):
+        template = EVENT_TEMPLATES.get(self.code)
+        if template is None:
+            return f"{self.code} {self.detail}"
+        return template.format(port=self.port, slave=self.slave, address=self.address, count=self.count,
+                               duration_ms=(self.duration or 0.0) * 1000, **self.detail)
+
+    def __repr__(self):
+        return f"LogEvent({self.level!r}, {self.code!r}, port={self.port!r}, slave={self.slave!r})"
@@ -0,0 +1,223 @@
+# log_panel.py
+import os
+import time
+from collections import deque
+
+from PyQt6.QtCore import QTimer, pyqtSignal
+from PyQt6.QtGui import QColor, QTextCharFormat, QTextCursor
+from PyQt6.QtWidgets import (QGroupBox, QPlainTextEdit, QHBoxLayout, QVBoxLayout, QPushButton, QComboBox, QLabel,
+                             QCheckBox, QFileDialog)
+
+from log_events import DEBUG, INFO, WARN, ERROR, LogEvent, level_rank
+
+LEVEL_COLORS = {DEBUG: "#95A5A6", INFO: "#2ECC71", WARN: "#F39C12", ERROR: "#E74C3C"}
+LEVEL_FILTERS = (("调试", DEBUG), ("信息", INFO), ("警告及以上", WARN), ("仅错误", ERROR))
+
+
+def format_event(event):
+    timestamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(event.time))
+    return f"[{timestamp}][{event.level.upper()}] {event.message()}"
+
+
+class RotatingLogFile:
+    """
+    Appends formatted log lines to a file, flushed once per batch. Before a
+    line would take the file past max_bytes, the file is renamed to path.1
+    (path.1 to path.2, ...; the oldest of backup_count is dropped) and a new
+    one is started.
+    """
+
+    def __init__(self, path, max_bytes=5 * 1024 * 1024, backup_count=3, level=INFO):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.level = level
+        self._file = open(path, 'a', encoding='utf-8')
+        self._size = self._file.tell()
+
+    def write_lines(self, lines):
+        for line in lines:
+            size = len(line.encode('utf-8')) + 1
+            if self._size and self._size + size > self.max_bytes:
+                self._rotate()
+            self._file.write(line + '\n')
+            self._size += size
+        if lines:
+            self._file.flush()
+
+    def _rotate(self):
+        self._file.close()
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._size = 0
+
+    def close(self):
+        self._file.close()
+
+
+class LogPanel(QGroupBox):
+    """
+    Log output with bounded cost per message.
+
+    append_event() only stores the LogEvent in a ring of the last `capacity`
+    events and returns; a flush timer formats and renders the events that
+    pass the view's level in one edit block. The view keeps at most
+    `max_lines` lines (older ones are dropped by the document), so a long
+    session neither grows memory nor slows down appends. Changing the
+    view's level re-renders from the ring. An optional file sink receives
+    every event at or above its own level, a batch per flush.
+
+    The view and the file sink each have a level; threshold() is the lowest
+    of them and threshold_changed reports changes, so event producers can
+    skip what no sink would show.
+    """
+    threshold_changed = pyqtSignal(str)  # lowest level any sink shows
+
+    def __init__(self, title="输出日志", capacity=20000, max_lines=5000, flush_interval_ms=100, parent=None):
+        super().__init__(title, parent)
+        self.max_lines = max_lines
+        self.level = INFO
+        self.file_sink = None
+        self._threshold = level_rank(self.threshold())
+        self._events = deque(maxlen=capacity)
+        self._pending = deque(maxlen=capacity)  # events not yet flushed
+        self._formats = {}
+        for level, color in LEVEL_COLORS.items():
+            char_format = QTextCharFormat()
+            char_format.setForeground(QColor(color))
+            self._formats[level] = char_format
+        self._default_format = QTextCharFormat()
+        self._default_format.setForeground(QColor("white"))
+
+        layout = QVBoxLayout(self)
+        self.output = QPlainTextEdit()
+        self.output.setReadOnly(True)
+        self.output.setMaximumBlockCount(max_lines)
+        self.output.setUndoRedoEnabled(False)
+
+        btn_bar_layout = QHBoxLayout()
+        self.level_combo = QComboBox()
+        self.file_level_combo = QComboBox()
+        for label, level in LEVEL_FILTERS:
+            self.level_combo.addItem(label, level)
+            self.file_level_combo.addItem(label, level)
+        self.level_combo.setCurrentIndex(self.level_combo.findData(self.level))
+        self.file_level_combo.setCurrentIndex(self.file_level_combo.findData(INFO))
+        self.file_check = QCheckBox("写入文件")
+        self.file_check.setToolTip("同时写入日志文件 (超过大小后自动轮换)")
+        clear_btn = QPushButton("清空")
+        btn_bar_layout.addWidget(QLabel("级别:"))
+        btn_bar_layout.addWidget(self.level_combo)
+        btn_bar_layout.addWidget(self.file_check)
+        btn_bar_layout.addWidget(self.file_level_combo)
+        btn_bar_layout.addStretch()
+        btn_bar_layout.addWidget(clear_btn)
+
+        layout.addWidget(self.output)
+        layout.addLayout(btn_bar_layout)
+
+        self.level_combo.currentIndexChanged.connect(lambda: self.set_level(self.level_combo.currentData()))
+        self.file_level_combo.currentIndexChanged.connect(
+            lambda: self.set_file_level(self.file_level_combo.currentData()))
+        self.file_check.toggled.connect(self._toggle_file_sink)
+        clear_btn.clicked.connect(self.clear)
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.timeout.connect(self.flush)
+        self._flush_timer.start(flush_interval_ms)
+
+    def append(self, level, message):
+        self.append_event(LogEvent.text(level, message))
+
+    def append_event(self, event):
+        if level_rank(event.level) < self._threshold:
+            return  # no sink shows it
+        self._events.append(event)
+        self._pending.append(event)
+
+    def threshold(self):
+        levels = [self.level] if self.file_sink is None else [self.level, self.file_sink.level]
+        return min(levels, key=level_rank)
+
+    def _update_threshold(self):
+        threshold = self.threshold()
+        if level_rank(threshold) != self._threshold:
+            self._threshold = level_rank(threshold)
+            self.threshold_changed.emit(threshold)
+
+    def set_level(self, level):
+        """Shows events at level and above, including those already received."""
+        self.flush()
+        self.level = level
+        self._update_threshold()
+        self.output.clear()
+        self._render(self._events)
+
+    def set_file_level(self, level):
+        if self.file_sink is not None:
+            self.flush()
+            self.file_sink.level = level
+            self._update_threshold()
+
+    def clear(self):
+        self.flush()
+        self._events.clear()
+        self.output.clear()
+
+    def flush(self):
+        if not self._pending:
+            return
+        events = list(self._pending)
+        self._pending.clear()
+        if self.file_sink is not None:
+            rank = level_rank(self.file_sink.level)
+            self.file_sink.write_lines([format_event(e) for e in events if level_rank(e.level) >= rank])
+        self._render(events)
+
+    def _render(self, events):
+        rank = level_rank(self.level)
+        shown = [e for e in events if level_rank(e.level) >= rank][-self.max_lines:]
+        if not shown:
+            return
+        scroll_bar = self.output.verticalScrollBar()
+        at_bottom = scroll_bar.value() == scroll_bar.maximum()
+        cursor = QTextCursor(self.output.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.beginEditBlock()
+        for event in shown:
+            if not self.output.document().isEmpty():
+                cursor.insertBlock()
+            cursor.insertText(format_event(event), self._formats.get(event.level, self._default_format))
+        cursor.endEditBlock()
+        if at_bottom:
+            scroll_bar.setValue(scroll_bar.maximum())
+
+    def set_file_sink(self, sink):
+        """Replaces the file sink (None: none); the previous one is flushed and closed."""
+        self.flush()
+        if self.file_sink is not None:
+            self.file_sink.close()
+        self.file_sink = sink
+        self._update_threshold()
+
+    def _toggle_file_sink(self, checked):
+        if not checked:
+            self.set_file_sink(None)
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "日志文件", "hsx_log.txt", "日志文件 (*.txt *.log)")
+        if not path:
+            self.file_check.setChecked(False)
+            return
+        try:
+            self.set_file_sink(RotatingLogFile(path, level=self.file_level_combo.currentData()))
+        except OSError as e:
+            self.file_check.setChecked(False)
+            self.append("error", f"无法打开日志文件 {path}: {e}")
+
+    def close_sinks(self):
+        self.set_file_sink(None)
@@ -1,963 +1,80 @@
 import sys
 import time
+import itertools
 from datetime import datetime
-from collections import defaultdict
 
 # 尝试导入必要的库，如果失败则提示用户安装
 try:
     from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                                  QLabel, QComboBox, QPushButton, QTabWidget,
-                                 QSpinBox, QTextEdit, QMessageBox, QGroupBox, QScrollArea, QLayout, QGridLayout)
-    from PyQt6.QtCore import Qt, pyqtSignal, QObject, QThread, QSize, QRect, QPoint
-    from PyQt6.QtGui import QColor, QTextCharFormat, QFont, QPainter
+                                 QSpinBox, QMessageBox, QGroupBox, QScrollArea, QLayout, QGridLayout,
+                                 QCheckBox, QLineEdit, QFileDialog, QTableWidget, QTableWidgetItem, QHeaderView)
+    from PyQt6.QtCore import Qt, pyqtSignal, pyqtSlot, QObject, QThread, QTimer, QSize, QRect, QPoint
+    from PyQt6.QtGui import QColor, QFont, QPainter
 
     from pymodbus.client import ModbusSerialClient
     from pymodbus.exceptions import ModbusException
     from pymodbus.payload import BinaryPayloadBuilder, BinaryPayloadDecoder
-    from pymodbus.constants import Endian
 except ImportError as e:
     print(f"错误: 缺少必要的库 -> {e}")
     print("请使用以下命令安装所有依赖:")
     print("pip install PyQt6 pymodbus pyserial")
     sys.exit(1)
 
-# ==============================================================================
-# PART 1: COMPLETE AND FINAL REGISTER CONFIGURATION
-# ==============================================================================
-# ==============================================================================
-# PART 1: ADVANCED REGISTER CONFIGURATION
-# ==============================================================================
-PA_BASE_ADDRESS = 4000  # Assumption for电机参数区
+from block_planner import MODBUS_MAX_READ_WORDS, LinkTiming, plan_read_blocks, plan_write_blocks
+from bus_metrics import (FC_READ_HOLDING_REGISTERS, FC_WRITE_MULTIPLE_REGISTERS, FUNCTION_NAMES, OUTCOME_EXCEPTION,
+                         OUTCOME_OK, OUTCOME_TIMEOUT, OUTCOME_CRC, BusMetrics, MetricsFile, classify_error,
+                         rtu_request_bytes, rtu_response_bytes)
+from bus_scheduler import SlaveScheduler, parse_slave_ids
+from register_codec import BlockCodec, RegisterCodec, compile_register_codecs
+from register_catalog import COMMAND_REGISTER_IDS, load_register_catalog
+from register_table import RegisterTableModel, RegisterTableView
+from drive_snapshot import (RESTORE_SKIPPED_GROUPS, RESTORE_SKIPPED_IDS, SNAPSHOT_SUFFIX, DriveSnapshot, layout_hash,
+                            snapshot_entries)
+from trace_recorder import TRACE_SUFFIX, TraceRecorder
+from log_events import DEBUG, INFO, WARN, ERROR, LogEvent, level_rank
+from log_panel import LogPanel
+from port_discovery import PARITY_NAMES, PortDiscovery, format_line_settings, list_serial_ports
+from retry_policy import RetryPolicy, RttEstimator
+from shadow_image import SOURCE_READ, SOURCE_WRITTEN, CachePolicy, ShadowImage
 
-# ==============================================================================
-# 7.1 监控参数 (SU-XX) - 只读 (V2 - 单位已整合入名称)
-# 地址严格遵循手册 P93 MODBUS通讯地址表
-# ==============================================================================
-MONITORING_PARAMETERS = [
-    # --- 驱动器状态 ---
-    {"id": "SU-00", "name": "驱动器输出电流 (0.1A)", "group": "监控参数", "sub_group": "驱动器状态", "type": "s32", "address": 900,
-     "word_order": "big", "read_only": True, "effect": "只读", "tooltip": "有效值"},
-    {"id": "SU-01", "name": "驱动器母线电压 (V)", "group": "监控参数", "sub_group": "驱动器状态", "type": "u32", "address": 902,
-     "word_order": "big", "read_only": True, "effect": "只读"},
-    {"id": "SU-18", "name": "驱动器当前温度 (℃)", "group": "监控参数", "sub_group": "驱动器状态", "type": "s16", "address": 0,
-     "read_only": True, "effect": "只读", "note": "P93未定义地址"},
-
-    # --- 电机状态 ---
-    {"id": "SU-02", "name": "伺服电机转速 (0.1r/min)", "group": "监控参数", "sub_group": "电机状态", "type": "s32", "address": 904,
-     "word_order": "big", "read_only": True, "effect": "只读"},
-    {"id": "SU-19", "name": "转动惯量显示 (0.01)", "group": "监控参数", "sub_group": "电机状态", "type": "u16", "address": 0,
-     "read_only": True, "effect": "只读", "note": "P93未定义地址"},
-    {"id": "SU-20", "name": "当前输出转矩 (%)", "group": "监控参数", "sub_group": "电机状态", "type": "s16", "address": 942,
-     "read_only": True, "effect": "只读", "tooltip": "额定转矩百分比"},
-
-    # --- 反馈位置 (相对) ---
-    {"id": "SU-03_04", "name": "反馈相对位置-单圈", "group": "监控参数", "sub_group": "反馈位置 (相对)", "type": "u32", "address": 906,
-     "word_order": "big", "read_only": True, "effect": "只读", "tooltip": "由SU-04(低)和SU-03(高)组成"},
-    {"id": "SU-05_06", "name": "反馈相对位置-多圈", "group": "监控参数", "sub_group": "反馈位置 (相对)", "type": "s32", "address": 908,
-     "word_order": "big", "read_only": True, "effect": "只读", "tooltip": "由SU-06(低)和SU-05(高)组成"},
-
-    # --- 反馈位置 (绝对) ---
-    {"id": "SU-23_24", "name": "绝对位置-单圈", "group": "监控参数", "sub_group": "反馈位置 (绝对)", "type": "u32", "address": 952,
-     "word_order": "little", "read_only": True, "effect": "只读", "tooltip": "由SU-24(低)和SU-23(高)组成"},
-    {"id": "SU-25_26", "name": "绝对位置-多圈", "group": "监控参数", "sub_group": "反馈位置 (绝对)", "type": "s32", "address": 954,
-     "word_order": "little", "read_only": True, "effect": "只读", "tooltip": "由SU-26(低)和SU-25(高)组成"},
-
-    # --- 指令状态 ---
-    {"id": "SU-07_08", "name": "给定指令脉冲数", "group": "监控参数", "sub_group": "指令状态", "type": "u32", "address": 910,
-     "word_order": "big", "read_only": True, "effect": "只读", "tooltip": "由SU-08(低)和SU-07(高)组成"},
-    {"id": "SU-09", "name": "指令脉冲偏差计数", "group": "监控参数", "sub_group": "指令状态", "type": "s32", "address": 912,
-     "word_order": "big", "read_only": True, "effect": "只读"},
-    {"id": "SU-10", "name": "给定速度 (0.1r/min)", "group": "监控参数", "sub_group": "指令状态", "type": "s32", "address": 914,
-     "word_order": "big", "read_only": True, "effect": "只读"},
-    {"id": "SU-11", "name": "给定转矩 (%)", "group": "监控参数", "sub_group": "指令状态", "type": "s16", "address": 916,
-     "read_only": True, "effect": "只读", "tooltip": "1% 额定转矩"},
-    {"id": "SU-12", "name": "模拟量速度指令 (r/min)", "group": "监控参数", "sub_group": "指令状态", "type": "s16", "address": 919,
-     "read_only": True, "effect": "只读"},
-    {"id": "SU-13", "name": "模拟量转矩指令 (0.1%)", "group": "监控参数", "sub_group": "指令状态", "type": "s16", "address": 921,
-     "read_only": True, "effect": "只读", "tooltip": "0.1% 额定转矩"},
-
-    # --- I/O 状态 ---
-    {"id": "SU-14_15", "name": "输入口(DI)状态", "group": "监控参数", "sub_group": "I/O 状态", "type": "bit_field", "address": 923,
-     "read_only": True, "effect": "只读", "tooltip": "组合DI1-DI8的状态", "fields": [
-        {"name": "DI1", "start_bit": 0, "length": 1, "type": "enum", "options": {0: "断开", 1: "闭合"}},
-        {"name": "DI2", "start_bit": 1, "length": 1, "type": "enum", "options": {0: "断开", 1: "闭合"}},
-        {"name": "DI3", "start_bit": 2, "length": 1, "type": "enum", "options": {0: "断开", 1: "闭合"}},
-        {"name": "DI4", "start_bit": 3, "length": 1, "type": "enum", "options": {0: "断开", 1: "闭合"}},
-        {"name": "DI5", "start_bit": 4, "length": 1, "type": "enum", "options": {0: "断开", 1: "闭合"}},
-        {"name": "DI6", "start_bit": 5, "length": 1, "type": "enum", "options": {0: "断开", 1: "闭合"}},
-        {"name": "DI7", "start_bit": 6, "length": 1, "type": "enum", "options": {0: "断开", 1: "闭合"}},
-        {"name": "DI8", "start_bit": 7, "length": 1, "type": "enum", "options": {0: "断开", 1: "闭合"}},
-    ]},
-    {"id": "SU-16_17", "name": "输出口(DO)状态", "group": "监控参数", "sub_group": "I/O 状态", "type": "bit_field", "address": 925,
-     "read_only": True, "effect": "只读", "tooltip": "组合DO1-DO4和ALM的状态", "fields": [
-        {"name": "DO1", "start_bit": 0, "length": 1, "type": "enum", "options": {0: "断开", 1: "闭合"}},
-        {"name": "DO2", "start_bit": 1, "length": 1, "type": "enum", "options": {0: "断开", 1: "闭合"}},
-        {"name": "DO3", "start_bit": 2, "length": 1, "type": "enum", "options": {0: "断开", 1: "闭合"}},
-        {"name": "DO4", "start_bit": 3, "length": 1, "type": "enum", "options": {0: "断开", 1: "闭合"}},
-        {"name": "ALM", "start_bit": 8, "length": 1, "type": "enum", "options": {0: "正常", 1: "报警"}},
-    ]},
-
-    # --- 高级状态 ---
-    {"id": "SU-21", "name": "当前增益组", "group": "监控参数", "sub_group": "高级状态", "type": "u16", "address": 0,
-     "read_only": True, "effect": "只读", "note": "P93未定义地址"},
-    {"id": "SU-22", "name": "泄放时间 (10ms)", "group": "监控参数", "sub_group": "高级状态", "type": "u16", "address": 0,
-     "read_only": True, "effect": "只读", "note": "P93未定义地址"},
-    {"id": "SU-27", "name": "模拟量通道AV电压 (10mV)", "group": "监控参数", "sub_group": "高级状态", "type": "s16", "address": 940,
-     "read_only": True, "effect": "只读"},
-    {"id": "SU-28", "name": "模拟量通道AC电压 (10mV)", "group": "监控参数", "sub_group": "高级状态", "type": "s16", "address": 941,
-     "read_only": True, "effect": "只读"},
-    {"id": "SU-29", "name": "混合误差", "group": "监控参数", "sub_group": "高级状态", "type": "u16", "address": 0,
-     "read_only": True, "effect": "只读", "note": "P93未定义地址"},
-    {"id": "SU-30", "name": "全闭环反馈", "group": "监控参数", "sub_group": "高级状态", "type": "u16", "address": 0,
-     "read_only": True, "effect": "只读", "note": "P93未定义地址"},
-    {"id": "SU-31", "name": "龙门同步误差", "group": "监控参数", "sub_group": "高级状态", "type": "u16", "address": 0,
-     "read_only": True, "effect": "只读", "note": "P93未定义地址"},
-    {"id": "SU-32", "name": "保留", "group": "监控参数", "sub_group": "高级状态", "type": "u16", "address": 0, "read_only": True,
-     "effect": "只读", "note": "P93未定义地址"},
-
-    # --- 高速计数器 ---
-    {"id": "SU-33", "name": "高速计数器1", "group": "监控参数", "sub_group": "高速计数器", "type": "u32", "address": 0,
-     "read_only": True, "effect": "只读", "note": "P93未定义地址"},
-    {"id": "SU-34", "name": "高速计数器2", "group": "监控参数", "sub_group": "高速计数器", "type": "u32", "address": 0,
-     "read_only": True, "effect": "只读", "note": "P93未定义地址"},
-    {"id": "SU-36_37", "name": "接收脉冲数", "group": "监控参数", "sub_group": "高速计数器", "type": "u32", "address": 0,
-     "read_only": True, "effect": "只读", "tooltip": "由SU-37(低)和SU-36(高)组成", "note": "P93未定义地址"},
-]
-
-# ==============================================================================
-# 7.2 辅助参数 (AU-XX)
-# 地址规则: 参数号 + 800
-# ==============================================================================
-AUXILIARY_PARAMETERS = [
-    # --- 基本信息与安全 ---
-    {"id": "AU-00", "name": "软件版本", "group": "辅助参数", "sub_group": "基本信息与安全", "type": "u16", "address": 800,
-     "read_only": True, "effect": "只读"},
-    {"id": "AU-01", "name": "设定密码", "group": "辅助参数", "sub_group": "基本信息与安全", "type": "u16", "address": 801,
-     "read_only": False, "range": "0-9999", "effect": "重新上电保存", "tooltip": "0表示密码无效, 可任意修改参数"},
-
-    # --- 抱闸与制动 ---
-    {"id": "AU-02", "name": "抱闸OFF延迟-使能OFF (10ms)", "group": "辅助参数", "sub_group": "抱闸与制动", "type": "u16",
-     "address": 802, "read_only": False, "range": "0-50", "effect": "立即"},
-    {"id": "AU-03", "name": "抱闸OFF延迟-电磁制动 (10ms)", "group": "辅助参数", "sub_group": "抱闸与制动", "type": "u16", "address": 803,
-     "read_only": False, "range": "10-100", "effect": "立即"},
-    {"id": "AU-04", "name": "外置制动电阻阻值 (Ω)", "group": "辅助参数", "sub_group": "抱闸与制动", "type": "u16", "address": 804,
-     "read_only": False, "range": "8-1000", "effect": "立即"},
-    {"id": "AU-05", "name": "泄放占空比 (%)", "group": "辅助参数", "sub_group": "抱闸与制动", "type": "u16", "address": 805,
-     "read_only": False, "range": "0-100", "effect": "立即"},
-    {"id": "AU-08", "name": "动态制动延时时间 (0.1ms)", "group": "辅助参数", "sub_group": "抱闸与制动", "type": "u16", "address": 808,
-     "read_only": False, "range": "100-30000", "effect": "立即"},
-    {"id": "AU-28", "name": "断电抱闸", "group": "辅助参数", "sub_group": "抱闸与制动", "type": "enum16", "address": 828,
-     "read_only": False, "options": {0: "关闭", 1: "开启"}, "effect": "立即"},
-    {"id": "AU-29", "name": "断电抱闸延时时间 (0.5ms)", "group": "辅助参数", "sub_group": "抱闸与制动", "type": "u16", "address": 829,
-     "read_only": False, "range": "500-3000", "effect": "立即"},
-    {"id": "AU-16", "name": "电磁制动速度阈值 (0.1r/min)", "group": "辅助参数", "sub_group": "抱闸与制动", "type": "u16", "address": 816,
-     "read_only": False, "range": "0-30000", "effect": "立即"},
-    {"id": "AU-44", "name": "内置制动电阻阻值 (Ω)", "group": "辅助参数", "sub_group": "抱闸与制动", "type": "u16", "address": 844,
-     "read_only": False, "range": "1-30000", "effect": "立即"},
-    {"id": "AU-45", "name": "内置制动电阻功率 (w)", "group": "辅助参数", "sub_group": "抱闸与制动", "type": "u16", "address": 845,
-     "read_only": False, "range": "1-30000", "effect": "立即"},
-    {"id": "AU-46", "name": "电阻散热系数 (%)", "group": "辅助参数", "sub_group": "抱闸与制动", "type": "u16", "address": 846,
-     "read_only": False, "range": "1-50", "effect": "立即"},
-    {"id": "AU-47", "name": "制动电阻设置", "group": "辅助参数", "sub_group": "抱闸与制动", "type": "enum16", "address": 847,
-     "read_only": False, "options": {0: "使用内置", 1: "使用外接"}, "effect": "立即"},
-
-    # --- 保护功能 ---
-    {"id": "AU-06", "name": "输入电源缺相保护", "group": "辅助参数", "sub_group": "保护功能", "type": "enum16", "address": 806,
-     "read_only": False, "options": {0: "屏蔽", 1: "开启"}, "effect": "立即"},
-    {"id": "AU-15", "name": "编码器断线保护", "group": "辅助参数", "sub_group": "保护功能", "type": "enum16", "address": 815,
-     "read_only": False, "options": {0: "关闭", 1: "开启"}, "effect": "立即"},
-    {"id": "AU-17", "name": "正转禁止设置", "group": "辅助参数", "sub_group": "保护功能", "type": "enum16", "address": 817,
-     "read_only": False, "options": {0: "无效", 1: "有效"}, "effect": "立即"},
-    {"id": "AU-18", "name": "反转禁止设置", "group": "辅助参数", "sub_group": "保护功能", "type": "enum16", "address": 818,
-     "read_only": False, "options": {0: "无效", 1: "有效"}, "effect": "立即"},
-    {"id": "AU-31", "name": "驱动器过热报警温度 (℃)", "group": "辅助参数", "sub_group": "保护功能", "type": "u16", "address": 831,
-     "read_only": False, "range": "60-100", "effect": "立即"},
-    {"id": "AU-32", "name": "接地保护", "group": "辅助参数", "sub_group": "保护功能", "type": "enum16", "address": 832,
-     "read_only": False, "options": {0: "屏蔽", 1: "开启"}, "effect": "立即"},
-    {"id": "AU-34", "name": "电机堵转保护", "group": "辅助参数", "sub_group": "保护功能", "type": "enum16", "address": 834,
-     "read_only": False, "options": {0: "屏蔽", 1: "开启"}, "effect": "立即"},
-    {"id": "AU-35", "name": "过载预警信号输出电流 (%)", "group": "辅助参数", "sub_group": "保护功能", "type": "u16", "address": 835,
-     "read_only": False, "range": "0-800", "effect": "立即"},
-    {"id": "AU-36", "name": "过载预警滤波时间 (10ms)", "group": "辅助参数", "sub_group": "保护功能", "type": "u16", "address": 836,
-     "read_only": False, "range": "0-1000", "effect": "立即"},
-    {"id": "AU-37", "name": "电机过载系数设定 (%)", "group": "辅助参数", "sub_group": "保护功能", "type": "u16", "address": 837,
-     "read_only": False, "range": "0-500", "effect": "立即"},
-    {"id": "AU-38", "name": "锂电池欠压保护", "group": "辅助参数", "sub_group": "保护功能", "type": "enum16", "address": 838,
-     "read_only": False, "options": {0: "屏蔽", 1: "开启"}, "effect": "立即"},
-    {"id": "AU-39", "name": "软件超程保护", "group": "辅助参数", "sub_group": "保护功能", "type": "enum16", "address": 839,
-     "read_only": False, "options": {0: "屏蔽", 1: "开启", 2: "停机但不报警"}, "effect": "立即"},
-    {"id": "AU-40", "name": "堵转保护判断时间 (10ms)", "group": "辅助参数", "sub_group": "保护功能", "type": "u16", "address": 840,
-     "read_only": False, "range": "10-1000", "effect": "立即"},
-
-    # --- 系统行为与设置 ---
-    {"id": "AU-07", "name": "电机停止模式", "group": "辅助参数", "sub_group": "系统行为与设置", "type": "enum16", "address": 807,
-     "read_only": False, "options": {0: "自由停车", 1: "动态制动", 2: "快速使能"}, "effect": "立即"},
-    {"id": "AU-09", "name": "默认状态显示设置", "group": "辅助参数", "sub_group": "系统行为与设置", "type": "enum16", "address": 809,
-     "read_only": False, "range": "0-34", "effect": "立即",
-     "options": {0: "输出电流", 1: "母线电压", 2: "电机转速", 3: "反馈脉冲(高)", 4: "反馈脉冲(低)", 5: "反馈转速(高)", 6: "反馈转速(低)", 7: "指令脉冲(高)",
-                 8: "指令脉冲(低)", 9: "脉冲误差", 10: "给定速度", 11: "给定转矩", 12: "模拟速度指令", 13: "模拟转矩指令", 14: "DI8-5状态",
-                 15: "DI4-1状态", 16: "其余输出口状态", 17: "DO4-D01状态", 18: "驱动器温度", 19: "转动惯量", 20: "输出转矩", 21: "增益组",
-                 22: "泄放时间", 23: "绝对位置(高)", 24: "绝对位置(低)", 25: "绝对位置圈数(高)", 26: "绝对位置圈数(低)", 27: "AV电压", 28: "AC电压",
-                 29: "混合误差", 30: "全闭环反馈", 31: "龙门同步误差", 32: "保留", 33: "高速计数器1", 34: "高速计数器2"}},
-    {"id": "AU-13", "name": "JOG点动速度 (0.1r/min)", "group": "辅助参数", "sub_group": "系统行为与设置", "type": "u16",
-     "address": 813, "read_only": False, "range": "0-30000", "effect": "立即"},
-    {"id": "AU-14", "name": "JOG点动运行", "group": "辅助参数", "sub_group": "系统行为与设置", "type": "u16", "address": 814,
-     "read_only": True, "effect": "立即", "tooltip": "此为功能触发, 一般不直接写入"},
-    {"id": "AU-23", "name": "转矩更新周期", "group": "辅助参数", "sub_group": "系统行为与设置", "type": "enum16", "address": 823,
-     "read_only": False, "options": {0: "100ms", 1: "1ms"}, "effect": "0->1"},
-    {"id": "AU-25", "name": "电角度识别设定", "group": "辅助参数", "sub_group": "系统行为与设置", "type": "enum16", "address": 825,
-     "read_only": False, "options": {0: "不设定", 1: "设定"}, "effect": "立即"},
-    {"id": "AU-30", "name": "绝对/相对位置设定", "group": "辅助参数", "sub_group": "系统行为与设置", "type": "enum16", "address": 830,
-     "read_only": False, "options": {0: "绝对位置", 1: "相对位置"}, "effect": "重新上电保存"},
-    {"id": "AU-33", "name": "掉电去使能", "group": "辅助参数", "sub_group": "系统行为与设置", "type": "enum16", "address": 833,
-     "read_only": False, "options": {0: "屏蔽", 1: "开启"}, "effect": "立即"},
-    {"id": "AU-41", "name": "设定机械原点", "group": "辅助参数", "sub_group": "系统行为与设置", "type": "enum16", "address": 841,
-     "read_only": False, "options": {0: "不设置", 1: "将当前位置设为原点"}, "effect": "立即"},
-    {"id": "AU-42", "name": "报警输出占空比 (%)", "group": "辅助参数", "sub_group": "系统行为与设置", "type": "u16", "address": 842,
-     "read_only": False, "range": "0-100", "effect": "立即"},
-    {"id": "AU-43", "name": "编码器复位", "group": "辅助参数", "sub_group": "系统行为与设置", "type": "enum16", "address": 843,
-     "read_only": False, "options": {0: "不复位", 1: "复位"}, "effect": "立即"},
-    {"id": "AU-48", "name": "电机参数设置区密码", "group": "辅助参数", "sub_group": "系统行为与设置", "type": "u16", "address": 848,
-     "read_only": False, "effect": "立即", "tooltip": "设为1时可对电机参数(PA)进行设置"},
-    {"id": "AU-49", "name": "恢复出厂设置", "group": "辅助参数", "sub_group": "系统行为与设置", "type": "enum16", "address": 849,
-     "read_only": False, "options": {0: "不恢复", 1: "恢复出厂", 2: "Flash参数恢复"}, "effect": "重新上电不保存"},
-
-    # --- 故障历史 ---
-    {"id": "AU-10", "name": "最近一次故障代码", "group": "辅助参数", "sub_group": "故障历史", "type": "u16", "address": 810,
-     "read_only": True, "effect": "只读"},
-    {"id": "AU-11", "name": "最近第二次故障代码", "group": "辅助参数", "sub_group": "故障历史", "type": "u16", "address": 811,
-     "read_only": True, "effect": "只读"},
-    {"id": "AU-12", "name": "最近第三次故障代码", "group": "辅助参数", "sub_group": "故障历史", "type": "u16", "address": 812,
-     "read_only": True, "effect": "只读"},
-
-    # --- 保留项 ---
-    {"id": "AU-19", "name": "保留", "group": "辅助参数", "sub_group": "保留项", "type": "u16", "address": 819,
-     "read_only": True},
-    {"id": "AU-20", "name": "保留", "group": "辅助参数", "sub_group": "保留项", "type": "u16", "address": 820,
-     "read_only": True},
-    {"id": "AU-21", "name": "保留", "group": "辅助参数", "sub_group": "保留项", "type": "u16", "address": 821,
-     "read_only": True},
-    {"id": "AU-22", "name": "保留", "group": "辅助参数", "sub_group": "保留项", "type": "u16", "address": 822,
-     "read_only": True},
-    {"id": "AU-24", "name": "保留", "group": "辅助参数", "sub_group": "保留项", "type": "u16", "address": 824,
-     "read_only": True},
-    {"id": "AU-26", "name": "电机编码器数据通讯格式", "group": "辅助参数", "sub_group": "保留项", "type": "enum16", "address": 826,
-     "read_only": True, "options": {0: "多圈绝对值", 1: "单圈绝对值"}},
-    {"id": "AU-27", "name": "保留", "group": "辅助参数", "sub_group": "保留项", "type": "u16", "address": 827,
-     "read_only": True},
-]
-
-# ==============================================================================
-# 7.3.1 系统参数 (FU000 ~ FU020)
-# 地址规则: 参数号
-# ==============================================================================
-SYSTEM_PARAMETERS_0_20 = [
-    # --- 基本配置 ---
-    {"id": "FU000", "name": "电机代码", "group": "系统参数", "sub_group": "基本配置", "type": "u16", "address": 0,
-     "read_only": True, "effect": "只读"},
-    {"id": "FU001", "name": "控制模式与方向", "group": "系统参数", "sub_group": "基本配置", "type": "bit_field", "address": 1,
-     "read_only": False, "effect": "重新上电保存", "fields": [
-        {"name": "旋转方向", "start_bit": 15, "length": 1, "type": "enum", "options": {0: "顺时针(CW)", 1: "逆时针(CCW)"}},
-        {"name": "控制模式", "start_bit": 0, "length": 5, "type": "enum", "options": {
-            0: "内部寄存器速度模式", 1: "位置脉冲指令模式", 2: "内部寄存器转矩模式", 3: "外部模拟量速度模式", 4: "外部模拟量转矩模式", 5: "内部寄存器位置模式",
-            6: "内部寄存器速度与位置脉冲指令混合模式", 7: "内部寄存器速度与内部寄存器转矩混合模式", 8: "内部寄存器速度与外部模拟量速度混合模式",
-            9: "内部寄存器速度与外部模拟量转矩混合模式", 10: "内部寄存器速度与内部寄存器位置混合模式", 11: "内部寄存器转矩与位置脉冲指令混合模式",
-            12: "外部模拟量速度与位置脉冲指令混合模式", 13: "外部模拟量转矩与位置脉冲指令混合模式", 14: "位置脉冲指令与内部寄存器位置混合模式",
-            15: "外部模拟量速度与内部寄存器转矩混合模式", 16: "外部模拟量转矩与内部寄存器转矩混合模式", 17: "内部寄存器转矩与内部寄存器位置混合模式",
-            18: "外部模拟量速度与外部模拟量转矩混合模式", 19: "外部模拟量速度与内部寄存器位置混合模式", 20: "外部模拟量转矩与内部寄存器位置混合模式"}}
-    ]},
-    {"id": "FU002", "name": "最高转速限制 (r/min)", "group": "系统参数", "sub_group": "基本配置", "type": "u16", "address": 2,
-     "read_only": False, "range": "0-10000", "effect": "立即"},
-    {"id": "FU004", "name": "伺服使能方式选择", "group": "系统参数", "sub_group": "基本配置", "type": "enum16", "address": 4,
-     "read_only": False, "effect": "立即", "options": {0: "外部端子使能(SON-I)", 1: "内部参数使能(FU100)", 2: "强制使能"}},
-
-    # --- 编码器分频 ---
-    {"id": "FU003", "name": "编码器脉冲分频数(分子)", "group": "系统参数", "sub_group": "编码器分频", "type": "u16", "address": 3,
-     "read_only": False, "range": "1-65535", "effect": "立即"},
-    {"id": "FU005", "name": "编码器脉冲分频数(分母)", "group": "系统参数", "sub_group": "编码器分频", "type": "u32", "address": 5,
-     "word_order": "big", "read_only": False, "range": "1-2147483647", "effect": "立即"},
-    # FU005 and FU006 make a 32-bit value
-
-    # --- 惯量与刚性 ---
-    {"id": "FU007", "name": "负载惯量变化速度", "group": "系统参数", "sub_group": "惯量与刚性", "type": "u16", "address": 7,
-     "read_only": False, "range": "1-100", "effect": "立即"},
-    {"id": "FU008", "name": "转动惯量模式选择", "group": "系统参数", "sub_group": "惯量与刚性", "type": "enum16", "address": 8,
-     "read_only": False, "effect": "立即", "options": {0: "不启用识别", 1: "离线正反转识别", 2: "离线单方向识别", 3: "保留"}},
-    {"id": "FU009", "name": "离线惯量识别动作间隙 (Ms)", "group": "系统参数", "sub_group": "惯量与刚性", "type": "u16", "address": 9,
-     "read_only": False, "range": "10-2000", "effect": "立即"},
-    {"id": "FU010", "name": "刚性选择", "group": "系统参数", "sub_group": "惯量与刚性", "type": "u16", "address": 10,
-     "read_only": False, "range": "1-30", "effect": "立即"},
-    {"id": "FU013", "name": "转动惯量比", "group": "系统参数", "sub_group": "惯量与刚性", "type": "u16", "address": 13,
-     "read_only": False, "range": "1-30000", "effect": "立即", "tooltip": "负载惯量与电机转子惯量之比, 乘以100"},
-    {"id": "FU014", "name": "运动轨迹加减速时间 (Ms)", "group": "系统参数", "sub_group": "惯量与刚性", "type": "u16", "address": 14,
-     "read_only": False, "range": "200-5000", "effect": "立即"},
-    {"id": "FU015", "name": "离线惯量识别运动范围(脉冲)", "group": "系统参数", "sub_group": "惯量与刚性", "type": "u32", "address": 15,
-     "word_order": "big", "read_only": False, "range": "20-2147483647", "effect": "立即"},
-
-    # --- Z脉冲与分频输出 ---
-    {"id": "FU017", "name": "Z脉冲分频输出宽度", "group": "系统参数", "sub_group": "Z脉冲与分频输出", "type": "u16", "address": 17,
-     "read_only": False, "range": "30-30000", "effect": "立即"},
-    {"id": "FU018", "name": "脉冲输出配置", "group": "系统参数", "sub_group": "Z脉冲与分频输出", "type": "bit_field", "address": 18,
-     "read_only": False, "effect": "立即", "fields": [
-        {"name": "分频指令来源", "start_bit": 8, "length": 3, "type": "enum",
-         "options": {0: "电机轴", 1: "内部位置给定", 2: "集电极脉冲输入", 3: "高速计数器1", 4: "高速计数器2", 5: "位置指令"}},
-        {"name": "Z脉冲指令来源", "start_bit": 4, "length": 1, "type": "enum", "options": {0: "电机轴", 1: "虚拟轴"}},
-        {"name": "Z脉冲输出极性", "start_bit": 0, "length": 1, "type": "enum", "options": {0: "负极性", 1: "正极性"}}
-    ]},
-    {"id": "FU019", "name": "虚拟Z输出周期", "group": "系统参数", "sub_group": "Z脉冲与分频输出", "type": "u32", "address": 19,
-     "word_order": "big", "read_only": False, "range": "1-2147483647", "effect": "立即"},
-    {"id": "FU020", "name": "分频信号设置", "group": "系统参数", "sub_group": "Z脉冲与分频输出", "type": "enum16", "address": 20,
-     "read_only": False, "effect": "重新上电保存", "tooltip": "配置特定引脚功能, 详见手册P79", "options": {
-        0: "26/10脚=MODBUS, DO1可配",
-        1: "26/10脚=MODBUS, DO1=Z相集电极",
-        2: "26/10脚=A相差分, 30/15脚=B相差分"
-    }},
-
-    # --- 保留项 ---
-    {"id": "FU011", "name": "保留", "group": "系统参数", "sub_group": "保留项", "type": "u16", "address": 11, "read_only": True},
-    {"id": "FU012", "name": "保留", "group": "系统参数", "sub_group": "保留项", "type": "u16", "address": 12, "read_only": True},
-    {"id": "FU016", "name": "保留", "group": "系统参数", "sub_group": "保留项", "type": "u16", "address": 16, "read_only": True}
-]
-
-# ==============================================================================
-# 7.3.2 速度参数 (FU100 ~ FU145)
-# 地址规则: 参数号
-# ==============================================================================
-VELOCITY_PARAMETERS = [
-    # --- 增益与滤波 ---
-    {"id": "FU101", "name": "第一速度环比例增益 (0.1Hz)", "group": "速度参数", "sub_group": "增益与滤波", "type": "u16", "address": 101,
-     "read_only": False, "range": "0-30000", "effect": "立即"},
-    {"id": "FU102", "name": "第一速度环积分增益 (0.1ms)", "group": "速度参数", "sub_group": "增益与滤波", "type": "u16", "address": 102,
-     "read_only": False, "range": "0-10000", "effect": "立即"},
-    {"id": "FU103", "name": "第二速度环比例增益 (0.1Hz)", "group": "速度参数", "sub_group": "增益与滤波", "type": "u16", "address": 103,
-     "read_only": False, "range": "0-30000", "effect": "立即"},
-    {"id": "FU104", "name": "第二速度环积分增益 (0.1ms)", "group": "速度参数", "sub_group": "增益与滤波", "type": "u16", "address": 104,
-     "read_only": False, "range": "0-30000", "effect": "立即"},
-    {"id": "FU105", "name": "第一速度环滤波时间 (0.01ms)", "group": "速度参数", "sub_group": "增益与滤波", "type": "u16", "address": 105,
-     "read_only": False, "range": "1-20000", "effect": "立即"},
-    {"id": "FU106", "name": "第二速度环滤波时间 (0.01ms)", "group": "速度参数", "sub_group": "增益与滤波", "type": "u16", "address": 106,
-     "read_only": False, "range": "1-20000", "effect": "立即"},
-    {"id": "FU107", "name": "转矩前馈增益", "group": "速度参数", "sub_group": "增益与滤波", "type": "u16", "address": 107,
-     "read_only": False, "range": "0-1000", "effect": "立即"},
-    {"id": "FU108", "name": "转矩前馈增益滤波 (0.01ms)", "group": "速度参数", "sub_group": "增益与滤波", "type": "u16", "address": 108,
-     "read_only": False, "range": "1-30000", "effect": "立即"},
-
-    # --- 速度与加减速 ---
-    {"id": "FU100", "name": "内部使能设置", "group": "速度参数", "sub_group": "速度与加减速", "type": "enum16", "address": 100,
-     "read_only": False, "effect": "立即,不记忆", "tooltip": "仅在FU004=1时有效", "options": {0: "外部端子使能", 1: "内部参数使能"}},
-    {"id": "FU109", "name": "速度模式加速时间 (ms)", "group": "速度参数", "sub_group": "速度与加减速", "type": "u16", "address": 109,
-     "read_only": False, "range": "1-30000", "effect": "立即"},
-    {"id": "FU110", "name": "速度模式减速时间 (ms)", "group": "速度参数", "sub_group": "速度与加减速", "type": "u16", "address": 110,
-     "read_only": False, "range": "1-30000", "effect": "立即"},
-    {"id": "FU111", "name": "S曲线加减速时间 (ms)", "group": "速度参数", "sub_group": "速度与加减速", "type": "u16", "address": 111,
-     "read_only": False, "range": "1-15000", "effect": "立即"},
-    {"id": "FU112", "name": "S曲线启动标志", "group": "速度参数", "sub_group": "速度与加减速", "type": "enum16", "address": 112,
-     "read_only": False, "effect": "立即", "options": {0: "不启用", 1: "启用"}},
-    {"id": "FU113", "name": "内部速度给定 1 (0.1r/min)", "group": "速度参数", "sub_group": "速度与加减速", "type": "s16",
-     "address": 113, "read_only": False, "range": "-32000~+32000", "effect": "立即"},
-    {"id": "FU114", "name": "内部速度给定 2 (0.1r/min)", "group": "速度参数", "sub_group": "速度与加减速", "type": "s16",
-     "address": 114, "read_only": False, "range": "-32000~+32000", "effect": "立即"},
-    {"id": "FU115", "name": "内部速度给定 3 (0.1r/min)", "group": "速度参数", "sub_group": "速度与加减速", "type": "s16",
-     "address": 115, "read_only": False, "range": "-32000~+32000", "effect": "立即"},
-    {"id": "FU117", "name": "目标速度范围 (0.1r/min)", "group": "速度参数", "sub_group": "速度与加减速", "type": "u16", "address": 117,
-     "read_only": False, "range": "0-30000", "effect": "立即", "tooltip": "速度到达信号(V-CMP)的触发范围"},
-    {"id": "FU118", "name": "旋转检出值 (0.1r/min)", "group": "速度参数", "sub_group": "速度与加减速", "type": "u16", "address": 118,
-     "read_only": False, "range": "0-30000", "effect": "立即", "tooltip": "旋转检出信号(TGON)的触发阈值"},
-
-    # --- 原点回归 ---
-    {"id": "FU119", "name": "原点检索", "group": "速度参数", "sub_group": "原点回归", "type": "bit_field", "address": 119,
-     "read_only": False, "effect": "立即", "fields": [
-        {"name": "[D]寻找方向", "start_bit": 0, "length": 1, "type": "enum", "options": {0: "反转寻找", 1: "正转寻找"}},
-        {"name": "[C]原点类型", "start_bit": 4, "length": 3, "type": "enum",
-         "options": {0: "左右限位", 1: "ORGP输入端", 2: "Z相脉冲", 3: "寻找机械原点", 4: "力矩到达(T-CMP)"}},
-        {"name": "[B]找到后动作", "start_bit": 8, "length": 2, "type": "enum",
-         "options": {0: "减速停止", 1: "反向寻Z", 2: "同向寻Z", 3: "寻ORGP上升沿"}},
-        {"name": "[A]Z信号后动作", "start_bit": 12, "length": 1, "type": "enum", "options": {0: "减速停止", 1: "折返到Z信号"}}
-    ]},
-    {"id": "FU120", "name": "原点检索第一速度 (0.1r/min)", "group": "速度参数", "sub_group": "原点回归", "type": "u16", "address": 120,
-     "read_only": False, "range": "0-20000", "effect": "立即"},
-    {"id": "FU121", "name": "原点检索第二速度 (0.1r/min)", "group": "速度参数", "sub_group": "原点回归", "type": "u16", "address": 121,
-     "read_only": False, "range": "0-10000", "effect": "立即"},
-    {"id": "FU122", "name": "原点检索加减速时间 (Ms)", "group": "速度参数", "sub_group": "原点回归", "type": "u16", "address": 122,
-     "read_only": False, "range": "0-1000", "effect": "立即"},
-    {"id": "FU123", "name": "原点检索偏移脉冲数", "group": "速度参数", "sub_group": "原点回归", "type": "s32", "address": 123,
-     "word_order": "big", "read_only": False, "range": "-2147483647~+2147483647", "effect": "立即"},
-    {"id": "FU125", "name": "原点检索启动方式", "group": "速度参数", "sub_group": "原点回归", "type": "enum16", "address": 125,
-     "read_only": False, "effect": "立即", "options": {0: "不寻找", 1: "开机自动寻找", 2: "I/O口触发", 3: "立即出发", 4: "开机和报警复位时自动寻找"}},
-    {"id": "FU126", "name": "零速度嵌位时速度值 (0.1r/min)", "group": "速度参数", "sub_group": "原点回归", "type": "u16", "address": 126,
-     "read_only": False, "range": "0-30000", "effect": "立即"},
-    {"id": "FU127", "name": "零速度嵌位使能", "group": "速度参数", "sub_group": "原点回归", "type": "enum16", "address": 127,
-     "read_only": False, "effect": "立即", "options": {0: "不启用零速度嵌位", 1: "启用零速度嵌位"}},
-    {"id": "FU128", "name": "原点找到信号持续时间 (Ms)", "group": "速度参数", "sub_group": "原点回归", "type": "u16", "address": 128,
-     "read_only": False, "range": "0-30000", "effect": "立即"},
-    {"id": "FU129", "name": "原点检索超时时间 (Ms)", "group": "速度参数", "sub_group": "原点回归", "type": "u16", "address": 129,
-     "read_only": False, "range": "100-65535", "effect": "立即"},
-
-    # --- 增益切换 ---
-    {"id": "FU130", "name": "增益切换方式", "group": "速度参数", "sub_group": "增益切换", "type": "enum16", "address": 130,
-     "read_only": False, "effect": "立即", "options": {
-        0: "不切换,用增益1", 1: "不切换,用增益2", 2: "速度>FU131切换", 3: "切换端子控制", 4: "位置误差>FU132切换", 5: "有脉冲输入时切换",
-        6: "有脉冲且转速<FU131时切换"
-    }},
-    {"id": "FU131", "name": "增益切换速度 (0.1r/min)", "group": "速度参数", "sub_group": "增益切换", "type": "u16", "address": 131,
-     "read_only": False, "range": "1-32000", "effect": "立即"},
-    {"id": "FU132", "name": "增益切换脉冲", "group": "速度参数", "sub_group": "增益切换", "type": "u16", "address": 132,
-     "read_only": False, "range": "1-32000", "effect": "立即"},
-    {"id": "FU133", "name": "位置环增益切换时间 (0.1ms)", "group": "速度参数", "sub_group": "增益切换", "type": "u16", "address": 133,
-     "read_only": False, "range": "1-32000", "effect": "立即"},
-    {"id": "FU134", "name": "速度增益切换时间 (0.1ms)", "group": "速度参数", "sub_group": "增益切换", "type": "u16", "address": 134,
-     "read_only": False, "range": "0-20000", "effect": "立即"},
-    {"id": "FU135", "name": "增益2切至1延迟时间 (0.1ms)", "group": "速度参数", "sub_group": "增益切换", "type": "u16", "address": 135,
-     "read_only": False, "range": "0-32000", "effect": "立即"},
-
-    # --- 超程保护与机械原点 ---
-    {"id": "FU136", "name": "机械原点单圈", "group": "速度参数", "sub_group": "超程保护与机械原点", "type": "u32", "address": 136,
-     "word_order": "big", "read_only": False, "range": "0-2147483647", "effect": "立即"},
-    {"id": "FU138", "name": "机械原点多圈", "group": "速度参数", "sub_group": "超程保护与机械原点", "type": "u32", "address": 138,
-     "word_order": "big", "read_only": False, "range": "0-2147483647", "effect": "立即"},
-    {"id": "FU140", "name": "超程保护正转范围脉冲数", "group": "速度参数", "sub_group": "超程保护与机械原点", "type": "u32", "address": 140,
-     "word_order": "big", "read_only": False, "range": "0-2147483647", "effect": "立即"},
-    {"id": "FU142", "name": "超程保护正转范围多圈数", "group": "速度参数", "sub_group": "超程保护与机械原点", "type": "u16", "address": 142,
-     "read_only": False, "range": "0-32000", "effect": "立即"},
-    {"id": "FU143", "name": "超程保护反转范围脉冲数", "group": "速度参数", "sub_group": "超程保护与机械原点", "type": "u32", "address": 143,
-     "word_order": "big", "read_only": False, "range": "0-2147483647", "effect": "立即"},
-    {"id": "FU145", "name": "超程保护反转范围多圈数", "group": "速度参数", "sub_group": "超程保护与机械原点", "type": "u16", "address": 145,
-     "read_only": False, "range": "0-32000", "effect": "立即"},
-
-    # --- 保留项 ---
-    {"id": "FU116", "name": "保留", "group": "速度参数", "sub_group": "保留项", "type": "u16", "address": 116,
-     "read_only": True},
-    {"id": "FU124", "name": "保留", "group": "速度参数", "sub_group": "保留项", "type": "u16", "address": 124,
-     "read_only": True},
-    {"id": "FU137", "name": "保留", "group": "速度参数", "sub_group": "保留项", "type": "u16", "address": 137,
-     "read_only": True},
-    {"id": "FU139", "name": "保留", "group": "速度参数", "sub_group": "保留项", "type": "u16", "address": 139,
-     "read_only": True},
-]
-
-# ==============================================================================
-# 7.3.3 转矩参数 (FU200 ~ FU242)
-# 地址规则: 参数号
-# ==============================================================================
-TORQUE_PARAMETERS = [
-    # --- 电流环与转矩限制 ---
-    {"id": "FU200", "name": "电流环第一带宽 (Hz)", "group": "转矩参数", "sub_group": "电流环与转矩限制", "type": "u16", "address": 200,
-     "read_only": False, "range": "10-3000", "effect": "立即"},
-    {"id": "FU201", "name": "电流环第二带宽 (Hz)", "group": "转矩参数", "sub_group": "电流环与转矩限制", "type": "u16", "address": 201,
-     "read_only": False, "range": "10-3000", "effect": "立即"},
-    {"id": "FU202", "name": "内部给定最大转矩限制 (%)", "group": "转矩参数", "sub_group": "电流环与转矩限制", "type": "u16", "address": 202,
-     "read_only": False, "range": "0-800", "effect": "立即", "tooltip": "1% 额定转矩"},
-    {"id": "FU203", "name": "模拟量转矩限制", "group": "转矩参数", "sub_group": "电流环与转矩限制", "type": "enum16", "address": 203,
-     "read_only": False, "effect": "立即", "options": {0: "不使用", 1: "使用"}},
-    {"id": "FU204", "name": "转矩内部给定 (%)", "group": "转矩参数", "sub_group": "电流环与转矩限制", "type": "s16", "address": 204,
-     "read_only": False, "range": "-800~+800", "effect": "立即", "tooltip": "1% 额定转矩"},
-    {"id": "FU207", "name": "紧急停止时的转矩限制 (%)", "group": "转矩参数", "sub_group": "电流环与转矩限制", "type": "u16", "address": 207,
-     "read_only": False, "range": "1-300", "effect": "立即", "tooltip": "1% 额定转矩. 用于正/反转禁止或紧急停止"},
-    {"id": "FU208", "name": "正转最大转矩限制 (%)", "group": "转矩参数", "sub_group": "电流环与转矩限制", "type": "u16", "address": 208,
-     "read_only": False, "range": "0-800", "effect": "立即", "tooltip": "1% 额定转矩"},
-    {"id": "FU209", "name": "反转最大转矩限制 (%)", "group": "转矩参数", "sub_group": "电流环与转矩限制", "type": "u16", "address": 209,
-     "read_only": False, "range": "0-800", "effect": "立即", "tooltip": "1% 额定转矩"},
-    {"id": "FU216", "name": "正反转禁止的转矩限制设定", "group": "转矩参数", "sub_group": "电流环与转矩限制", "type": "enum16", "address": 216,
-     "read_only": False, "effect": "立即", "options": {0: "实际限制为FU207设定值", 1: "限制值为0"}},
-    {"id": "FU237", "name": "目标转矩范围 (%)", "group": "转矩参数", "sub_group": "电流环与转矩限制", "type": "u16", "address": 237,
-     "read_only": False, "range": "1-800", "effect": "立即", "tooltip": "1% 额定转矩. T-CMP信号触发范围"},
-    {"id": "FU238", "name": "转矩滤波频率 (0.01Hz)", "group": "转矩参数", "sub_group": "电流环与转矩限制", "type": "u16", "address": 238,
-     "read_only": False, "range": "1-1000", "effect": "立即"},
-
-    # --- 速度限制与斜坡 ---
-    {"id": "FU210", "name": "速度限制设置", "group": "转矩参数", "sub_group": "速度限制与斜坡", "type": "enum16", "address": 210,
-     "read_only": False, "effect": "立即", "options": {0: "内部给定(FU211)", 1: "模拟量限制", 2: "取最高转速和电机最高转速的较小值"}},
-    {"id": "FU211", "name": "速度限制内部给定 (0.1r/min)", "group": "转矩参数", "sub_group": "速度限制与斜坡", "type": "u16",
-     "address": 211, "read_only": False, "range": "0-32000", "effect": "立即"},
-    {"id": "FU212", "name": "转矩提升时间 (0.1ms)", "group": "转矩参数", "sub_group": "速度限制与斜坡", "type": "u16", "address": 212,
-     "read_only": False, "range": "0-30000", "effect": "立即"},
-    {"id": "FU213", "name": "转矩下降时间 (0.1ms)", "group": "转矩参数", "sub_group": "速度限制与斜坡", "type": "u16", "address": 213,
-     "read_only": False, "range": "0-30000", "effect": "立即"},
-    {"id": "FU214", "name": "第一转矩滤波时间 (0.01ms)", "group": "转矩参数", "sub_group": "速度限制与斜坡", "type": "u16", "address": 214,
-     "read_only": False, "range": "0-30000", "effect": "立即"},
-    {"id": "FU215", "name": "第二转矩滤波时间 (0.01ms)", "group": "转矩参数", "sub_group": "速度限制与斜坡", "type": "u16", "address": 215,
-     "read_only": False, "range": "0-30000", "effect": "立即"},
-
-    # --- 陷波滤波器 1 ---
-    {"id": "FU217", "name": "第一陷波滤波器中心频率 (Hz)", "group": "转矩参数", "sub_group": "陷波滤波器 1", "type": "u16", "address": 217,
-     "read_only": False, "range": "50-30000", "effect": "立即"},
-    {"id": "FU218", "name": "第一陷波滤波器带宽 (Hz)", "group": "转矩参数", "sub_group": "陷波滤波器 1", "type": "u16", "address": 218,
-     "read_only": False, "range": "0-30000", "effect": "立即"},
-    {"id": "FU219", "name": "第一陷波滤波器深度", "group": "转矩参数", "sub_group": "陷波滤波器 1", "type": "u16", "address": 219,
-     "read_only": False, "range": "0-100", "effect": "立即"},
-
-    # --- 陷波滤波器 2 ---
-    {"id": "FU220", "name": "第二陷波滤波器中心频率 (Hz)", "group": "转矩参数", "sub_group": "陷波滤波器 2", "type": "u16", "address": 220,
-     "read_only": False, "range": "50-30000", "effect": "立即"},
-    {"id": "FU221", "name": "第二陷波滤波器带宽 (Hz)", "group": "转矩参数", "sub_group": "陷波滤波器 2", "type": "u16", "address": 221,
-     "read_only": False, "range": "0-30000", "effect": "立即"},
-    {"id": "FU222", "name": "第二陷波滤波器深度", "group": "转矩参数", "sub_group": "陷波滤波器 2", "type": "u16", "address": 222,
-     "read_only": False, "range": "0-100", "effect": "立即"},
-
-    # --- 陷波滤波器 3 ---
-    {"id": "FU223", "name": "第三陷波滤波器中心频率 (Hz)", "group": "转矩参数", "sub_group": "陷波滤波器 3", "type": "u16", "address": 223,
-     "read_only": False, "range": "50-30000", "effect": "立即"},
-    {"id": "FU224", "name": "第三陷波滤波器带宽 (Hz)", "group": "转矩参数", "sub_group": "陷波滤波器 3", "type": "u16", "address": 224,
-     "read_only": False, "range": "0-30000", "effect": "立即"},
-    {"id": "FU225", "name": "第三陷波滤波器深度", "group": "转矩参数", "sub_group": "陷波滤波器 3", "type": "u16", "address": 225,
-     "read_only": False, "range": "0-100", "effect": "立即"},
-
-    # --- 陷波滤波器 4 ---
-    {"id": "FU226", "name": "第四陷波滤波器中心频率 (Hz)", "group": "转矩参数", "sub_group": "陷波滤波器 4", "type": "u16", "address": 226,
-     "read_only": False, "range": "50-30000", "effect": "立即"},
-    {"id": "FU227", "name": "第四陷波滤波器带宽 (Hz)", "group": "转矩参数", "sub_group": "陷波滤波器 4", "type": "u16", "address": 227,
-     "read_only": False, "range": "0-30000", "effect": "立即"},
-    {"id": "FU228", "name": "第四陷波滤波器深度", "group": "转矩参数", "sub_group": "陷波滤波器 4", "type": "u16", "address": 228,
-     "read_only": False, "range": "0-100", "effect": "立即"},
-
-    # --- 陷波滤波器通用设置 ---
-    {"id": "FU229", "name": "陷波滤波器启动功能", "group": "转矩参数", "sub_group": "陷波滤波器通用设置", "type": "enum16", "address": 229,
-     "read_only": False, "effect": "立即", "options": {0: "关闭自动配置", 1: "启动自动配置", 2: "正在自动配置"}},
-    {"id": "FU230", "name": "陷波滤波器个数", "group": "转矩参数", "sub_group": "陷波滤波器通用设置", "type": "u16", "address": 230,
-     "read_only": False, "range": "1-4", "effect": "立即"},
-
-    # --- 补偿与抑制 ---
-    {"id": "FU234", "name": "负载观测器增益", "group": "转矩参数", "sub_group": "补偿与抑制", "type": "u16", "address": 234,
-     "read_only": False, "range": "0-1000", "effect": "立即", "tooltip": "补偿负载转矩, 增强刚性"},
-    {"id": "FU235", "name": "负载观测器滤波时间 (0.01ms)", "group": "转矩参数", "sub_group": "补偿与抑制", "type": "u16", "address": 235,
-     "read_only": False, "range": "0-30000", "effect": "立即"},
-    {"id": "FU236", "name": "反电势补偿系数", "group": "转矩参数", "sub_group": "补偿与抑制", "type": "u16", "address": 236,
-     "read_only": False, "range": "0-1000", "effect": "立即"},
-    {"id": "FU239", "name": "重力力矩补偿 (0.1%)", "group": "转矩参数", "sub_group": "补偿与抑制", "type": "u16", "address": 239,
-     "read_only": False, "range": "0-1000", "effect": "立即"},
-    {"id": "FU240", "name": "抖动抑制中心频率 (0.1Hz)", "group": "转矩参数", "sub_group": "补偿与抑制", "type": "u16", "address": 240,
-     "read_only": False, "range": "1-2000", "effect": "立即"},
-    {"id": "FU241", "name": "抖动抑制宽度 (0.1Hz)", "group": "转矩参数", "sub_group": "补偿与抑制", "type": "u16", "address": 241,
-     "read_only": False, "range": "1-100", "effect": "立即"},
-    {"id": "FU242", "name": "抖动抑制强度", "group": "转矩参数", "sub_group": "补偿与抑制", "type": "u16", "address": 242,
-     "read_only": False, "range": "0-100", "effect": "立即"},
-
-    # --- 保留项 ---
-    {"id": "FU205", "name": "保留", "group": "转矩参数", "sub_group": "保留项", "type": "u16", "address": 205,
-     "read_only": True},
-    {"id": "FU206", "name": "保留", "group": "转矩参数", "sub_group": "保留项", "type": "u16", "address": 206,
-     "read_only": True},
-]
-
-# ==============================================================================
-# 7.3.4 位置参数 (FU300 ~ FU389)
-# 地址规则: 参数号
-# ==============================================================================
-POSITION_PARAMETERS = [
-    # --- 位置环与脉冲指令 ---
-    {"id": "FU301", "name": "第一位置环增益", "group": "位置参数", "sub_group": "位置环与脉冲指令", "type": "u16", "address": 301,
-     "read_only": False, "range": "1-30000", "effect": "立即"},
-    {"id": "FU302", "name": "第二位置环增益", "group": "位置参数", "sub_group": "位置环与脉冲指令", "type": "u16", "address": 302,
-     "read_only": False, "range": "1-30000", "effect": "立即"},
-    {"id": "FU303", "name": "位置环前馈增益", "group": "位置参数", "sub_group": "位置环与脉冲指令", "type": "u16", "address": 303,
-     "read_only": False, "range": "0-1000", "effect": "立即"},
-    {"id": "FU306", "name": "位置环滤波时间 (ms)", "group": "位置参数", "sub_group": "位置环与脉冲指令", "type": "u16", "address": 306,
-     "read_only": False, "range": "1-10000", "effect": "立即"},
-    {"id": "FU326", "name": "位置前馈滤波时间 (0.01ms)", "group": "位置参数", "sub_group": "位置环与脉冲指令", "type": "u16",
-     "address": 326, "read_only": False, "range": "1-30000", "effect": "立即"},
-    {"id": "FU300", "name": "外部脉冲指令设置", "group": "位置参数", "sub_group": "位置环与脉冲指令", "type": "bit_field", "address": 300,
-     "read_only": False, "effect": "立即", "fields": [
-        {"name": "[A]分频输出相位", "start_bit": 12, "length": 1, "type": "enum", "options": {0: "反相位", 1: "正相位"}},
-        {"name": "[B]脉冲输入逻辑", "start_bit": 8, "length": 2, "type": "enum",
-         "options": {0: "PULS反,SIGN反", 1: "PULS正,SIGN正", 2: "PULS反,SIGN正", 3: "PULS正,SIGN反"}},
-        {"name": "[C]脉冲输入滤波", "start_bit": 4, "length": 4, "type": "enum",
-         "options": {0: "4MHz", 1: "2MHz", 2: "1MHz", 3: "500KHz", 4: "200KHz", 5: "150KHz", 6: "80KHz"}},
-        {"name": "[D]脉冲模式", "start_bit": 0, "length": 2, "type": "enum",
-         "options": {0: "脉冲+方向", 1: "脉冲+脉冲 (CW/CCW)", 2: "正交(A/B, 4倍频)"}}
-    ]},
-
-    # --- 电子齿轮比 ---
-    {"id": "FU304", "name": "第一组电子齿轮比(分子)", "group": "位置参数", "sub_group": "电子齿轮比", "type": "u16", "address": 304,
-     "read_only": False, "range": "0-65535", "effect": "立即"},
-    {"id": "FU305", "name": "第一组电子齿轮比(分母)", "group": "位置参数", "sub_group": "电子齿轮比", "type": "u16", "address": 305,
-     "read_only": False, "range": "1-65535", "effect": "立即"},
-    {"id": "FU344", "name": "第二组电子齿轮比(分子)", "group": "位置参数", "sub_group": "电子齿轮比", "type": "s32", "address": 344,
-     "word_order": "big", "read_only": False, "range": "1-2147483647", "effect": "立即"},
-    {"id": "FU346", "name": "第二组电子齿轮比(分母)", "group": "位置参数", "sub_group": "电子齿轮比", "type": "s32", "address": 346,
-     "word_order": "big", "read_only": False, "range": "1-2147483647", "effect": "立即"},
-    {"id": "FU339", "name": "电子齿轮比选择", "group": "位置参数", "sub_group": "电子齿轮比", "type": "enum16", "address": 339,
-     "read_only": False, "effect": "立即", "options": {0: "第一组", 1: "第二组", 2: "DI端子选择"}},
-
-    # --- 位置误差与到达 ---
-    {"id": "FU307", "name": "位置到达脉冲数范围", "group": "位置参数", "sub_group": "位置误差与到达", "type": "u16", "address": 307,
-     "read_only": False, "range": "1-32000", "effect": "立即", "tooltip": "INP信号(定位完成)触发范围"},
-    {"id": "FU309", "name": "位置误差报警脉冲数", "group": "位置参数", "sub_group": "位置误差与到达", "type": "u16", "address": 309,
-     "read_only": False, "range": "1-32000", "effect": "立即"},
-    {"id": "FU327", "name": "位置误差警告脉冲数", "group": "位置参数", "sub_group": "位置误差与到达", "type": "u16", "address": 327,
-     "read_only": False, "range": "1-30000", "effect": "立即"},
-    {"id": "FU308", "name": "位置给定脉冲清零设置", "group": "位置参数", "sub_group": "位置误差与到达", "type": "bit_field", "address": 308,
-     "read_only": False, "effect": "立即", "fields": [
-        {"name": "[A]跟踪警告倍率", "start_bit": 12, "length": 1, "type": "enum", "options": {0: "1脉冲", 1: "100脉冲"}},
-        {"name": "[B]误差报警倍率", "start_bit": 8, "length": 1, "type": "enum", "options": {0: "1脉冲", 1: "100脉冲"}},
-        {"name": "[C]清零使能(CLR)", "start_bit": 4, "length": 1, "type": "enum", "options": {0: "禁止", 1: "允许外部IO"}},
-        {"name": "[D]指令禁止(INH-P)", "start_bit": 0, "length": 1, "type": "enum", "options": {0: "禁止", 1: "允许外部IO"}}
-    ]},
-
-    # --- 内部位置模式 ---
-    {"id": "FU340", "name": "位置模式FIR滤波器 (0.1ms)", "group": "位置参数", "sub_group": "内部位置模式", "type": "u16", "address": 340,
-     "read_only": False, "range": "0-10000", "effect": "立即"},
-    {"id": "FU341", "name": "内部位置模式选择", "group": "位置参数", "sub_group": "内部位置模式", "type": "enum16", "address": 341,
-     "read_only": False, "effect": "立即", "options": {0: "相对模式", 1: "绝对模式"}},
-    {"id": "FU342", "name": "内部位置触发", "group": "位置参数", "sub_group": "内部位置模式", "type": "enum16", "address": 342,
-     "read_only": False, "effect": "立即", "options": {0: "不触发", 1: "触发"}},
-    {"id": "FU343", "name": "位置模式加减速时间 (ms)", "group": "位置参数", "sub_group": "内部位置模式", "type": "u16", "address": 343,
-     "read_only": False, "range": "0-10000", "effect": "立即"},
-    {"id": "FU348", "name": "多段内部位置方式设定", "group": "位置参数", "sub_group": "内部位置模式", "type": "bit_field", "address": 348,
-     "read_only": False, "effect": "立即", "fields": [
-        {"name": "段数设定", "start_bit": 4, "length": 4, "type": "enum",
-         "options": {2: "2段", 3: "3段", 4: "4段", 5: "5段", 6: "6段", 7: "7段", 8: "8段"}},
-        {"name": "功能设定", "start_bit": 0, "length": 1, "type": "enum", "options": {0: "不启用", 1: "启用"}}
-    ]},
-    {"id": "FU349", "name": "多段内部位置循环次数", "group": "位置参数", "sub_group": "内部位置模式", "type": "u16", "address": 349,
-     "read_only": False, "range": "0-30000", "effect": "立即", "tooltip": "0表示无限循环"},
-    {"id": "FU338", "name": "内部位置给定速度单位", "group": "位置参数", "sub_group": "内部位置模式", "type": "enum16", "address": 338,
-     "read_only": False, "effect": "立即", "options": {0: "电机实际转速(0.1r/min)，与电子齿轮比无关", 1: "0.01KHz，经过电子齿轮分频"}},
-
-    # --- 多段位置速度(1-8) ---
-    {"id": "FU330", "name": "位置1 给定速度 (0.1r/min)", "group": "位置参数", "sub_group": "多段位置速度(1-8)", "type": "u16",
-     "address": 330, "read_only": False, "range": "1-65535", "effect": "立即"},
-    {"id": "FU331", "name": "位置2 给定速度 (0.1r/min)", "group": "位置参数", "sub_group": "多段位置速度(1-8)", "type": "u16",
-     "address": 331, "read_only": False, "range": "1-65535", "effect": "立即"},
-    {"id": "FU332", "name": "位置3 给定速度 (0.1r/min)", "group": "位置参数", "sub_group": "多段位置速度(1-8)", "type": "u16",
-     "address": 332, "read_only": False, "range": "1-65535", "effect": "立即"},
-    {"id": "FU333", "name": "位置4 给定速度 (0.1r/min)", "group": "位置参数", "sub_group": "多段位置速度(1-8)", "type": "u16",
-     "address": 333, "read_only": False, "range": "1-65535", "effect": "立即"},
-    {"id": "FU334", "name": "位置5 给定速度 (0.1r/min)", "group": "位置参数", "sub_group": "多段位置速度(1-8)", "type": "u16",
-     "address": 334, "read_only": False, "range": "1-65535", "effect": "立即"},
-    {"id": "FU335", "name": "位置6 给定速度 (0.1r/min)", "group": "位置参数", "sub_group": "多段位置速度(1-8)", "type": "u16",
-     "address": 335, "read_only": False, "range": "1-65535", "effect": "立即"},
-    {"id": "FU336", "name": "位置7 给定速度 (0.1r/min)", "group": "位置参数", "sub_group": "多段位置速度(1-8)", "type": "u16",
-     "address": 336, "read_only": False, "range": "1-65535", "effect": "立即"},
-    {"id": "FU337", "name": "位置8 给定速度 (0.1r/min)", "group": "位置参数", "sub_group": "多段位置速度(1-8)", "type": "u16",
-     "address": 337, "read_only": False, "range": "1-65535", "effect": "立即"},
-    {"id": "FU350", "name": "位置1 给定位置", "group": "位置参数", "sub_group": "多段位置(1-8)", "type": "s32", "address": 350,
-     "word_order": "big", "read_only": False, "range": "-2147483647~+2147483647", "effect": "立即"},
-    {"id": "FU352", "name": "位置2 给定位置", "group": "位置参数", "sub_group": "多段位置(1-8)", "type": "s32", "address": 352,
-     "word_order": "big", "read_only": False, "range": "-2147483647~+2147483647", "effect": "立即"},
-    {"id": "FU354", "name": "位置3 给定位置", "group": "位置参数", "sub_group": "多段位置(1-8)", "type": "s32", "address": 354,
-     "word_order": "big", "read_only": False, "range": "-2147483647~+2147483647", "effect": "立即"},
-    {"id": "FU356", "name": "位置4 给定位置", "group": "位置参数", "sub_group": "多段位置(1-8)", "type": "s32", "address": 356,
-     "word_order": "big", "read_only": False, "range": "-2147483647~+2147483647", "effect": "立即"},
-    {"id": "FU358", "name": "位置5 给定位置", "group": "位置参数", "sub_group": "多段位置(1-8)", "type": "s32", "address": 358,
-     "word_order": "big", "read_only": False, "range": "-2147483647~+2147483647", "effect": "立即"},
-    {"id": "FU360", "name": "位置6 给定位置", "group": "位置参数", "sub_group": "多段位置(1-8)", "type": "s32", "address": 360,
-     "word_order": "big", "read_only": False, "range": "-2147483647~+2147483647", "effect": "立即"},
-    {"id": "FU362", "name": "位置7 给定位置", "group": "位置参数", "sub_group": "多段位置(1-8)", "type": "s32", "address": 362,
-     "word_order": "big", "read_only": False, "range": "-2147483647~+2147483647", "effect": "立即"},
-    {"id": "FU364", "name": "位置8 给定位置", "group": "位置参数", "sub_group": "多段位置(1-8)", "type": "s32", "address": 364,
-     "word_order": "big", "read_only": False, "range": "-2147483647~+2147483647", "effect": "立即"},
-
-    # --- 龙门同步与全闭环 ---
-    {"id": "FU376", "name": "位置反馈来源", "group": "位置参数", "sub_group": "龙门同步与全闭环", "type": "enum16", "address": 376,
-     "read_only": False, "effect": "立即", "options": {0: "编码器反馈", 1: "高速计数器1", 2: "高速计数器2"}},
-    {"id": "FU377", "name": "位置反馈脉冲比例(分子)", "group": "位置参数", "sub_group": "龙门同步与全闭环", "type": "u16", "address": 377,
-     "read_only": False, "range": "1-65535", "effect": "立即"},
-    {"id": "FU378", "name": "位置反馈脉冲比例(分母)", "group": "位置参数", "sub_group": "龙门同步与全闭环", "type": "u16", "address": 378,
-     "read_only": False, "range": "1-65535", "effect": "立即"},
-    {"id": "FU379", "name": "混合误差清除圈数", "group": "位置参数", "sub_group": "龙门同步与全闭环", "type": "u16", "address": 379,
-     "read_only": False, "range": "0-32000", "effect": "立即"},
-    {"id": "FU380", "name": "混合误差报警脉冲", "group": "位置参数", "sub_group": "龙门同步与全闭环", "type": "u16", "address": 380,
-     "read_only": False, "range": "1-65535", "effect": "立即"},
-    {"id": "FU381", "name": "龙门同步增益", "group": "位置参数", "sub_group": "龙门同步与全闭环", "type": "u16", "address": 381,
-     "read_only": False, "range": "1-30000", "effect": "立即"},
-    {"id": "FU382", "name": "龙门位置反馈来源", "group": "位置参数", "sub_group": "龙门同步与全闭环", "type": "enum16", "address": 382,
-     "read_only": False, "effect": "立即", "options": {0: "保留", 1: "保留"}},
-    {"id": "FU383", "name": "龙门失同步报警脉冲数", "group": "位置参数", "sub_group": "龙门同步与全闭环", "type": "u16", "address": 383,
-     "read_only": False, "range": "10-32000", "effect": "立即"},
-    {"id": "FU384", "name": "龙门同步反馈比例(分子)", "group": "位置参数", "sub_group": "龙门同步与全闭环", "type": "s32", "address": 384,
-     "word_order": "big", "read_only": False, "range": "1-2147483647", "effect": "立即"},
-    {"id": "FU386", "name": "龙门同步反馈比例(分母)", "group": "位置参数", "sub_group": "龙门同步与全闭环", "type": "u16", "address": 386,
-     "read_only": False, "range": "1-30000", "effect": "立即"},
-
-    # --- 中断与方向滤波 ---
-    {"id": "FU388", "name": "中断定长设置", "group": "位置参数", "sub_group": "中断与方向滤波", "type": "bit_field", "address": 388,
-     "read_only": False, "effect": "立即", "fields": [
-        {"name": "启用释放端子", "start_bit": 4, "length": 1, "type": "enum", "options": {0: "不启用", 1: "启用"}},
-        {"name": "启用中断功能", "start_bit": 0, "length": 1, "type": "enum", "options": {0: "不启用", 1: "启用"}}
-    ]},
-    {"id": "FU389", "name": "位置指令方向滤波频率", "group": "位置参数", "sub_group": "中断与方向滤波", "type": "u16", "address": 389,
-     "read_only": False, "range": "1-15", "effect": "立即"},
-
-    # --- 多段位置加减速(1-8) ---
-    {"id": "FU310", "name": "位置1 加速时间 (ms)", "group": "位置参数", "sub_group": "多段位置加减速(1-8)", "type": "u16",
-     "address": 310, "read_only": False, "range": "0-32000", "effect": "立即"},
-    {"id": "FU311", "name": "位置1 减速时间 (ms)", "group": "位置参数", "sub_group": "多段位置加减速(1-8)", "type": "u16",
-     "address": 311, "read_only": False, "range": "0-32000", "effect": "立即"},
-    {"id": "FU312", "name": "位置2 加速时间 (ms)", "group": "位置参数", "sub_group": "多段位置加减速(1-8)", "type": "u16",
-     "address": 312, "read_only": False, "range": "0-32000", "effect": "立即"},
-    {"id": "FU313", "name": "位置2 减速时间 (ms)", "group": "位置参数", "sub_group": "多段位置加减速(1-8)", "type": "u16",
-     "address": 313, "read_only": False, "range": "0-32000", "effect": "立即"},
-    {"id": "FU314", "name": "位置3 加速时间 (ms)", "group": "位置参数", "sub_group": "多段位置加减速(1-8)", "type": "u16",
-     "address": 314, "read_only": False, "range": "0-32000", "effect": "立即"},
-    {"id": "FU315", "name": "位置3 减速时间 (ms)", "group": "位置参数", "sub_group": "多段位置加减速(1-8)", "type": "u16",
-     "address": 315, "read_only": False, "range": "0-32000", "effect": "立即"},
-    {"id": "FU316", "name": "位置4 加速时间 (ms)", "group": "位置参数", "sub_group": "多段位置加减速(1-8)", "type": "u16",
-     "address": 316, "read_only": False, "range": "0-32000", "effect": "立即"},
-    {"id": "FU317", "name": "位置4 减速时间 (ms)", "group": "位置参数", "sub_group": "多段位置加减速(1-8)", "type": "u16",
-     "address": 317, "read_only": False, "range": "0-32000", "effect": "立即"},
-    {"id": "FU318", "name": "位置5 加速时间 (ms)", "group": "位置参数", "sub_group": "多段位置加减速(1-8)", "type": "u16",
-     "address": 318, "read_only": False, "range": "0-32000", "effect": "立即"},
-    {"id": "FU319", "name": "位置5 减速时间 (ms)", "group": "位置参数", "sub_group": "多段位置加减速(1-8)", "type": "u16",
-     "address": 319, "read_only": False, "range": "0-32000", "effect": "立即"},
-    {"id": "FU320", "name": "位置6 加速时间 (ms)", "group": "位置参数", "sub_group": "多段位置加减速(1-8)", "type": "u16",
-     "address": 320, "read_only": False, "range": "0-32000", "effect": "立即"},
-    {"id": "FU321", "name": "位置6 减速时间 (ms)", "group": "位置参数", "sub_group": "多段位置加减速(1-8)", "type": "u16",
-     "address": 321, "read_only": False, "range": "0-32000", "effect": "立即"},
-    {"id": "FU322", "name": "位置7 加速时间 (ms)", "group": "位置参数", "sub_group": "多段位置加减速(1-8)", "type": "u16",
-     "address": 322, "read_only": False, "range": "0-32000", "effect": "立即"},
-    {"id": "FU323", "name": "位置7 减速时间 (ms)", "group": "位置参数", "sub_group": "多段位置加减速(1-8)", "type": "u16",
-     "address": 323, "read_only": False, "range": "0-32000", "effect": "立即"},
-    {"id": "FU324", "name": "位置8 加速时间 (ms)", "group": "位置参数", "sub_group": "多段位置加减速(1-8)", "type": "u16",
-     "address": 324, "read_only": False, "range": "0-32000", "effect": "立即"},
-    {"id": "FU325", "name": "位置8 减速时间 (ms)", "group": "位置参数", "sub_group": "多段位置加减速(1-8)", "type": "u16",
-     "address": 325, "read_only": False, "range": "0-32000", "effect": "立即"},
-
-
-    # --- 多段位置间隔时间(1-8) ---
-    {"id": "FU366", "name": "第1段结束后间隔时间 (ms)", "group": "位置参数", "sub_group": "多段位置间隔时间(1-8)", "type": "u16",
-     "address": 366, "read_only": False, "range": "0-32000", "effect": "立即"},
-    {"id": "FU367", "name": "第2段结束后间隔时间 (ms)", "group": "位置参数", "sub_group": "多段位置间隔时间(1-8)", "type": "u16",
-     "address": 367, "read_only": False, "range": "0-32000", "effect": "立即"},
-    {"id": "FU368", "name": "第3段结束后间隔时间 (ms)", "group": "位置参数", "sub_group": "多段位置间隔时间(1-8)", "type": "u16",
-     "address": 368, "read_only": False, "range": "0-32000", "effect": "立即"},
-    {"id": "FU369", "name": "第4段结束后间隔时间 (ms)", "group": "位置参数", "sub_group": "多段位置间隔时间(1-8)", "type": "u16",
-     "address": 369, "read_only": False, "range": "0-32000", "effect": "立即"},
-    {"id": "FU370", "name": "第5段结束后间隔时间 (ms)", "group": "位置参数", "sub_group": "多段位置间隔时间(1-8)", "type": "u16",
-     "address": 370, "read_only": False, "range": "0-32000", "effect": "立即"},
-    {"id": "FU371", "name": "第6段结束后间隔时间 (ms)", "group": "位置参数", "sub_group": "多段位置间隔时间(1-8)", "type": "u16",
-     "address": 371, "read_only": False, "range": "0-32000", "effect": "立即"},
-    {"id": "FU372", "name": "第7段结束后间隔时间 (ms)", "group": "位置参数", "sub_group": "多段位置间隔时间(1-8)", "type": "u16",
-     "address": 372, "read_only": False, "range": "0-32000", "effect": "立即"},
-    {"id": "FU373", "name": "第8段结束后间隔时间 (ms)", "group": "位置参数", "sub_group": "多段位置间隔时间(1-8)", "type": "u16",
-     "address": 373, "read_only": False, "range": "0-32000", "effect": "立即"},
-
-    # --- 指令来源 ---
-    {"id": "FU374", "name": "位置脉冲模式指令来源", "group": "位置参数", "sub_group": "指令来源与混合模式", "type": "bit_field",
-     "address": 374, "read_only": False, "effect": "立即", "tooltip": "配置位置脉冲模式下, 指令可来自哪些源的叠加", "fields": [
-        {"name": "[B]内部位置脉冲", "start_bit": 8, "length": 1, "type": "enum", "options": {0: "关闭来源", 1: "开启来源"}},
-        {"name": "[C]高速计数器", "start_bit": 4, "length": 1, "type": "enum", "options": {0: "关闭来源", 1: "开启来源"}},
-        {"name": "[D]低速脉冲", "start_bit": 0, "length": 1, "type": "enum", "options": {0: "关闭来源", 1: "开启来源"}}
-    ]},
-    {"id": "FU375", "name": "内部位置模式指令来源", "group": "位置参数", "sub_group": "指令来源与混合模式", "type": "bit_field",
-     "address": 375, "read_only": False, "effect": "立即", "tooltip": "配置内部位置模式下, 指令可来自哪些源的叠加", "fields": [
-        {"name": "[B]内部位置脉冲", "start_bit": 8, "length": 1, "type": "enum", "options": {0: "关闭来源", 1: "开启来源"}},
-        {"name": "[C]高速计数器1", "start_bit": 4, "length": 1, "type": "enum", "options": {0: "关闭来源", 1: "开启来源"}},
-        {"name": "[D]低速脉冲", "start_bit": 0, "length": 1, "type": "enum", "options": {0: "关闭来源", 1: "开启来源"}}
-    ]},
-]
-
-# ==============================================================================
-# 7.3.5 输入输出参数 (FU400 ~ FU445)
-# 地址规则: 参数号
-# ==============================================================================
-IO_PARAMETERS = [
-    # --- 模拟量输入 ---
-    {"id": "FU400", "name": "模拟量速度指令电压对应最大速度 (r/min)", "group": "输入输出参数", "sub_group": "模拟量输入", "type": "u16",
-     "address": 400, "read_only": False, "range": "1-10000", "effect": "立即"},
-    {"id": "FU401", "name": "模拟量转矩指令电压对应最大转矩 (%)", "group": "输入输出参数", "sub_group": "模拟量输入", "type": "u16",
-     "address": 401, "read_only": False, "range": "0-800", "effect": "立即", "tooltip": "1% 额定转矩"},
-    {"id": "FU402", "name": "AV零漂补偿 (mv)", "group": "输入输出参数", "sub_group": "模拟量输入", "type": "s16", "address": 402,
-     "read_only": False, "range": "-5000~+5000", "effect": "立即"},
-    {"id": "FU403", "name": "AC零漂补偿 (mv)", "group": "输入输出参数", "sub_group": "模拟量输入", "type": "s16", "address": 403,
-     "read_only": False, "range": "-5000~+5000", "effect": "立即"},
-    {"id": "FU404", "name": "模拟量速度指令滤波时间 (0.01ms)", "group": "输入输出参数", "sub_group": "模拟量输入", "type": "u16",
-     "address": 404, "read_only": False, "range": "1-30000", "effect": "立即"},
-    {"id": "FU405", "name": "模拟量转矩指令滤波时间 (0.01ms)", "group": "输入输出参数", "sub_group": "模拟量输入", "type": "u16",
-     "address": 405, "read_only": False, "range": "1-30000", "effect": "立即"},
-    {"id": "FU406", "name": "AI自动调零", "group": "输入输出参数", "sub_group": "模拟量输入", "type": "enum16", "address": 406,
-     "read_only": False, "effect": "立即", "options": {0: "不动作", 1: "执行调零"}, "tooltip": "执行前请将模拟量输入接地"},
-    {"id": "FU426", "name": "模拟量零漂报警范围 (mv)", "group": "输入输出参数", "sub_group": "模拟量输入", "type": "u16", "address": 426,
-     "read_only": False, "range": "1-10000", "effect": "立即"},
-    {"id": "FU427", "name": "模拟量端子控制", "group": "输入输出参数", "sub_group": "模拟量输入", "type": "enum16", "address": 427,
-     "read_only": False, "effect": "立即", "options": {0: "保留", 1: "保留"}},
-    {"id": "FU428", "name": "模拟量速度指令来源", "group": "输入输出参数", "sub_group": "模拟量输入", "type": "enum16", "address": 428,
-     "read_only": False, "effect": "立即", "options": {0: "AV通道", 1: "AC通道"}},
-    {"id": "FU429", "name": "模拟量转矩指令来源", "group": "输入输出参数", "sub_group": "模拟量输入", "type": "enum16", "address": 429,
-     "read_only": False, "effect": "立即", "options": {0: "AV通道", 1: "AC通道"}},
-    {"id": "FU430", "name": "速度模拟量下限电压对应速度 (0.1%)", "group": "输入输出参数", "sub_group": "模拟量输入", "type": "s16",
-     "address": 430, "read_only": False, "range": "-1000~+1000", "effect": "立即"},
-    {"id": "FU431", "name": "速度模拟量下限电压 (0.01V)", "group": "输入输出参数", "sub_group": "模拟量输入", "type": "s16", "address": 431,
-     "read_only": False, "range": "-1000~+1000", "effect": "立即"},
-    {"id": "FU432", "name": "速度模拟量上限电压对应速度 (0.1%)", "group": "输入输出参数", "sub_group": "模拟量输入", "type": "s16",
-     "address": 432, "read_only": False, "range": "-1000~+1000", "effect": "立即"},
-    {"id": "FU433", "name": "速度模拟量上限电压 (0.01V)", "group": "输入输出参数", "sub_group": "模拟量输入", "type": "s16", "address": 433,
-     "read_only": False, "range": "-1000~+1000", "effect": "立即"},
-    {"id": "FU434", "name": "模拟量下限电压对应转矩 (0.1%)", "group": "输入输出参数", "sub_group": "模拟量输入", "type": "s16",
-     "address": 434, "read_only": False, "range": "-1000~+1000", "effect": "立即"},
-    {"id": "FU435", "name": "转矩模拟量下限电压 (0.01V)", "group": "输入输出参数", "sub_group": "模拟量输入", "type": "s16", "address": 435,
-     "read_only": False, "range": "-1000~+1000", "effect": "立即"},
-    {"id": "FU436", "name": "转矩模拟量上限电压对应转矩 (0.1%)", "group": "输入输出参数", "sub_group": "模拟量输入", "type": "s16",
-     "address": 436, "read_only": False, "range": "-1000~+1000", "effect": "立即"},
-    {"id": "FU437", "name": "转矩模拟量上限电压 (0.01V)", "group": "输入输出参数", "sub_group": "模拟量输入", "type": "s16", "address": 437,
-     "read_only": False, "range": "-1000~+1000", "effect": "立即"},
-
-    # --- DI端子功能 (手册中DI1-DI3对应FU407-419) ---
-    # --- DI端子功能 (完整) ---
-    {"id": "FU407_DI1", "name": "DI1端子功能", "group": "输入输出参数", "sub_group": "DI端子功能", "type": "bit_field", "address": 407, "read_only": False, "effect": "立即", "fields": [
-        {"name": "节点类型", "start_bit": 8, "length": 1, "type": "enum", "options": {0: "常闭(NC)", 1: "常开(NO)"}},
-        {"name": "功能选择", "start_bit": 0, "length": 6, "type": "enum", "options": {0:"伺服使能(SON-I)", 1:"报警复位(AL-RST)", 2:"正转转矩限制(F-CL)", 3:"反转转矩限制(R-CL)", 4:"内部速度选择1(SD-S1)", 5:"内部速度选择2(SD-S2)", 6:"内部速度方向(SD-DIR)", 7:"零速箝位(ZCLAMP)", 8:"增益切换(GAIN-SEL)", 9:"内部位置终止(STOP)", 10:"脉冲清除(CLR)", 11:"指令脉冲禁止(INH-P)", 12:"紧急停止(ESP)", 13:"反转禁止(R-INH)", 14:"正转禁止(F-INH)", 16:"内部位置选择1(SD0)", 17:"内部位置选择2(SD1)", 18:"内部位置选择3(SD2)", 19:"内部位置暂停(HOLD)", 20:"内部位置触发(CTRG)", 21:"原点检索触发(SHOM)", 22:"外部参考原点(ORGP)", 23:"模拟量速度正转(F-AS)", 24:"模拟量速度反转(R-AS)", 25:"模式切换(M-SEL)", 26:"正向点动(JOGU)", 27:"反向点动(JOGD)", 28:"电机过热(HOT)", 29:"中断定长释放(XintTrig)", 30:"中断定长启用(XintRest)", 31:"龙门同步启动(GAN-SYNC)", 33:"电子齿轮选择(GEAR_SEL)"}}
-    ]},
-    {"id": "FU408_DI2", "name": "DI2端子功能", "group": "输入输出参数", "sub_group": "DI端子功能", "type": "bit_field", "address": 408, "read_only": False, "effect": "立即", "fields": [
-        {"name": "节点类型", "start_bit": 8, "length": 1, "type": "enum", "options": {0: "常闭(NC)", 1: "常开(NO)"}},
-        {"name": "功能选择", "start_bit": 0, "length": 6, "type": "enum", "options": {0:"伺服使能(SON-I)", 1:"报警复位(AL-RST)", 2:"正转转矩限制(F-CL)", 3:"反转转矩限制(R-CL)", 4:"内部速度选择1(SD-S1)", 5:"内部速度选择2(SD-S2)", 6:"内部速度方向(SD-DIR)", 7:"零速箝位(ZCLAMP)", 8:"增益切换(GAIN-SEL)", 9:"内部位置终止(STOP)", 10:"脉冲清除(CLR)", 11:"指令脉冲禁止(INH-P)", 12:"紧急停止(ESP)", 13:"反转禁止(R-INH)", 14:"正转禁止(F-INH)", 16:"内部位置选择1(SD0)", 17:"内部位置选择2(SD1)", 18:"内部位置选择3(SD2)", 19:"内部位置暂停(HOLD)", 20:"内部位置触发(CTRG)", 21:"原点检索触发(SHOM)", 22:"外部参考原点(ORGP)", 23:"模拟量速度正转(F-AS)", 24:"模拟量速度反转(R-AS)", 25:"模式切换(M-SEL)", 26:"正向点动(JOGU)", 27:"反向点动(JOGD)", 28:"电机过热(HOT)", 29:"中断定长释放(XintTrig)", 30:"中断定长启用(XintRest)", 31:"龙门同步启动(GAN-SYNC)", 33:"电子齿轮选择(GEAR_SEL)"}}
-    ]},
-    {"id": "FU409_DI3", "name": "DI3端子功能", "group": "输入输出参数", "sub_group": "DI端子功能", "type": "bit_field", "address": 409, "read_only": False, "effect": "立即", "fields": [
-        {"name": "节点类型", "start_bit": 8, "length": 1, "type": "enum", "options": {0: "常闭(NC)", 1: "常开(NO)"}},
-        {"name": "功能选择", "start_bit": 0, "length": 6, "type": "enum", "options": {0:"伺服使能(SON-I)", 1:"报警复位(AL-RST)", 2:"正转转矩限制(F-CL)", 3:"反转转矩限制(R-CL)", 4:"内部速度选择1(SD-S1)", 5:"内部速度选择2(SD-S2)", 6:"内部速度方向(SD-DIR)", 7:"零速箝位(ZCLAMP)", 8:"增益切换(GAIN-SEL)", 9:"内部位置终止(STOP)", 10:"脉冲清除(CLR)", 11:"指令脉冲禁止(INH-P)", 12:"紧急停止(ESP)", 13:"反转禁止(R-INH)", 14:"正转禁止(F-INH)", 16:"内部位置选择1(SD0)", 17:"内部位置选择2(SD1)", 18:"内部位置选择3(SD2)", 19:"内部位置暂停(HOLD)", 20:"内部位置触发(CTRG)", 21:"原点检索触发(SHOM)", 22:"外部参考原点(ORGP)", 23:"模拟量速度正转(F-AS)", 24:"模拟量速度反转(R-AS)", 25:"模式切换(M-SEL)", 26:"正向点动(JOGU)", 27:"反向点动(JOGD)", 28:"电机过热(HOT)", 29:"中断定长释放(XintTrig)", 30:"中断定长启用(XintRest)", 31:"龙门同步启动(GAN-SYNC)", 33:"电子齿轮选择(GEAR_SEL)"}}
-    ]},
-    # Assuming DI4-DI8 follow the same pattern and addresses
-    {"id": "FU410_DI4", "name": "DI4端子功能", "group": "输入输出参数", "sub_group": "DI端子功能", "type": "bit_field", "address": 410, "read_only": False, "effect": "立即", "fields": [
-        {"name": "节点类型", "start_bit": 8, "length": 1, "type": "enum", "options": {0: "常闭(NC)", 1: "常开(NO)"}},
-        {"name": "功能选择", "start_bit": 0, "length": 6, "type": "enum", "options": {0:"伺服使能(SON-I)", 1:"报警复位(AL-RST)", 2:"正转转矩限制(F-CL)", 3:"反转转矩限制(R-CL)", 4:"内部速度选择1(SD-S1)", 5:"内部速度选择2(SD-S2)", 6:"内部速度方向(SD-DIR)", 7:"零速箝位(ZCLAMP)", 8:"增益切换(GAIN-SEL)", 9:"内部位置终止(STOP)", 10:"脉冲清除(CLR)", 11:"指令脉冲禁止(INH-P)", 12:"紧急停止(ESP)", 13:"反转禁止(R-INH)", 14:"正转禁止(F-INH)", 16:"内部位置选择1(SD0)", 17:"内部位置选择2(SD1)", 18:"内部位置选择3(SD2)", 19:"内部位置暂停(HOLD)", 20:"内部位置触发(CTRG)", 21:"原点检索触发(SHOM)", 22:"外部参考原点(ORGP)", 23:"模拟量速度正转(F-AS)", 24:"模拟量速度反转(R-AS)", 25:"模式切换(M-SEL)", 26:"正向点动(JOGU)", 27:"反向点动(JOGD)", 28:"电机过热(HOT)", 29:"中断定长释放(XintTrig)", 30:"中断定长启用(XintRest)", 31:"龙门同步启动(GAN-SYNC)", 33:"电子齿轮选择(GEAR_SEL)"}}
-    ]},
-
-    # --- DO端子功能 ---
-    {"id": "FU421_DO1", "name": "DO1端子功能", "group": "输入输出参数", "sub_group": "DO端子功能", "type": "bit_field", "address": 421, "read_only": False, "effect": "立即", "tooltip": "小功率型伺服此DO口输出由FU020参数控制", "fields": [
-        {"name": "输出类型", "start_bit": 8, "length": 1, "type": "enum", "options": {0: "常闭(NC)", 1: "常开(NO)"}},
-        {"name": "功能选择", "start_bit": 0, "length": 4, "type": "enum", "options": {0:"伺服准备好(S-RDY)", 1:"伺服使能(SON-O)", 2:"旋转检出(TGON)", 3:"速度到达(V-CMP)", 4:"位置到达(P-CMP)", 5:"转矩限制中(T-LT)", 6:"伺服报警(ALM)", 7:"电磁抱闸控制(BRAKE)", 8:"过载预警(OL-W)", 9:"速度限制中(S-LT)", 10:"内部位置触发中(CTRGING)", 11:"位置偏差过大警告(PER-W)", 12:"原点找到(HOME)", 13:"目标转矩到达(T-CMP)", 15:"Z信号输出(Z-OUT)"}}
-    ]},
-    {"id": "FU422_DO2", "name": "DO2端子功能", "group": "输入输出参数", "sub_group": "DO端子功能", "type": "bit_field", "address": 422, "read_only": False, "effect": "立即", "fields": [
-        {"name": "输出类型", "start_bit": 8, "length": 1, "type": "enum", "options": {0: "常闭(NC)", 1: "常开(NO)"}},
-        {"name": "功能选择", "start_bit": 0, "length": 4, "type": "enum", "options": {0:"伺服准备好(S-RDY)", 1:"伺服使能(SON-O)", 2:"旋转检出(TGON)", 3:"速度到达(V-CMP)", 4:"位置到达(P-CMP)", 5:"转矩限制中(T-LT)", 6:"伺服报警(ALM)", 7:"电磁抱闸控制(BRAKE)", 8:"过载预警(OL-W)", 9:"速度限制中(S-LT)", 10:"内部位置触发中(CTRGING)", 11:"位置偏差过大警告(PER-W)", 12:"原点找到(HOME)", 13:"目标转矩到达(T-CMP)", 15:"Z信号输出(Z-OUT)"}}
-    ]},
-    {"id": "FU423_DO3", "name": "DO3端子功能", "group": "输入输出参数", "sub_group": "DO端子功能", "type": "bit_field", "address": 423, "read_only": False, "effect": "立即", "fields": [
-        {"name": "输出类型", "start_bit": 8, "length": 1, "type": "enum", "options": {0: "常闭(NC)", 1: "常开(NO)"}},
-        {"name": "功能选择", "start_bit": 0, "length": 4, "type": "enum", "options": {0:"伺服准备好(S-RDY)", 1:"伺服使能(SON-O)", 2:"旋转检出(TGON)", 3:"速度到达(V-CMP)", 4:"位置到达(P-CMP)", 5:"转矩限制中(T-LT)", 6:"伺服报警(ALM)", 7:"电磁抱闸控制(BRAKE)", 8:"过载预警(OL-W)", 9:"速度限制中(S-LT)", 10:"内部位置触发中(CTRGING)", 11:"位置偏差过大警告(PER-W)", 12:"原点找到(HOME)", 13:"目标转矩到达(T-CMP)", 15:"Z信号输出(Z-OUT)"}}
-    ]},
-    {"id": "FU424_DO4", "name": "DO4端子功能", "group": "输入输出参数", "sub_group": "DO端子功能", "type": "bit_field", "address": 424, "read_only": False, "effect": "立即", "fields": [
-        {"name": "输出类型", "start_bit": 8, "length": 1, "type": "enum", "options": {0: "常闭(NC)", 1: "常开(NO)"}},
-        {"name": "功能选择", "start_bit": 0, "length": 4, "type": "enum", "options": {0:"伺服准备好(S-RDY)", 1:"伺服使能(SON-O)", 2:"旋转检出(TGON)", 3:"速度到达(V-CMP)", 4:"位置到达(P-CMP)", 5:"转矩限制中(T-LT)", 6:"伺服报警(ALM)", 7:"电磁抱闸控制(BRAKE)", 8:"过载预警(OL-W)", 9:"速度限制中(S-LT)", 10:"内部位置触发中(CTRGING)", 11:"位置偏差过大警告(PER-W)", 12:"原点找到(HOME)", 13:"目标转矩到达(T-CMP)", 15:"Z信号输出(Z-OUT)"}}
-    ]},
-    {"id": "FU425_ALM", "name": "ALM端子功能", "group": "输入输出参数", "sub_group": "DO端子功能", "type": "bit_field", "address": 425, "read_only": False, "effect": "立即", "fields": [
-        {"name": "输出类型", "start_bit": 8, "length": 1, "type": "enum", "options": {0: "常闭(NC)", 1: "常开(NO)"}},
-        {"name": "功能选择", "start_bit": 0, "length": 4, "type": "enum", "options": {0:"伺服准备好(S-RDY)", 1:"伺服使能(SON-O)", 2:"旋转检出(TGON)", 3:"速度到达(V-CMP)", 4:"位置到达(P-CMP)", 5:"转矩限制中(T-LT)", 6:"伺服报警(ALM)", 7:"电磁抱闸控制(BRAKE)", 8:"过载预警(OL-W)", 9:"速度限制中(S-LT)", 10:"内部位置触发中(CTRGING)", 11:"位置偏差过大警告(PER-W)", 12:"原点找到(HOME)", 13:"目标转矩到达(T-CMP)", 15:"Z信号输出(Z-OUT)"}}
-    ]},
-
-    # --- 端子滤波 ---
-    {"id": "FU438", "name": "DI1端子滤波时间", "group": "输入输出参数", "sub_group": "端子滤波", "type": "u16", "address": 438,
-     "read_only": False, "range": "0-30000", "effect": "立即"},
-    {"id": "FU439", "name": "DI2端子滤波时间", "group": "输入输出参数", "sub_group": "端子滤波", "type": "u16", "address": 439,
-     "read_only": False, "range": "0-30000", "effect": "立即"},
-    {"id": "FU440", "name": "DI3端子滤波时间", "group": "输入输出参数", "sub_group": "端子滤波", "type": "u16", "address": 440,
-     "read_only": False, "range": "0-30000", "effect": "立即"},
-    {"id": "FU441", "name": "DI4端子滤波时间", "group": "输入输出参数", "sub_group": "端子滤波", "type": "u16", "address": 441,
-     "read_only": False, "range": "0-30000", "effect": "立即"},
-    {"id": "FU442", "name": "DI5端子滤波时间", "group": "输入输出参数", "sub_group": "端子滤波", "type": "u16", "address": 442,
-     "read_only": False, "range": "0-30000", "effect": "立即"},
-    {"id": "FU443", "name": "DI6端子滤波时间", "group": "输入输出参数", "sub_group": "端子滤波", "type": "u16", "address": 443,
-     "read_only": False, "range": "0-30000", "effect": "立即"},
-    {"id": "FU444", "name": "DI7端子滤波时间", "group": "输入输出参数", "sub_group": "端子滤波", "type": "u16", "address": 444,
-     "read_only": False, "range": "0-30000", "effect": "立即"},
-    {"id": "FU445", "name": "DI8端子滤波时间", "group": "输入输出参数", "sub_group": "端子滤波", "type": "u16", "address": 445,
-     "read_only": False, "range": "0-30000", "effect": "立即"},
-]
-
-
-# Note: For brevity, repetitive DI/DO function selections (e.g., FU408, FU409, FU422, etc.)
-# are omitted but would follow the same bit_field pattern as FU407 and FU421.
-
-
-# ==============================================================================
-# 7.3.6 通讯参数 (FU500 ~ FU505, FU020)
-# 地址规则: 参数号
-# ==============================================================================
-COMMUNICATION_PARAMETERS = [
-    # --- 通讯设置 ---
-    {"id": "FU500", "name": "通讯地址", "group": "通讯参数", "sub_group": "通讯设置", "type": "u16", "address": 500, "read_only": False, "range": "1-254", "effect": "立即"},
-    {"id": "FU501", "name": "通讯模式", "group": "通讯参数", "sub_group": "通讯设置", "type": "enum16", "address": 501, "read_only": False, "effect": "立即", "options": {0: "RTU", 1: "ASCII"}},
-    {"id": "FU502", "name": "停止位", "group": "通讯参数", "sub_group": "通讯设置", "type": "enum16", "address": 502, "read_only": False, "effect": "立即", "options": {0: "1个停止位", 1: "2个停止位"}},
-    {"id": "FU503", "name": "奇偶校验设置", "group": "通讯参数", "sub_group": "通讯设置", "type": "enum16", "address": 503, "read_only": False, "effect": "立即", "options": {0: "无校验", 1: "奇校验", 2: "偶校验"}},
-    {"id": "FU504", "name": "通讯波特率 (bit/s)", "group": "通讯参数", "sub_group": "通讯设置", "type": "enum16", "address": 504, "read_only": False, "effect": "立即", "options": {
-        0: "2400",
-        1: "4800",
-        2: "9600",
-        3: "19200",
-        4: "38400",
-        5: "57600"
-    }},
-    {"id": "FU505", "name": "通讯读写允许", "group": "通讯参数", "sub_group": "通讯设置", "type": "enum16", "address": 505, "read_only": False, "effect": "立即", "options": {
-        0: "读写允许",
-        1: "读写不允许"
-    }, "tooltip": "设为不允许时, 掉电后通讯写入的数据会丢失"},
-
-    # --- 引脚功能复用 (与通讯相关) ---
-    # {"id": "FU020", "name": "分频信号/引脚功能设置", "group": "通讯参数", "sub_group": "引脚功能复用", "type": "enum16", "address": 20, "read_only": False, "effect": "重新上电保存", "tooltip": "警告: 此参数会改变硬件引脚功能！仅对小功率型号有效。详见手册P79, P91", "options": {
-    #     0: "26/10脚=MODBUS, DO1可由FU421配置",
-    #     1: "26/10脚=MODBUS, DO1固定为Z相集电极输出",
-    #     2: "26/10脚=A相差分, 30/15脚=B相差分 (MODBUS不可用)"
-    # }},
-]
+try:
+    from scope_view import ScopeWidget
+except ImportError:  # numpy is optional: only the oscilloscope tab needs it
+    ScopeWidget = None
 
 # ==============================================================================
-# 7.4 电机参数 (PA000 ~ PA121)
-# 地址规则: 参数号 + PA_BASE_ADDRESS (假定为4000)
-# 警告: 除非明确知道后果，否则不应修改这些参数。
+# PART 1: REGISTER CONFIGURATION
+# The register tables live in registers.py; the catalog built from them is
+# loaded lazily (and cached) by register_catalog.load_register_catalog().
 # ==============================================================================
-PA_BASE_ADDRESS = 4000
-
-MOTOR_PARAMETERS = [
-    # --- 电气特性 ---
-    {"id": "PA000", "name": "伺服电机额定电压 (V)", "group": "电机参数", "sub_group": "电气特性", "type": "u16",
-     "address": PA_BASE_ADDRESS + 0, "read_only": False, "range": "1-30000", "effect": "立即",
-     "tooltip": "警告: 擅自修改可能导致损坏！"},
-    {"id": "PA001", "name": "伺服电机额定电流 (0.1A)", "group": "电机参数", "sub_group": "电气特性", "type": "u16",
-     "address": PA_BASE_ADDRESS + 1, "read_only": False, "range": "1-30000", "effect": "立即",
-     "tooltip": "警告: 擅自修改可能导致损坏！"},
-    {"id": "PA005", "name": "伺服电机相间电阻 (10⁻³Ω)", "group": "电机参数", "sub_group": "电气特性", "type": "u16",
-     "address": PA_BASE_ADDRESS + 5, "read_only": False, "range": "0-30000", "effect": "立即",
-     "tooltip": "警告: 擅自修改可能导致损坏！"},
-    {"id": "PA006", "name": "伺服电机D轴电感 (10⁻⁶H)", "group": "电机参数", "sub_group": "电气特性", "type": "u16",
-     "address": PA_BASE_ADDRESS + 6, "read_only": False, "range": "0-30000", "effect": "立即",
-     "tooltip": "警告: 擅自修改可能导致损坏！"},
-    {"id": "PA007", "name": "伺服电机Q轴电感 (10⁻⁶H)", "group": "电机参数", "sub_group": "电气特性", "type": "u16",
-     "address": PA_BASE_ADDRESS + 7, "read_only": False, "range": "0-30000", "effect": "立即",
-     "tooltip": "警告: 擅自修改可能导致损坏！"},
-    {"id": "PA008", "name": "反电动势线电压有效值 (0.1V/1000r/min)", "group": "电机参数", "sub_group": "电气特性", "type": "u16",
-     "address": PA_BASE_ADDRESS + 8, "read_only": False, "range": "0-30000", "effect": "立即",
-     "tooltip": "警告: 擅自修改可能导致损坏！"},
-
-    # --- 机械特性 ---
-    {"id": "PA002", "name": "伺服电机最高转速 (r/min)", "group": "电机参数", "sub_group": "机械特性", "type": "u16",
-     "address": PA_BASE_ADDRESS + 2, "read_only": False, "range": "0-30000", "effect": "立即",
-     "tooltip": "警告: 擅自修改可能导致损坏！"},
-    {"id": "PA003", "name": "伺服电机额定转速 (r/min)", "group": "电机参数", "sub_group": "机械特性", "type": "u16",
-     "address": PA_BASE_ADDRESS + 3, "read_only": False, "range": "1-30000", "effect": "立即",
-     "tooltip": "警告: 擅自修改可能导致损坏！"},
-    {"id": "PA004", "name": "伺服电机极对数 (对)", "group": "电机参数", "sub_group": "机械特性", "type": "u16",
-     "address": PA_BASE_ADDRESS + 4, "read_only": False, "range": "1-30", "effect": "立即", "tooltip": "警告: 擅自修改可能导致损坏！"},
-    {"id": "PA011", "name": "伺服电机功率 (0.01KW)", "group": "电机参数", "sub_group": "机械特性", "type": "u16",
-     "address": PA_BASE_ADDRESS + 11, "read_only": False, "range": "0-30000", "effect": "立即",
-     "tooltip": "警告: 擅自修改可能导致损坏！"},
-    {"id": "PA012", "name": "伺服电机转动惯量 (10⁻⁶Kg·m²)", "group": "电机参数", "sub_group": "机械特性", "type": "u32",
-     "address": PA_BASE_ADDRESS + 12, "word_order": "big", "read_only": False, "range": "0-2147483647", "effect": "立即",
-     "tooltip": "警告: 擅自修改可能导致损坏！"},
-    {"id": "PA121", "name": "伺服电机过载敏感性", "group": "电机参数", "sub_group": "机械特性", "type": "u16",
-     "address": PA_BASE_ADDRESS + 121, "read_only": False, "range": "1-30000", "effect": "立即",
-     "tooltip": "警告: 擅自修改可能导致损坏！"},
-
-    # --- 编码器特性 ---
-    {"id": "PA016", "name": "伺服电机编码器线数 (线)", "group": "电机参数", "sub_group": "编码器特性", "type": "u32",
-     "address": PA_BASE_ADDRESS + 16, "word_order": "big", "read_only": False, "range": "0-2147483647", "effect": "立即",
-     "tooltip": "警告: 擅自修改可能导致损坏！"},
-    {"id": "PA018", "name": "伺服电机编码器安装角度", "group": "电机参数", "sub_group": "编码器特性", "type": "s32",
-     "address": PA_BASE_ADDRESS + 18, "word_order": "big", "read_only": False, "range": "-2147483647~+2147483647",
-     "effect": "立即", "tooltip": "警告: 擅自修改可能导致损坏！"},
-]
-
-REGISTER_MAP = []
-
-REGISTER_MAP.extend(MONITORING_PARAMETERS)
-REGISTER_MAP.extend(AUXILIARY_PARAMETERS)
-REGISTER_MAP.extend(SYSTEM_PARAMETERS_0_20)
-REGISTER_MAP.extend(VELOCITY_PARAMETERS)
-REGISTER_MAP.extend(TORQUE_PARAMETERS)
-REGISTER_MAP.extend(POSITION_PARAMETERS)
-REGISTER_MAP.extend(IO_PARAMETERS)
-REGISTER_MAP.extend(COMMUNICATION_PARAMETERS)
-
-
-# NOTE: This is a truncated REGISTER_MAP for demonstration.
-# The full map from previous answers should be pasted here.
+# Tab whose registers can be polled continuously by the live monitor
+MONITOR_GROUP = "监控参数"
+# Monitor channels checked by default (output current, motor speed: one read
+# block); every further block costs a request per drive in each cycle
+DEFAULT_MONITOR_IDS = ('SU-00', 'SU-02')
+# Tab with the table view of the whole catalog (alternative to the per-register widgets)
+TABLE_TAB_NAME = "参数表"
+# Tab with live traces of the monitored registers
+SCOPE_TAB_NAME = "示波器"
+# Tab with per-transaction bus statistics
+DIAGNOSTICS_TAB_NAME = "诊断"
+
+# Addresses the HSX2M answers with an exception response (illegal data address).
+# Coalesced block reads bridge unlisted gaps, so add any such address here.
+# A property of the drive model, not of one drive: every port's worker starts
+# its own hole set from this seed and adds the holes it learns to that copy,
+# so this list is never modified at run time.
+READ_HOLES = ()
+
+
+class WriteVerifyError(ModbusException):
+    """The drive accepted a write but reads back a different value."""
+
+    def __init__(self, written, actual):
+        super().__init__(f"回读校验失败: 写入 {written}, 回读 {actual}")
+        self.written = written
+        self.actual = actual
 
 
 # ==============================================================================
@@ -1046,187 +163,886 @@ class StatusIndicator(QWidget):
 # PART 3: CORE LOGIC (ModbusWorker, RegisterWidget)
 # ==============================================================================
 class ModbusWorker(QObject):
-    connection_status = pyqtSignal(bool, str)
-    log_message = pyqtSignal(str, str)
-    read_result = pyqtSignal(str, object)
-    write_result = pyqtSignal(str, bool, object)
-
-    def __init__(self, port, baudrate, parity, stopbits, timeout):
+    """
+    Owns the serial client and runs every bus transaction on its own thread.
+    Jobs arrive through queued signals connected to the run_*_job slots, so
+    the worker's event loop is the command queue; results go back as signals.
+    One worker serves every drive (slave id) on its RS-485 line; reads that
+    cover several drives interleave their blocks through a SlaveScheduler,
+    and every result names the port and slave it came from.
+    """
+    connection_status = pyqtSignal(str, bool, str)  # port, connected, message
+    log_event = pyqtSignal(object)  # LogEvent, only for levels at or above log_level
+    read_results = pyqtSignal(str, int, object)  # port, slave_id, {id: value or exception}, one emission per block
+    write_result = pyqtSignal(str, int, str, bool, object)  # port, slave_id, id, success, value or exception
+    write_results = pyqtSignal(str, int, object)  # port, slave_id, {id: value written or exception}, one per batch
+    snapshot_read = pyqtSignal(str, int, object)  # port, slave_id, {id: value or exception} for the whole snapshot
+    monitor_sample = pyqtSignal(str, int, object, object)  # port, slave_id, monotonic timestamp (ns), {id: value}
+    monitor_stats = pyqtSignal(str, object)  # port, see _publish_monitor_stats
+    metrics_report = pyqtSignal(str, object)  # port, BusMetrics.report() rows
+    stopped = pyqtSignal()
+
+    MONITOR_STATS_INTERVAL = 1.0  # seconds between monitor_stats reports
+    METRICS_INTERVAL = 1.0  # seconds between metrics_report reports
+
+    def __init__(self, port, baudrate, parity, stopbits, timeout, read_holes=None,
+                 max_read_words=MODBUS_MAX_READ_WORDS, codecs=None, slave_ids=(1,), slave_weights=None,
+                 cache_policy=None, log_level=INFO, client_factory=None, retry_policy=None):
         super().__init__()
         self._port = port
         self._baudrate = baudrate
-
-        self.client = ModbusSerialClient(
+        self._cancelled_up_to = 0  # jobs with an id <= this are dropped
+        self._log_rank = level_rank(log_level)  # events below this rank are not even built
+
+        # Drives on this line; a weight of w gives a slave w blocks per scheduler turn
+        self.slave_ids = list(slave_ids)
+        self.slave_weights = dict(slave_weights or {})
+
+        # Block planning inputs: link timing, and addresses the drive is
+        # known to reject, which a coalesced read must never span
+        self.link_timing = LinkTiming(baudrate, parity, stopbits)
+        self.read_holes = set(read_holes or ())
+        # Some drives accept fewer registers per request than the protocol's 125
+        self.max_read_words = min(max_read_words, MODBUS_MAX_READ_WORDS)
+
+        # Precompiled register codecs ({id: RegisterCodec}), extended on demand,
+        # and the block codecs built from them, keyed by block layout
+        self.codecs = dict(codecs or {})
+        self._block_codecs = {}
+
+        # Shadow image of every drive's registers ({slave_id: ShadowImage}),
+        # fed by every read and write; cache_policy decides which reads it may serve
+        self.cache_policy = cache_policy or CachePolicy()
+        self._shadows = {}
+
+        # Live monitoring state; the timer is created on the worker thread
+        self._monitor_timer = None
+        self._monitor_configs = []
+        self._monitor_scheduler = SlaveScheduler()
+        self._monitor_holes_seen = 0
+        self._monitor_requested_hz = 0.0
+        self._monitor_period = 0.0
+        self._monitor_errors = 0
+
+        # Per-transaction counters and round-trip histograms, reported every METRICS_INTERVAL
+        self.metrics = BusMetrics()
+        self._metrics_timer = None
+
+        # Reply timeouts are derived per drive from its measured round trips
+        # ({slave_id: RttEstimator}); `timeout` is the initial value and the
+        # ceiling. Lost or corrupted replies are retried here, per block.
+        self.timeout = timeout
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._rtt = {}
+
+        # client_factory takes ModbusSerialClient's arguments; a SimulatedBus.client runs without hardware.
+        # The client's own retries are off: it would resend with the full timeout, up to three times.
+        self.client = (client_factory or ModbusSerialClient)(
             port=self._port,
             baudrate=self._baudrate,
             parity=parity,
             stopbits=stopbits,
-            timeout=timeout
+            timeout=timeout,
+            retries=0
         )
 
-        self.dtype_map = {
-            'u16': self.client.DATATYPE.UINT16,
-            's16': self.client.DATATYPE.INT16,
-            'enum16': self.client.DATATYPE.UINT16,
-            'bit_field': self.client.DATATYPE.UINT16,
-            'u32': self.client.DATATYPE.UINT32,
-            's32': self.client.DATATYPE.INT32
-        }
+    @property
+    def port(self):
+        return self._port
 
-    def read_single_register(self, config):
+    def cancel_pending(self, last_job_id):
+        """
+        Drops every job up to and including last_job_id that has not run yet.
+        Safe to call from the GUI thread: it only stores an int, which the
+        worker checks before each job and between block transactions.
+        """
+        self._cancelled_up_to = max(self._cancelled_up_to, last_job_id)
+
+    def _is_cancelled(self, job_id):
+        return job_id <= self._cancelled_up_to
+
+    def set_log_level(self, level):
+        """
+        Sets the lowest level emitted as log_event. Safe to call from the GUI
+        thread for the same reason as cancel_pending.
+        """
+        self._log_rank = level_rank(level)
+
+    def _log(self, level, code, **fields):
+        # Events are data; the text is only formatted by a sink that shows it
+        if level_rank(level) >= self._log_rank:
+            self.log_event.emit(LogEvent(level, code, self._port, **fields))
+
+    @pyqtSlot(int, object, object, bool)
+    def run_read_job(self, job_id, slave_ids, configs, use_cache):
+        if not self._is_cancelled(job_id):
+            self.read_multiple_registers(configs, job_id, slave_ids, use_cache)
+
+    @pyqtSlot(int, int, object, object, bool)
+    def run_write_job(self, job_id, slave_id, config, value, verify):
+        if not self._is_cancelled(job_id):
+            self.write_logical_value(config, value, slave_id, verify)
+
+    @pyqtSlot(int, int, object, bool)
+    def run_write_batch_job(self, job_id, slave_id, writes, verify):
+        if not self._is_cancelled(job_id):
+            self.write_logical_values(writes, slave_id, verify)
+
+    @pyqtSlot(int, int, object)
+    def run_snapshot_job(self, job_id, slave_id, configs):
+        if not self._is_cancelled(job_id):
+            self.read_snapshot(configs, slave_id, job_id)
+
+    def read_single_register(self, config, slave_id=1):
         """Wrapper to read a single register using the multiple-read logic."""
-        self.read_multiple_registers([config])
+        self.read_multiple_registers([config], slave_ids=[slave_id])
 
-    def read_multiple_registers(self, configs: list):
+    def read_multiple_registers(self, configs: list, job_id=0, slave_ids=None, use_cache=False):
         """
-        Reads a list of registers by grouping them into contiguous blocks
-        and sending one read request per block.
+        Reads a list of registers from each drive in slave_ids (default: all
+        drives of this worker) by grouping them into read blocks (small gaps
+        are bridged when cheaper than another request, see plan_read_blocks)
+        and sending one read request per block. The drives' blocks are
+        interleaved, so every drive shows progress. If the owning job is
+        cancelled, the remaining blocks are skipped.
+        With use_cache, registers whose shadow value is still fresh under
+        cache_policy are reported at once and only the rest go to the bus.
         """
+        slave_ids = self.slave_ids if slave_ids is None else list(slave_ids)
         if not self.client.is_socket_open():
-            for cfg in configs:
-                self.read_result.emit(cfg['id'], ModbusException("客户端未连接"))
+            error = ModbusException("客户端未连接")
+            for slave_id in slave_ids:
+                self.read_results.emit(self._port, slave_id, {cfg['id']: error for cfg in configs})
             return
         if not configs:
             return
 
-        # Sort configs by address to make grouping easier
-        sorted_configs = sorted(configs, key=lambda x: x['address'])
-
-        # --- Block Grouping Logic ---
-        read_blocks = []
-        if sorted_configs:
-            current_block = {
-                'start_address': sorted_configs[0]['address'],
-                'word_count': 0,
-                'configs': []
-            }
-            for cfg in sorted_configs:
-                addr = cfg['address']
-                words = 2 if cfg['type'] in ['u32', 's32'] else 1
-
-                # If current register is not contiguous with the block, end the current block
-                if addr != current_block['start_address'] + current_block['word_count']:
-                    if current_block['configs']:
-                        read_blocks.append(current_block)
-                    # Start a new block
-                    current_block = {'start_address': addr, 'word_count': 0, 'configs': []}
-
-                # Add the current register to the current block
-                current_block['word_count'] += words
-                current_block['configs'].append(cfg)
-
-            # Add the last block
-            if current_block['configs']:
-                read_blocks.append(current_block)
+        # --- Block Planning: coalesce across cheap gaps, never across holes ---
+        # All drives share one register map, so drives that need the same
+        # registers share one plan
+        plans = {}
+        scheduler = SlaveScheduler()
+        for slave_id in slave_ids:
+            to_read = configs
+            if use_cache:
+                cached, to_read = self._read_cached(configs, slave_id)
+                if cached:
+                    self._log(INFO, 'cache_hit', slave=slave_id, count=len(cached))
+                    self.read_results.emit(self._port, slave_id, cached)
+            key = tuple(cfg['id'] for cfg in to_read)
+            if key not in plans:
+                plans[key] = self._plan_blocks(to_read)
+            scheduler.set_plan(slave_id, plans[key], self.slave_weights.get(slave_id, 1))
 
         # --- Execute Reads and Unpack Results ---
-        for block in read_blocks:
-            try:
-                start = block['start_address']
-                count = block['word_count']
-                self.log_message.emit("info", f"批量读取: 地址={start}, 数量={count}")
-
-                rr = self.client.read_holding_registers(address=start, count=count, slave=1)
+        for slave_id, block, _ in scheduler.cycle():
+            if job_id and self._is_cancelled(job_id):
+                self._log(WARN, 'job_cancelled', job_id=job_id)
+                return
+            results = {}
+            self._read_block(block, results, slave_id)
+            self.read_results.emit(self._port, slave_id, results)
+
+    def _shadow(self, slave_id):
+        shadow = self._shadows.get(slave_id)
+        if shadow is None:
+            shadow = self._shadows[slave_id] = ShadowImage()
+        return shadow
+
+    def _read_cached(self, configs, slave_id):
+        """Splits configs into ({id: value} served from the shadow image, [configs] to read)."""
+        shadow = self._shadows.get(slave_id)
+        if shadow is None:
+            return {}, configs
+        now = time.monotonic()
+        cached, missing = {}, []
+        for cfg in configs:
+            max_age = self.cache_policy.max_age(cfg)
+            codec = self._codec(cfg)
+            words = None if max_age == 0 else shadow.get(cfg['address'], codec.words, max_age, now)
+            if words is None:
+                missing.append(cfg)
+            else:
+                cached[cfg['id']] = codec.decode(words)
+        return cached, missing
 
-                if rr.isError():
-                    raise ModbusException(f"Modbus error on block read: {rr}")
+    def read_snapshot(self, configs, slave_id=1, job_id=0):
+        """
+        Reads configs from one drive straight from the bus (coalesced blocks,
+        no cache) and reports everything in a single snapshot_read, so the
+        caller gets a consistent parameter set or knows which registers failed.
+        """
+        results = {}
+        if not self.client.is_socket_open():
+            error = ModbusException("客户端未连接")
+            results = {cfg['id']: error for cfg in configs}
+        else:
+            blocks = self._plan_blocks(configs)
+            self._log(INFO, 'snapshot_read', slave=slave_id, count=len(blocks), registers=len(configs))
+            for block in blocks:
+                if job_id and self._is_cancelled(job_id):
+                    self._log(WARN, 'job_cancelled', job_id=job_id)
+                    return
+                self._read_block(block, results, slave_id, verbose=False)
+        self.snapshot_read.emit(self._port, slave_id, results)
+
+    def _plan_blocks(self, configs):
+        return plan_read_blocks(configs, self.link_timing, self.read_holes, self.max_read_words)
+
+    def _read_block(self, block, results, slave_id=1, verbose=True):
+        """
+        Reads one planned block from drive slave_id and stores a value (or the exception) for each
+        of its registers in results, keyed by register id.
+        If the drive rejects the block with an exception response, the block
+        is split and retried so that only the offending sub-block fails; if
+        every part then succeeds, the bridged gap that caused the rejection is
+        remembered in read_holes. Returns True if all registers were read.
+        """
+        start = block['start_address']
+        count = block['word_count']
+        try:
+            started = time.perf_counter()
+            rr = self._read_registers(start, count, slave_id)
+            if verbose:
+                self._log(DEBUG, 'block_read', slave=slave_id, address=start, count=count,
+                          duration=time.perf_counter() - started)
+        except Exception as e:
+            if verbose:
+                self._log(ERROR, 'block_read_failed', slave=slave_id, address=start, count=count, error=e)
+            # No usable reply at all: report the error for all registers in this block
+            for cfg in block['configs']:
+                results[cfg['id']] = e
+            return False
+
+        if rr.isError():
+            configs = block['configs']
+            if len(configs) == 1:
+                e = ModbusException(f"Modbus error on block read: {rr}")
+                if verbose:
+                    self._log(ERROR, 'block_read_failed', slave=slave_id, address=start, count=count, error=e)
+                results[configs[0]['id']] = e
+                return False
+
+            self._log(WARN, 'block_rejected', slave=slave_id, address=start, count=count)
+            self.metrics.record_retry(slave_id, FC_READ_HOLDING_REGISTERS)
+            half = len(configs) // 2
+            sub_blocks = self._plan_blocks(configs[:half]) + self._plan_blocks(configs[half:])
+            all_ok = True
+            for sub in sub_blocks:
+                all_ok = self._read_block(sub, results, slave_id, verbose) and all_ok
+            if all_ok:
+                read_spans = set()
+                for sub in sub_blocks:
+                    read_spans.update(range(sub['start_address'], sub['start_address'] + sub['word_count']))
+                holes = set(range(start, start + count)) - read_spans
+                # No holes if the sub-blocks cover the whole span: the drive rejected the length, not a gap
+                if holes:
+                    self.read_holes.update(holes)
+                    self._log(WARN, 'holes_learned', slave=slave_id, holes=sorted(holes))
+            return all_ok
+
+        self._shadow(slave_id).store(start, rr.registers, SOURCE_READ)
+
+        # --- Unpack the whole block with its precompiled codec ---
+        try:
+            self._block_codec(block).decode_into(rr.registers, results)
+        except Exception as e:
+            if verbose:
+                self._log(ERROR, 'block_decode_failed', slave=slave_id, address=start, count=count, error=e)
+            for cfg in block['configs']:
+                results[cfg['id']] = e
+            return False
+        return True
 
-                # --- Unpack the results for each register in the block ---
-                offset = 0
-                for cfg in block['configs']:
-                    words = 2 if cfg['type'] in ['u32', 's32'] else 1
-                    registers_slice = rr.registers[offset: offset + words]
+    def _read_registers(self, start, count, slave_id):
+        return self._transact(FC_READ_HOLDING_REGISTERS, slave_id, count,
+                              lambda: self.client.read_holding_registers(address=start, count=count, slave=slave_id))
+
+    def _write_registers(self, start, words, slave_id):
+        return self._transact(FC_WRITE_MULTIPLE_REGISTERS, slave_id, len(words),
+                              lambda: self.client.write_registers(start, words, slave=slave_id))
+
+    def _rtt_estimator(self, slave_id):
+        estimator = self._rtt.get(slave_id)
+        if estimator is None:
+            estimator = self._rtt[slave_id] = RttEstimator(max_timeout=self.timeout)
+            # Drives on one line answer alike: start from a measured neighbour, not the ceiling
+            for other in self._rtt.values():
+                if other.srtt is not None:
+                    estimator.srtt, estimator.rttvar = other.srtt, other.rttvar
+                    break
+        return estimator
+
+    def _set_reply_timeout(self, seconds):
+        """
+        Sets the client's receive timeout for the following requests.
+        ModbusSerialClient only takes `timeout` in its constructor, and a
+        port cannot be shared by one client per drive; pymodbus 3.8.x reads
+        comm_params.timeout_connect afresh on every receive wait, so that
+        is where the timeout goes. Check this on a pymodbus upgrade.
+        SimulatedClient mirrors the attribute.
+        """
+        self.client.comm_params.timeout_connect = seconds
 
-                    word_order = Endian.BIG if cfg.get('word_order', 'big') == 'big' else Endian.LITTLE
+    def _wire_time(self, function_code, word_count):
+        return self.link_timing.wire_time(rtu_request_bytes(function_code, word_count),
+                                          rtu_response_bytes(function_code, word_count))
 
-                    value = self.client.convert_from_registers(
-                        registers_slice,
-                        self.dtype_map[cfg['type']],
-                        word_order=word_order
-                    )
+    def _transact(self, function_code, slave_id, word_count, request):
+        """
+        Runs one client request with a reply timeout derived from the
+        drive's measured round trips, and records every attempt's round trip
+        and outcome in metrics. A timeout or corrupted reply is sent again
+        (only this request, i.e. only the failed block) up to
+        retry_policy.max_retries times after a jittered backoff; an
+        exception response is an answer and is returned as is. Only first
+        attempts feed the estimate (Karn's rule): a late reply to an
+        earlier attempt would look like a fast one.
+        """
+        estimator = self._rtt_estimator(slave_id)
+        wire_time = self._wire_time(function_code, word_count)
+        attempt = 0
+        while True:
+            self._set_reply_timeout(estimator.timeout(wire_time))
+            started = time.perf_counter()
+            error = None
+            try:
+                response = request()
+            except Exception as e:
+                error = response = e
+            elapsed = time.perf_counter() - started
+            if isinstance(response, Exception):
+                outcome = classify_error(response)
+            else:
+                outcome = OUTCOME_EXCEPTION if response.isError() else OUTCOME_OK
+            self.metrics.record(slave_id, function_code, elapsed, word_count, outcome)
+
+            if outcome in (OUTCOME_OK, OUTCOME_EXCEPTION):
+                if attempt == 0:
+                    estimator.update(elapsed - wire_time)
+                return response
+            if outcome == OUTCOME_TIMEOUT:
+                estimator.on_timeout()
+            if outcome not in (OUTCOME_TIMEOUT, OUTCOME_CRC) or attempt >= self.retry_policy.max_retries:
+                if error is not None:
+                    raise error
+                return response
+            attempt += 1
+            self.metrics.record_retry(slave_id, function_code)
+            time.sleep(self.retry_policy.delay(attempt))
+
+    def _publish_metrics(self):
+        rows = self.metrics.report()
+        for row in rows:
+            # The reply timeout this drive currently gets for a one-register read
+            estimator = self._rtt.get(row['slave'])
+            wire_time = self._wire_time(FC_READ_HOLDING_REGISTERS, 1)
+            row['timeout_ms'] = None if estimator is None else 1000 * estimator.timeout(wire_time)
+        if rows:
+            self.metrics_report.emit(self._port, rows)
+
+    def _codec(self, config):
+        codec = self.codecs.get(config['id'])
+        if codec is None:
+            codec = self.codecs[config['id']] = RegisterCodec(config)
+        return codec
+
+    def _block_codec(self, block):
+        key = (block['start_address'], block['word_count'], tuple(cfg['id'] for cfg in block['configs']))
+        codec = self._block_codecs.get(key)
+        if codec is None:
+            codec = self._block_codecs[key] = BlockCodec(
+                block['start_address'], block['word_count'], [self._codec(cfg) for cfg in block['configs']])
+        return codec
+
+    @pyqtSlot(object, float)
+    def start_monitoring(self, configs, rate_hz):
+        """
+        Polls `configs` on every drive of this worker at rate_hz until
+        stop_monitoring. The block plan is computed once and reused every
+        cycle; the drives' blocks are interleaved and each drive's part of a
+        cycle is delivered as one monitor_sample signal as soon as it is
+        complete. Queued jobs still run between cycles.
+        """
+        self.stop_monitoring()
+        if not configs or rate_hz <= 0:
+            return
+        self._monitor_configs = list(configs)
+        self._plan_monitor()
+        self._monitor_requested_hz = rate_hz
+        self._monitor_period = 1.0 / self._monitor_rate(log=True)
+
+        self._monitor_cycles = 0
+        self._monitor_dropped = 0
+        self._monitor_errors = 0
+        self._monitor_intervals = []
+        self._monitor_last_tick = None
+        self._monitor_window_start = time.monotonic()
+
+        self._monitor_timer = QTimer(self)
+        self._monitor_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._monitor_timer.timeout.connect(self._monitor_tick)
+        self._monitor_timer.start(max(1, round(self._monitor_period * 1000)))
+        self._log(INFO, 'monitor_started', count=self._monitor_scheduler.block_count(),
+                  registers=len(self._monitor_configs), slaves=len(self.slave_ids), rate_hz=1.0 / self._monitor_period)
+
+    def _monitor_cycle_time(self):
+        """
+        Expected bus time of one monitor cycle: every planned block of every
+        drive, at its wire time plus the drive's measured reply overhead
+        (the modeled turnaround until it has been measured).
+        """
+        blocks = self._plan_blocks(self._monitor_configs)
+        total = 0.0
+        for slave_id in self.slave_ids:
+            estimator = self._rtt.get(slave_id)
+            overhead = self.link_timing.response_delay if estimator is None or estimator.srtt is None else estimator.srtt
+            total += sum(self._wire_time(FC_READ_HOLDING_REGISTERS, block['word_count']) + overhead for block in blocks)
+        return total
+
+    def _monitor_rate(self, log=False):
+        """
+        The requested monitor rate, or the highest rate the bus can sustain
+        if that is lower: a timer faster than a cycle only drops cycles.
+        """
+        cycle_time = self._monitor_cycle_time()
+        max_hz = 1.0 / cycle_time if cycle_time > 0 else float('inf')
+        if self._monitor_requested_hz <= max_hz:
+            return self._monitor_requested_hz
+        if log:
+            self._log(WARN, 'monitor_rate_limited', rate_hz=self._monitor_requested_hz, max_hz=max_hz,
+                      cycle_ms=cycle_time * 1000)
+        return max_hz
+
+    def _plan_monitor(self):
+        blocks = self._plan_blocks(self._monitor_configs)
+        self._monitor_scheduler.clear()
+        for slave_id in self.slave_ids:
+            self._monitor_scheduler.set_plan(slave_id, blocks, self.slave_weights.get(slave_id, 1))
+        self._monitor_holes_seen = len(self.read_holes)
+
+    @pyqtSlot()
+    def stop_monitoring(self):
+        if self._monitor_timer is None:
+            return
+        self._monitor_timer.stop()
+        self._monitor_timer.deleteLater()
+        self._monitor_timer = None
+        self._log(INFO, 'monitor_stopped')
+
+    def _monitor_tick(self):
+        now = time.monotonic()
+        if self._monitor_last_tick is not None:
+            interval = now - self._monitor_last_tick
+            self._monitor_intervals.append(interval)
+            # Qt coalesces timer events that fire while a cycle is still on the
+            # bus; every period that elapsed without a tick is a dropped cycle
+            missed = round(interval / self._monitor_period) - 1
+            if missed > 0:
+                self._monitor_dropped += missed
+        self._monitor_last_tick = now
 
-                    self.read_result.emit(cfg['id'], value)
-                    offset += words
+        if not self.client.is_socket_open():
+            return
+        self.run_monitor_cycle()
+        self._monitor_cycles += 1
 
-            except Exception as e:
-                self.log_message.emit("error", f"块读取失败: 地址={block['start_address']}, 错误: {e}")
-                # Emit error for all registers in this failed block
-                for cfg in block['configs']:
-                    self.read_result.emit(cfg['id'], e)
+        if now - self._monitor_window_start >= self.MONITOR_STATS_INTERVAL:
+            self._publish_monitor_stats(now)
 
+    @pyqtSlot()
+    def run_monitor_cycle(self):
+        """
+        Reads one monitor cycle of the registers last given to
+        start_monitoring now, outside the timer (the timer runs one per
+        period), emitting monitor_sample per drive as usual.
+        """
+        # A learned hole invalidates the precomputed plan
+        if len(self.read_holes) != self._monitor_holes_seen:
+            self._plan_monitor()
+
+        values = {}  # slave_id -> {id: value}
+        timestamps = {}
+        for slave_id, block, is_last in self._monitor_scheduler.cycle():
+            if slave_id not in values:
+                values[slave_id] = {}
+                timestamps[slave_id] = time.monotonic_ns()
+            if not self._read_block(block, values[slave_id], slave_id, verbose=False):
+                self._monitor_errors += 1
+            if is_last:
+                self.monitor_sample.emit(self._port, slave_id, timestamps[slave_id], values.pop(slave_id))
+
+    def _publish_monitor_stats(self, now):
+        """
+        Emits {'requested_hz', 'target_hz', 'achieved_hz', 'jitter_ms',
+        'dropped', 'errors'} for the window since the previous report;
+        jitter is the standard deviation of the tick interval. The target is
+        re-derived from the round trips measured so far, and the timer
+        follows it.
+        """
+        intervals = self._monitor_intervals
+        elapsed = now - self._monitor_window_start
+        jitter = 0.0
+        if len(intervals) > 1:
+            mean = sum(intervals) / len(intervals)
+            jitter = (sum((x - mean) ** 2 for x in intervals) / (len(intervals) - 1)) ** 0.5
+        target_hz = self._monitor_rate()
+        if abs(target_hz * self._monitor_period - 1.0) > 0.05:
+            self._monitor_period = 1.0 / target_hz
+            self._monitor_timer.setInterval(max(1, round(self._monitor_period * 1000)))
+        self.monitor_stats.emit(self._port, {
+            'requested_hz': self._monitor_requested_hz,
+            'target_hz': target_hz,
+            'achieved_hz': self._monitor_cycles / elapsed if elapsed > 0 else 0.0,
+            'jitter_ms': jitter * 1000,
+            'dropped': self._monitor_dropped,
+            'errors': self._monitor_errors,
+        })
+        self._monitor_cycles = 0
+        self._monitor_dropped = 0
+        self._monitor_errors = 0
+        self._monitor_intervals = []
+        self._monitor_window_start = now
+
+    @pyqtSlot()
     def connect_device(self):
+        # Nothing seen before a (re)connect can be trusted
+        self._shadows.clear()
+        self._rtt.clear()
+        self.metrics.reset()
         try:
             if self.client.connect():
-                self.connection_status.emit(True, f"成功连接到 {self._port}")
-                self.log_message.emit("info", f"串口 {self._port} 已连接。")
+                if self._metrics_timer is None:
+                    self._metrics_timer = QTimer(self)
+                    self._metrics_timer.timeout.connect(self._publish_metrics)
+                self._metrics_timer.start(round(self.METRICS_INTERVAL * 1000))
+                self.connection_status.emit(self._port, True, f"成功连接到 {self._port}")
+                self._log(INFO, 'connected')
             else:
                 raise ConnectionError(f"连接失败: 无法打开端口 {self._port}")
         except Exception as e:
-            self.connection_status.emit(False, f"连接失败: {e}")
-            self.log_message.emit("error", f"连接串口 {self._port} 失败: {e}")
+            self.connection_status.emit(self._port, False, f"连接失败: {e}")
+            self._log(ERROR, 'connect_failed', error=e)
 
+    @pyqtSlot()
     def disconnect_device(self):
+        self.stop_monitoring()
+        if self._metrics_timer is not None:
+            self._metrics_timer.stop()
         if self.client.is_socket_open():
             self.client.close()
-        self.connection_status.emit(False, f"已断开连接 {self._port}")
-        self.log_message.emit("info", f"连接已断开 {self._port}。")
+        self.connection_status.emit(self._port, False, f"已断开连接 {self._port}")
+        self._log(INFO, 'disconnected')
+        self.stopped.emit()
 
-    def read_logical_value(self, config):
+    def write_logical_value(self, config, value, slave_id=1, verify=False):
+        """
+        Writes one register. With verify, the register is read back and the
+        value the drive actually stored is reported (or WriteVerifyError).
+        """
         if not self.client.is_socket_open():
-            self.read_result.emit(config['id'], ModbusException("客户端未连接"))
+            self.write_result.emit(self._port, slave_id, config['id'], False, ModbusException("客户端未连接"))
             return
         try:
-            reg_type = config['type']
             address = config['address']
-            self.log_message.emit("info", f"读取 {config['id']} (地址: {address})")
+            self._log(DEBUG, 'write', slave=slave_id, address=address, reg_id=config['id'], value=value)
 
-            word_count = 2 if reg_type in ['u32', 's32'] else 1
+            payload = self._codec(config).encode(value)
 
-            rr = self.client.read_holding_registers(address, count=word_count, slave=1)
+            # write_registers is used for both single and multiple registers
+            # The 'slave' argument is now a keyword argument as well.
+            try:
+                rr = self._write_registers(address, payload, slave_id)
+                if rr.isError():
+                    raise ModbusException(f"Modbus error on write: {rr}")
+            except Exception:
+                # The drive may or may not have taken the value
+                self._shadow_written(slave_id, address, payload, [config], False)
+                raise
+            self._shadow_written(slave_id, address, payload, [config], True)
+            if verify:
+                value = self._verify_writes([(config, value)], slave_id)[config['id']]
+                if isinstance(value, Exception):
+                    raise value
+
+            self._log(INFO, 'write_ok', slave=slave_id, address=address, reg_id=config['id'], value=value)
+            self.write_result.emit(self._port, slave_id, config['id'], True, value)
+        except Exception as e:
+            self._log(ERROR, 'write_failed', slave=slave_id, address=config['address'], reg_id=config['id'], error=e)
+            self.write_result.emit(self._port, slave_id, config['id'], False, e)
 
-            if rr.isError():
-                raise ModbusException(str(rr))
+    def _shadow_written(self, slave_id, start, words, configs, accepted):
+        """
+        Updates the shadow image after a write of configs: the words if the
+        drive accepted them, otherwise those addresses are forgotten. A
+        command register (factory reset, set origin, ...) may change any
+        parameter, so writing one, taken or not, forgets the whole drive.
+        """
+        shadow = self._shadow(slave_id)
+        if any(cfg['id'] in COMMAND_REGISTER_IDS for cfg in configs):
+            shadow.invalidate()
+        elif accepted:
+            shadow.store(start, words, SOURCE_WRITTEN)
+        else:
+            shadow.invalidate(start, len(words))
 
-            word_order = Endian.BIG if config.get('word_order', 'big') == 'big' else Endian.LITTLE
+    def write_logical_values(self, writes, slave_id=1, verify=False):
+        """
+        Writes [(config, value)] to one drive with as few FC16 requests as
+        possible: registers are sorted by address and exactly adjacent ones
+        (32-bit pairs included) share a request, see plan_write_blocks. With
+        verify, the written registers are then read back with the coalesced
+        block planner (one read per block) and compared against the intended
+        values. All per-register outcomes are reported together in one
+        write_results.
+        """
+        if not self.client.is_socket_open():
+            error = ModbusException("客户端未连接")
+            self.write_results.emit(self._port, slave_id, {cfg['id']: error for cfg, _ in writes})
+            return
+        results = {}
+        encoded = []
+        for config, value in writes:
+            try:
+                encoded.append((config, self._codec(config).encode(value)))
+            except Exception as e:
+                results[config['id']] = e
+        values = {config['id']: value for config, value in writes}
 
-            value = self.client.convert_from_registers(
-                rr.registers,
-                self.dtype_map[reg_type],
-                word_order=word_order
-            )
+        blocks = plan_write_blocks(encoded)
+        self._log(INFO, 'batch_write', slave=slave_id, count=len(blocks), registers=len(encoded))
+        for block in blocks:
+            start = block['start_address']
+            try:
+                rr = self._write_registers(start, block['words'], slave_id)
+                if rr.isError():
+                    raise ModbusException(f"Modbus error on block write: {rr}")
+            except Exception as e:
+                self._shadow_written(slave_id, start, block['words'], [cfg for cfg, _ in block['items']], False)
+                self._log(ERROR, 'block_write_failed', slave=slave_id, address=start, count=len(block['words']),
+                          error=e)
+                for config, _ in block['items']:
+                    results[config['id']] = e
+                continue
+            self._shadow_written(slave_id, start, block['words'], [cfg for cfg, _ in block['items']], True)
+            for config, _ in block['items']:
+                results[config['id']] = values[config['id']]
+
+        if verify:
+            written = [(config, results[config['id']]) for config, _ in encoded
+                       if not isinstance(results[config['id']], Exception)]
+            verified = self._verify_writes(written, slave_id)
+            results.update(verified)
+            mismatches = sum(isinstance(v, Exception) for v in verified.values())
+            self._log(WARN if mismatches else INFO, 'write_verified', slave=slave_id, count=len(verified),
+                      matched=len(verified) - mismatches)
+        self.write_results.emit(self._port, slave_id, results)
+
+    def _verify_writes(self, writes, slave_id):
+        """
+        Reads back [(config, intended value)] in planned blocks and returns
+        {id: value read} for registers that match, WriteVerifyError for those
+        that do not, or the read error.
+        """
+        readback = {}
+        for block in self._plan_blocks([config for config, _ in writes]):
+            self._read_block(block, readback, slave_id, verbose=False)
+        ids = [config['id'] for config, _ in writes]
+        intended = [value for _, value in writes]
+        actual = [readback.get(reg_id) for reg_id in ids]
+        return {reg_id: got if got == want or isinstance(got, Exception) else WriteVerifyError(want, got)
+                for reg_id, want, got in zip(ids, intended, actual)}
 
-            self.log_message.emit("info", f"读取成功: {config['id']} = {value}")
-            self.read_result.emit(config['id'], value)
-        except Exception as e:
-            self.log_message.emit("error", f"读取 {config['id']} 失败: {e}")
-            self.read_result.emit(config['id'], e)
 
-    def write_logical_value(self, config, value):
-        if not self.client.is_socket_open():
-            self.write_result.emit(config['id'], False, ModbusException("客户端未连接"))
-            return
-        try:
-            reg_type = config['type']
-            address = config['address']
-            self.log_message.emit("info", f"写入 {config['id']} (地址: {address}) 值: {value}")
+class PortConnection(QObject):
+    """
+    One open serial port: its ModbusWorker, the thread the worker runs on,
+    and the command signals that queue jobs onto that thread. Emitting a
+    command from the GUI thread never blocks on the bus.
+    """
+    read_job_requested = pyqtSignal(int, object, object, bool)  # job_id, [slave_ids], [configs], use_cache
+    write_job_requested = pyqtSignal(int, int, object, object, bool)  # job_id, slave_id, config, value, verify
+    write_batch_job_requested = pyqtSignal(int, int, object, bool)  # job_id, slave_id, [(config, value)], verify
+    snapshot_job_requested = pyqtSignal(int, int, object)  # job_id, slave_id, [configs]
+    start_monitoring_requested = pyqtSignal(object, float)  # [configs], rate_hz
+    stop_monitoring_requested = pyqtSignal()
+    disconnect_requested = pyqtSignal()
+
+    def __init__(self, worker, parent=None):
+        super().__init__(parent)
+        self.port = worker.port
+        self.slave_ids = list(worker.slave_ids)
+        self.worker = worker
+        self.connected = False
+        self.last_job_id = 0
+        self.thread = QThread()
+        worker.moveToThread(self.thread)
+
+        self.thread.started.connect(worker.connect_device)
+        self.thread.finished.connect(worker.deleteLater)
+        # Direct: the GUI thread is blocked in wait() while the worker stops
+        worker.stopped.connect(self.thread.quit, Qt.ConnectionType.DirectConnection)
+
+        self.read_job_requested.connect(worker.run_read_job)
+        self.write_job_requested.connect(worker.run_write_job)
+        self.write_batch_job_requested.connect(worker.run_write_batch_job)
+        self.snapshot_job_requested.connect(worker.run_snapshot_job)
+        self.start_monitoring_requested.connect(worker.start_monitoring)
+        self.stop_monitoring_requested.connect(worker.stop_monitoring)
+        self.disconnect_requested.connect(worker.disconnect_device)
+
+    def close(self):
+        """Drops the queued jobs, lets the worker close the port on its own thread and waits for it."""
+        if self.thread.isRunning():
+            self.worker.cancel_pending(self.last_job_id)
+            self.disconnect_requested.emit()
+        for signal in (self.read_job_requested, self.write_job_requested, self.write_batch_job_requested,
+                       self.snapshot_job_requested, self.start_monitoring_requested, self.stop_monitoring_requested, self.disconnect_requested):
+            try:
+                signal.disconnect()
+            except TypeError:
+                pass  # worker already deleted, Qt dropped the connection
+        self.thread.wait(2000)
+        self.connected = False
 
-            word_order = Endian.BIG if config.get('word_order', 'big') == 'big' else Endian.LITTLE
 
-            payload = self.client.convert_to_registers(
-                value,
-                self.dtype_map[reg_type],
-                word_order=word_order
-            )
+class ConnectionManager(QObject):
+    """
+    Keeps any number of serial ports open at once, one worker thread per
+    port, so transactions on separate RS-485 buses run in parallel. Drives
+    are identified by (port, slave_id); every result signal carries both.
+    Job ids are unique across ports.
+    """
+    connection_status = pyqtSignal(str, bool, str)  # port, connected, message
+    log_event = pyqtSignal(object)  # LogEvent
+    read_results = pyqtSignal(str, int, object)  # port, slave_id, {id: value or exception}
+    write_result = pyqtSignal(str, int, str, bool, object)  # port, slave_id, id, success, value or exception
+    write_results = pyqtSignal(str, int, object)  # port, slave_id, {id: value written or exception}
+    snapshot_read = pyqtSignal(str, int, object)  # port, slave_id, {id: value or exception}
+    monitor_sample = pyqtSignal(str, int, object, object)  # port, slave_id, timestamp (ns), {id: value}
+    monitor_stats = pyqtSignal(str, object)  # port, stats
+    metrics_report = pyqtSignal(str, object)  # port, [metrics rows]
 
-            # write_registers is used for both single and multiple registers
-            # The 'slave' argument is now a keyword argument as well.
-            self.client.write_registers(address, payload, slave=1)
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._connections = {}  # {port: PortConnection}, in opening order
+        self._job_ids = itertools.count(1)
+        self._log_level = INFO
+
+    def open(self, port, baudrate, slave_ids=(1,), parity='N', stopbits=1, timeout=1, **worker_options):
+        """Starts a worker for port; raises ValueError if the port is already open."""
+        if port in self._connections:
+            raise ValueError(f"串口 {port} 已打开")
+        worker_options.setdefault('log_level', self._log_level)
+        worker = ModbusWorker(port, baudrate, parity, stopbits, timeout, slave_ids=slave_ids, **worker_options)
+        worker.connection_status.connect(self._on_connection_status)
+        worker.log_event.connect(self.log_event)
+        worker.read_results.connect(self.read_results)
+        worker.write_result.connect(self.write_result)
+        worker.write_results.connect(self.write_results)
+        worker.snapshot_read.connect(self.snapshot_read)
+        worker.monitor_sample.connect(self.monitor_sample)
+        worker.monitor_stats.connect(self.monitor_stats)
+        worker.metrics_report.connect(self.metrics_report)
+
+        connection = PortConnection(worker, self)
+        self._connections[port] = connection
+        connection.thread.start()
+        return connection
+
+    def close(self, port):
+        connection = self._connections.pop(port, None)
+        if connection is None:
+            return
+        connection.close()
+        connection.deleteLater()
+        self.connection_status.emit(port, False, "手动断开")
+
+    def close_all(self):
+        for port in list(self._connections):
+            self.close(port)
+
+    def is_open(self, port):
+        return port in self._connections
+
+    def connected_ports(self):
+        return [port for port, c in self._connections.items() if c.connected]
+
+    def drives(self):
+        """(port, slave_id) of every drive on an open port."""
+        return [(port, slave_id) for port, c in self._connections.items() for slave_id in c.slave_ids]
+
+    def is_connected(self, port):
+        connection = self._connections.get(port)
+        return connection is not None and connection.connected
+
+    def set_log_level(self, level):
+        """Lowest level the workers report, current and future; set it to the lowest level any sink shows."""
+        self._log_level = level
+        for connection in self._connections.values():
+            connection.worker.set_log_level(level)
+
+    def _next_job_id(self, connection):
+        connection.last_job_id = next(self._job_ids)
+        return connection.last_job_id
+
+    def submit_read(self, port, slave_ids, configs, use_cache=False):
+        connection = self._connections.get(port)
+        if connection is not None:
+            connection.read_job_requested.emit(self._next_job_id(connection), list(slave_ids), list(configs),
+                                               use_cache)
+
+    def submit_write(self, port, slave_id, config, value, verify=False):
+        connection = self._connections.get(port)
+        if connection is not None:
+            connection.write_job_requested.emit(self._next_job_id(connection), slave_id, config, value, verify)
+
+    def submit_write_batch(self, port, slave_id, writes, verify=False):
+        connection = self._connections.get(port)
+        if connection is not None:
+            connection.write_batch_job_requested.emit(self._next_job_id(connection), slave_id, list(writes), verify)
+
+    def submit_snapshot(self, port, slave_id, configs):
+        connection = self._connections.get(port)
+        if connection is not None:
+            connection.snapshot_job_requested.emit(self._next_job_id(connection), slave_id, list(configs))
+
+    def connect_sample_sink(self, port, sink):
+        """
+        Calls sink(port, slave_id, timestamp_ns, values) for every monitor
+        sample of port directly on its worker thread, without a round trip
+        through the GUI event loop. sink must be quick and thread-safe.
+        """
+        connection = self._connections.get(port)
+        if connection is not None:
+            connection.worker.monitor_sample.connect(sink, Qt.ConnectionType.DirectConnection)
 
-            self.log_message.emit("info", f"写入成功: {config['id']} = {value}")
-            self.write_result.emit(config['id'], True, value)
-        except Exception as e:
-            self.log_message.emit("error", f"写入 {config['id']} 失败: {e}")
-            self.write_result.emit(config['id'], False, e)
+    def disconnect_sample_sink(self, port, sink):
+        connection = self._connections.get(port)
+        if connection is not None:
+            try:
+                connection.worker.monitor_sample.disconnect(sink)
+            except (TypeError, RuntimeError):
+                pass  # worker already gone
+
+    def start_monitoring(self, configs, rate_hz):
+        """Starts the monitor on every connected port; each worker polls all of its drives."""
+        for connection in self._connections.values():
+            if connection.connected:
+                connection.start_monitoring_requested.emit(configs, rate_hz)
+
+    def stop_monitoring(self):
+        for connection in self._connections.values():
+            connection.stop_monitoring_requested.emit()
+
+    @pyqtSlot(str, bool, str)
+    def _on_connection_status(self, port, is_connected, message):
+        connection = self._connections.get(port)
+        if connection is not None and connection.worker is not self.sender():
+            return  # late report from an earlier worker on a port that has been reopened
+        if connection is not None:
+            connection.connected = is_connected
+        self.connection_status.emit(port, is_connected, message)
 
 
 class RegisterWidget(QWidget):
@@ -1235,8 +1051,8 @@ class RegisterWidget(QWidget):
     Uses a StyleSheet to create a "card" visual effect.
     Internal layout is managed precisely with QVBoxLayout and QHBoxLayout.
     """
-    read_requested = pyqtSignal(dict)
-    write_requested = pyqtSignal(dict, int)
+    read_requested = pyqtSignal(object)  # RegisterEntry
+    write_requested = pyqtSignal(object, int)
 
     def __init__(self, config):
         super().__init__()
@@ -1316,6 +1132,12 @@ class RegisterWidget(QWidget):
 
         # Add common Read/Write buttons
         btn_layout = QHBoxLayout()
+        self.monitor_check = None
+        if self.config.get('group') == MONITOR_GROUP:
+            # Selects this register for the live monitor on its tab
+            self.monitor_check = QCheckBox("监控")
+            self.monitor_check.setChecked(self.config['id'] in DEFAULT_MONITOR_IDS)
+            btn_layout.addWidget(self.monitor_check)
         btn_layout.addStretch()
         self.read_btn = QPushButton("读")
         self.write_btn = QPushButton("写")
@@ -1338,22 +1160,8 @@ class RegisterWidget(QWidget):
             widget.currentIndexChanged.connect(self._mark_dirty)
         else:
             widget = QSpinBox()
-            min_val, max_val = -2147483648, 2147483647  # Default wide range
-
-            if 'range' in config:
-                try:
-                    # Handle ranges like "0-10000" or "-5000~+5000"
-                    range_str = config['range'].replace(' ', '').replace('+', '')
-                    parts = range_str.split('~') if '~' in range_str else range_str.split('-')
-
-                    if len(parts) == 2:
-                        min_val = int(parts[0])
-                        max_val = int(parts[1])
-                except (ValueError, IndexError):
-                    # If parsing fails, log a warning and use the default range
-                    print(
-                        f"Warning: Could not parse range '{config['range']}' for {config.get('id', 'N/A')}. Using default.")
-
+            # Parsed once when the catalog is built (bit fields: 0..mask)
+            min_val, max_val = config.value_range
             widget.setRange(min_val, max_val)
             widget.valueChanged.connect(self._mark_dirty)
         return widget
@@ -1370,6 +1178,11 @@ class RegisterWidget(QWidget):
             self.title_label.setText(self.config['name'])
 
     def set_value(self, value):
+        if not self.has_been_read:
+            # First value after clear_value(): drop the "not read" placeholder
+            for item in self.sub_widgets:
+                if isinstance(item['widget'], QSpinBox):
+                    item['widget'].setSpecialValueText("")
         self.has_been_read = True
         for item in self.sub_widgets:
             item['widget'].blockSignals(True)
@@ -1401,6 +1214,22 @@ class RegisterWidget(QWidget):
 
         self._mark_clean()
 
+    def clear_value(self):
+        """Shows "not read" (e.g. after switching to another drive) until the next set_value."""
+        self.has_been_read = False
+        self.current_value = 0
+        for item in self.sub_widgets:
+            widget = item['widget']
+            widget.blockSignals(True)
+            if isinstance(widget, QComboBox):
+                widget.setCurrentIndex(-1)
+            else:
+                # The special text is shown while the spin box sits at its minimum
+                widget.setSpecialValueText("--")
+                widget.setValue(widget.minimum())
+            widget.blockSignals(False)
+        self._mark_clean()
+
     def get_value(self):
         if self.config['type'] == 'bit_field':
             val = self.current_value
@@ -1426,7 +1255,19 @@ class RegisterWidget(QWidget):
 # PART 4: MAIN UI (MainWindow)
 # ==============================================================================
 class MainWindow(QMainWindow):
-    def __init__(self):
+    # Diagnostics table: (header, metrics row key)
+    METRICS_COLUMNS = (
+        ("串口", 'port'), ("从站", 'slave'), ("功能", 'function'), ("请求", 'requests'), ("超时", 'timeouts'),
+        ("异常响应", 'exceptions'), ("CRC/帧错误", 'crc_errors'), ("其他错误", 'errors'), ("重试", 'retries'),
+        ("发送字节", 'request_bytes'), ("接收字节", 'response_bytes'), ("P50 ms", 'p50_ms'), ("P90 ms", 'p90_ms'),
+        ("P99 ms", 'p99_ms'), ("最大 ms", 'max_ms'), ("近1s P50", 'recent_p50_ms'), ("近1s P99", 'recent_p99_ms'),
+        ("超时设定 ms", 'timeout_ms'),
+    )
+
+    # A read of a whole group from an unreachable drive fails every register; log this many, then a count
+    MAX_LOGGED_READ_ERRORS = 20
+
+    def __init__(self, prewarm_tabs=False, simulator=None):
         super().__init__()
         self.setWindowTitle("红森 HSX2M 伺服驱动器控制器 (v2.1)")
         self.setGeometry(100, 100, 1400, 900)
@@ -1453,15 +1294,42 @@ class MainWindow(QMainWindow):
             QTabWidget::pane { border-top: 2px solid #C2C7CB; }
             QTabBar::tab { background: #E0E0E0; border: 1px solid #B0B0B0; border-bottom: none; border-top-left-radius: 4px; border-top-right-radius: 4px; padding: 8px 15px; }
             QTabBar::tab:selected { background: #FFFFFF; }
-            QTextEdit { background-color: #2E2E2E; color: #F0F0F0; border-radius: 3px; font-family: Consolas, 'Courier New', monospace; }
+            QPlainTextEdit { background-color: #2E2E2E; color: #F0F0F0; border-radius: 3px; font-family: Consolas, 'Courier New', monospace; }
             QScrollArea { border: none; background-color: transparent; }
         """)
 
-        self.modbus_thread = None
-        self.modbus_worker = None
+        # Open ports and their workers; bus jobs go through the manager
+        self.connections = ConnectionManager(self)
         self.register_widgets = {}  # {id: widget}
+        self.register_model = None  # table view model, built with its tab
+        self.scope = None  # oscilloscope, built with its tab
+        self.metrics_table = None  # diagnostics table, built with its tab
+        self._metrics = {}  # {port: latest metrics rows}
+        self.metrics_file = None
+        # A SimulatedBus every port connects to instead of the serial hardware
+        self.simulator = simulator
+        # Drive search on the listed ports, one probe thread per port
+        self.discovery = PortDiscovery(self)
+        self.catalog = load_register_catalog()
+        # Codecs for every register, compiled once; each worker starts from this table
+        self.register_codecs = compile_register_codecs(self.catalog)
+        # Drives on the open ports, as (port, slave_id); the widgets show the
+        # active one, the table shows all of them
+        self.drives = []
+        self.active_drive = None
+        self._drive_values = {}  # {(port, slave_id): {id: last value read}}
+        self._monitor_stats = {}  # {port: latest monitor stats}
+        self._snapshot_paths = {}  # {(port, slave_id): file a requested snapshot goes to}
+        self._monitor_configs = []
+        # Active trace recording: {port: {slave_id: TraceRecorder}} and the sink fed on each worker thread
+        self._recorders = {}
+        self._record_sinks = {}
 
         self._init_ui()
+        self._connect_manager_signals()
+        if prewarm_tabs:
+            # Build the remaining tabs in idle time once the window is up
+            QTimer.singleShot(0, self._prewarm_next_tab)
 
     def _init_ui(self):
         main_widget = QWidget()
@@ -1477,60 +1345,106 @@ class MainWindow(QMainWindow):
         layout = QHBoxLayout(panel)
 
         self.port_combo = QComboBox()
-        # TODO: Populate with available serial ports dynamically
-        for i in range(1, 21): self.port_combo.addItem(f"COM{i}")
+        # Editable, so any device path (e.g. a drive_simulator pty) can be entered
+        self.port_combo.setEditable(True)
+        self._refresh_ports()
 
         self.baud_combo = QComboBox()
         self.baud_combo.addItems(['2400', '4800', '9600', '19200', '38400', '57600'])
         self.baud_combo.setCurrentText('19200')
+        # Framing as set by FU503 (parity) and FU502 (stop bits)
+        self.parity_combo = QComboBox()
+        for parity in ('N', 'O', 'E'):
+            self.parity_combo.addItem(PARITY_NAMES[parity], parity)
+        self.stopbits_combo = QComboBox()
+        self.stopbits_combo.addItems(['1', '2'])
+        self.stopbits_combo.setToolTip("停止位")
+
+        self.slave_ids_edit = QLineEdit("1")
+        self.slave_ids_edit.setMaximumWidth(120)
+        self.slave_ids_edit.setToolTip("总线上各驱动器的通讯地址 (FU500), 例如 1-4,6")
+        self.active_drive_combo = QComboBox()
+        self.active_drive_combo.setMinimumWidth(140)
 
         self.connect_btn = QPushButton("连接")
         self.disconnect_btn = QPushButton("断开")
         self.disconnect_btn.setEnabled(False)
+        self.disconnect_all_btn = QPushButton("全部断开")
+        self.disconnect_all_btn.setEnabled(False)
+        self.discover_btn = QPushButton("搜索驱动器")
+        self.discover_btn.setToolTip("在所有未打开的串口上, 以各种波特率与校验设置查找上述从站地址的驱动器")
+        self.dump_btn = QPushButton("导出参数")
+        self.dump_btn.setToolTip("读取当前驱动器的全部可写参数并保存为快照文件")
+        self.restore_btn = QPushButton("导入参数")
+        self.restore_btn.setToolTip("将快照文件中的参数批量写入当前驱动器并回读校验")
+        self.use_cache_check = QCheckBox("缓存配置参数")
+        self.use_cache_check.setChecked(True)
+        self.use_cache_check.setToolTip("已读取或写入的配置参数直接取自缓存, 直到重新连接; 监控与只读参数总是从驱动器读取")
+        self.verify_writes_check = QCheckBox("写入后回读校验")
+        self.verify_writes_check.setToolTip("写入后回读参数并与写入值比较 (每个连续块多一次读取)")
         self.status_light = StatusIndicator()
 
         layout.addWidget(QLabel("串口:"))
         layout.addWidget(self.port_combo)
         layout.addWidget(QLabel("波特率:"))
         layout.addWidget(self.baud_combo)
+        layout.addWidget(self.parity_combo)
+        layout.addWidget(self.stopbits_combo)
+        layout.addWidget(QLabel("从站地址:"))
+        layout.addWidget(self.slave_ids_edit)
+        layout.addWidget(QLabel("当前驱动器:"))
+        layout.addWidget(self.active_drive_combo)
         layout.addSpacing(20)
         layout.addWidget(self.connect_btn)
         layout.addWidget(self.disconnect_btn)
+        layout.addWidget(self.disconnect_all_btn)
+        layout.addWidget(self.discover_btn)
         layout.addWidget(self.status_light)
+        layout.addSpacing(20)
+        layout.addWidget(self.dump_btn)
+        layout.addWidget(self.restore_btn)
+        layout.addWidget(self.use_cache_check)
+        layout.addWidget(self.verify_writes_check)
         layout.addStretch()
 
         self.connect_btn.clicked.connect(self.connect_device)
         self.disconnect_btn.clicked.connect(self.disconnect_device)
+        self.disconnect_all_btn.clicked.connect(self.disconnect_all_devices)
+        self.discover_btn.clicked.connect(self.discover_drives)
+        self.discovery.drive_found.connect(self.on_drive_found)
+        self.discovery.port_finished.connect(self.on_discovery_port_finished)
+        self.discovery.finished.connect(self.on_discovery_finished)
+        self.dump_btn.clicked.connect(self.dump_drive)
+        self.restore_btn.clicked.connect(self.restore_drive)
+        # Connect/disconnect act on the selected port; several ports can be open at once
+        self.port_combo.currentTextChanged.connect(lambda _: self._update_connection_controls())
+        self.active_drive_combo.currentIndexChanged.connect(self._on_active_drive_changed)
 
         return panel
 
+    def _refresh_ports(self):
+        """Lists the serial ports present now (the simulated one in simulator mode), keeping the entered port."""
+        current = self.port_combo.currentText()
+        ports = ['SIM'] if self.simulator is not None else list_serial_ports()
+        self.port_combo.blockSignals(True)
+        self.port_combo.clear()
+        self.port_combo.addItems(ports)
+        if current:
+            self.port_combo.setCurrentText(current)
+        self.port_combo.blockSignals(False)
+
     def _create_register_panel(self):
         self.tabs = QTabWidget()
-        grouped_registers = defaultdict(lambda: defaultdict(list))
-        group_order = []
-        sub_group_order = defaultdict(list)
-
-        for reg in REGISTER_MAP:
-            if MainWindow._is_invalid_register(reg):
-                continue
-            group = reg['group']
-            sub_group = reg.get('sub_group', '常规')
+        # Tab contents are built on first activation: {tab index: builder}
+        self._unbuilt_tabs = {}
 
-            if group not in group_order:
-                group_order.append(group)
-            if sub_group not in sub_group_order[group]:
-                sub_group_order[group].append(sub_group)
-
-            grouped_registers[reg['group']][reg.get('sub_group', '常规')].append(reg)
-
-        for group_name in group_order:
-            sub_groups = grouped_registers[group_name]
-
-            # Start of tab creation logic (remains the same)
+        for group_name in self.catalog.group_names():
             tab_container_widget = QWidget()
             tab_main_layout = QVBoxLayout(tab_container_widget)
 
             btn_bar_layout = QHBoxLayout()
+            if group_name == MONITOR_GROUP:
+                self._create_monitor_controls(btn_bar_layout)
             btn_bar_layout.addStretch()
             read_all_btn = QPushButton(f"读取本页 ({group_name})")
             write_all_btn = QPushButton(f"写入本页修改")
@@ -1543,148 +1457,606 @@ class MainWindow(QMainWindow):
             scroll_content_widget = QWidget()
             vertical_layout_for_subgroups = QVBoxLayout(scroll_content_widget)
             vertical_layout_for_subgroups.setAlignment(Qt.AlignmentFlag.AlignTop)
-            # End of tab creation logic
-
-            for sub_group_name in sub_group_order[group_name]:
-                registers = sub_groups[sub_group_name]
-
-                sub_group_box = QGroupBox(sub_group_name)
-                flow_layout = FlowLayout(spacing=10)
-                sub_group_box.setLayout(flow_layout)
-
-                # The rest of the register creation loop remains the same
-                for reg_config in registers:
-                    register_container_box = QGroupBox(reg_config['id'])
-
-                    # Use a layout for the container to hold the actual widget
-                    container_layout = QVBoxLayout(register_container_box)
-                    container_layout.setContentsMargins(2, 2, 2, 2)
-
-                    widget = RegisterWidget(reg_config)
-                    self.register_widgets[reg_config['id']] = widget
-                    container_layout.addWidget(widget)
-                    flow_layout.addWidget(register_container_box)
-                    widget.read_requested.connect(self.read_single_register)
-                    widget.write_requested.connect(self.write_single_register)
-
-                vertical_layout_for_subgroups.addWidget(sub_group_box)
-
             scroll_area.setWidget(scroll_content_widget)
             tab_main_layout.addWidget(scroll_area)
-            self.tabs.addTab(tab_container_widget, group_name)
-
-            read_all_btn.clicked.connect(lambda _, sc=scroll_content_widget: self.read_all_registers(sc))
-            write_all_btn.clicked.connect(lambda _, sc=scroll_content_widget: self.write_all_registers(sc))
+            index = self.tabs.addTab(tab_container_widget, group_name)
+            self._unbuilt_tabs[index] = (lambda g=group_name, l=vertical_layout_for_subgroups:
+                                         self._build_tab_contents(g, l))
 
-        return self.tabs
-
-    @staticmethod
-    def _is_invalid_register(reg):
-        return reg['name'] == "保留" or reg.get('sub_group') == "保留项" or (reg.get('address') <= 0 and reg.get('id') != "FU000")
+            read_all_btn.clicked.connect(lambda _, g=group_name: self.read_all_registers(g))
+            write_all_btn.clicked.connect(lambda _, g=group_name: self.write_all_registers(g))
 
-    def _create_log_panel(self):
-        panel = QGroupBox("输出日志")
-        layout = QVBoxLayout(panel)
-        self.log_output = QTextEdit()
-        self.log_output.setReadOnly(True)
+        table_tab = QWidget()
+        index = self.tabs.addTab(table_tab, TABLE_TAB_NAME)
+        self._unbuilt_tabs[index] = lambda: self._build_table_tab(table_tab)
 
-        clear_btn_layout = QHBoxLayout()
-        clear_btn_layout.addStretch()
-        clear_btn = QPushButton("清空")
-        clear_btn_layout.addWidget(clear_btn)
+        scope_tab = QWidget()
+        index = self.tabs.addTab(scope_tab, SCOPE_TAB_NAME)
+        self._unbuilt_tabs[index] = lambda: self._build_scope_tab(scope_tab)
 
-        layout.addWidget(self.log_output)
-        layout.addLayout(clear_btn_layout)
+        diagnostics_tab = QWidget()
+        index = self.tabs.addTab(diagnostics_tab, DIAGNOSTICS_TAB_NAME)
+        self._unbuilt_tabs[index] = lambda: self._build_diagnostics_tab(diagnostics_tab)
 
-        clear_btn.clicked.connect(self.log_output.clear)
-        return panel
+        self.tabs.currentChanged.connect(self._ensure_tab_built)
+        self._ensure_tab_built(self.tabs.currentIndex())
+        return self.tabs
 
-    def log(self, level, message):
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        log_line = f"[{timestamp}][{level.upper()}] {message}"
+    def _ensure_tab_built(self, index):
+        builder = self._unbuilt_tabs.pop(index, None)
+        if builder is None:
+            return
+        page = self.tabs.widget(index)
+        page.setUpdatesEnabled(False)
+        try:
+            builder()
+        finally:
+            page.setUpdatesEnabled(True)
 
-        color_map = {"info": QColor("#2ECC71"), "warn": QColor("#F39C12"), "error": QColor("#E74C3C")}
+    def _build_table_tab(self, page):
+        """
+        Model/view alternative to the register widgets: a single table over
+        the whole catalog, filtered by group, with per-type cell editors.
+        """
+        layout = QVBoxLayout(page)
+        btn_bar_layout = QHBoxLayout()
+        self.table_group_combo = QComboBox()
+        self.table_group_combo.addItem("全部", "")
+        for group_name in self.catalog.group_names():
+            self.table_group_combo.addItem(group_name, group_name)
+        read_btn = QPushButton("读取显示的参数")
+        write_btn = QPushButton("写入表格修改")
+        btn_bar_layout.addWidget(QLabel("分组:"))
+        btn_bar_layout.addWidget(self.table_group_combo)
+        btn_bar_layout.addStretch()
+        btn_bar_layout.addWidget(read_btn)
+        btn_bar_layout.addWidget(write_btn)
+        layout.addLayout(btn_bar_layout)
+
+        entries = [e for g in self.catalog.group_names() for e in self.catalog.group_entries(g)]
+        self.register_model = RegisterTableModel(entries, drives=self.drives, parent=self)
+        for drive, values in self._drive_values.items():
+            self.register_model.update_values(values, drive)
+        self.register_table = RegisterTableView(self.register_model)
+        layout.addWidget(self.register_table)
+
+        self.table_group_combo.currentIndexChanged.connect(
+            lambda _: self.register_table.set_group_filter(self.table_group_combo.currentData()))
+        read_btn.clicked.connect(self.read_table_registers)
+        write_btn.clicked.connect(self.write_table_registers)
+
+    def _build_scope_tab(self, page):
+        """Oscilloscope over the active drive's monitor samples; channels follow the monitor selection."""
+        layout = QVBoxLayout(page)
+        if ScopeWidget is None:
+            layout.addWidget(QLabel("示波器需要 numpy, 请使用以下命令安装: pip install numpy"))
+            return
+        btn_bar_layout = QHBoxLayout()
+        self.scope_window_spin = QSpinBox()
+        self.scope_window_spin.setRange(1, 60)
+        self.scope_window_spin.setValue(10)
+        self.scope_window_spin.setSuffix(" s")
+        btn_bar_layout.addWidget(QLabel("时间窗:"))
+        btn_bar_layout.addWidget(self.scope_window_spin)
+        self.scope_channel_layout = QHBoxLayout()
+        btn_bar_layout.addLayout(self.scope_channel_layout)
+        btn_bar_layout.addStretch()
+        layout.addLayout(btn_bar_layout)
+
+        self.scope = ScopeWidget()
+        self.scope.set_window_seconds(self.scope_window_spin.value())
+        layout.addWidget(self.scope, 1)
+        self.scope_window_spin.valueChanged.connect(self.scope.set_window_seconds)
+        self._set_scope_channels(self._monitor_configs)
+
+    def _set_scope_channels(self, configs):
+        if self.scope is None:
+            return
+        while self.scope_channel_layout.count():
+            self.scope_channel_layout.takeAt(0).widget().deleteLater()
+        self.scope.set_channels([(cfg['id'], cfg['name']) for cfg in configs])
+        for cfg in configs:
+            check = QCheckBox(cfg['id'])
+            check.setToolTip(cfg['name'])
+            check.setChecked(True)
+            check.toggled.connect(lambda on, reg_id=cfg['id']: self.scope.set_channel_visible(reg_id, on))
+            self.scope_channel_layout.addWidget(check)
+
+    def _build_diagnostics_tab(self, page):
+        """Per-port, per-slave, per-function transaction statistics, updated with every metrics report."""
+        layout = QVBoxLayout(page)
+        btn_bar_layout = QHBoxLayout()
+        self.metrics_file_check = QCheckBox("写入指标文件")
+        self.metrics_file_check.setToolTip("每秒将各串口的统计追加到文件 (每行一个 JSON)")
+        btn_bar_layout.addWidget(self.metrics_file_check)
+        btn_bar_layout.addStretch()
+        layout.addLayout(btn_bar_layout)
+
+        self.metrics_table = QTableWidget(0, len(self.METRICS_COLUMNS))
+        self.metrics_table.setHorizontalHeaderLabels([title for title, _ in self.METRICS_COLUMNS])
+        self.metrics_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.metrics_table.verticalHeader().setVisible(False)
+        self.metrics_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        layout.addWidget(self.metrics_table)
+        self.metrics_file_check.toggled.connect(self.toggle_metrics_file)
+        self._show_metrics()
+
+    def on_metrics_report(self, port, rows):
+        self._metrics[port] = rows
+        if self.metrics_file is not None:
+            self.metrics_file.write(port, rows)
+        if self.metrics_table is not None and self.metrics_table.isVisible():
+            self._show_metrics()
+
+    def _show_metrics(self):
+        rows = [dict(row, port=port) for port, port_rows in self._metrics.items() for row in port_rows]
+        self.metrics_table.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            for c, (_, key) in enumerate(self.METRICS_COLUMNS):
+                value = row[key]
+                if key == 'function':
+                    text = FUNCTION_NAMES.get(value, f"{value:02X}")
+                elif isinstance(value, float):
+                    text = f"{value:.1f}"
+                else:
+                    text = "" if value is None else str(value)
+                item = self.metrics_table.item(r, c)
+                if item is None:
+                    self.metrics_table.setItem(r, c, QTableWidgetItem(text))
+                else:
+                    item.setText(text)
 
-        self.log_output.moveCursor(self.log_output.textCursor().MoveOperation.End)
+    def toggle_metrics_file(self, checked):
+        if self.metrics_file is not None:
+            self.metrics_file.close()
+            self.metrics_file = None
+        if not checked:
+            return
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        path, _ = QFileDialog.getSaveFileName(self, "指标文件", f"bus_metrics_{stamp}.jsonl", "JSON Lines (*.jsonl)")
+        if not path:
+            self.metrics_file_check.setChecked(False)
+            return
+        try:
+            self.metrics_file = MetricsFile(path)
+        except OSError as e:
+            self.metrics_file_check.setChecked(False)
+            self.log("error", f"无法打开指标文件 {path}: {e}")
+
+    def _build_tab_contents(self, group_name, layout):
+        known_values = self._drive_values.get(self.active_drive, {})
+        for sub_group_name, registers in self.catalog.sub_groups(group_name).items():
+            sub_group_box = QGroupBox(sub_group_name)
+            flow_layout = FlowLayout(spacing=10)
+            sub_group_box.setLayout(flow_layout)
+
+            for reg_config in registers:
+                register_container_box = QGroupBox(reg_config['id'])
+
+                # Use a layout for the container to hold the actual widget
+                container_layout = QVBoxLayout(register_container_box)
+                container_layout.setContentsMargins(2, 2, 2, 2)
+
+                widget = RegisterWidget(reg_config)
+                if reg_config['id'] in known_values:
+                    widget.set_value(known_values[reg_config['id']])
+                self.register_widgets[reg_config['id']] = widget
+                container_layout.addWidget(widget)
+                flow_layout.addWidget(register_container_box)
+                widget.read_requested.connect(self.read_single_register)
+                widget.write_requested.connect(self.write_single_register)
+
+            layout.addWidget(sub_group_box)
+
+    def _prewarm_next_tab(self):
+        """Builds one pending tab per idle turn of the event loop until none are left."""
+        if not self._unbuilt_tabs:
+            return
+        self._ensure_tab_built(next(iter(self._unbuilt_tabs)))
+        if self._unbuilt_tabs:
+            QTimer.singleShot(0, self._prewarm_next_tab)
+
+    def _group_widgets(self, group_name):
+        """Register widgets of a tab that has been built (none otherwise)."""
+        return [self.register_widgets[e.id] for e in self.catalog.group_entries(group_name)
+                if e.id in self.register_widgets]
+
+    def _create_monitor_controls(self, layout):
+        self.monitor_rate_spin = QSpinBox()
+        self.monitor_rate_spin.setRange(1, 100)
+        self.monitor_rate_spin.setValue(20)
+        self.monitor_rate_spin.setSuffix(" Hz")
+        # The rate the bus sustains for the selected channels, once monitoring runs
+        self.monitor_max_rate_label = QLabel("")
+        self.monitor_btn = QPushButton("开始监控")
+        self.monitor_btn.setCheckable(True)
+        self.record_btn = QPushButton("开始记录")
+        self.record_btn.setCheckable(True)
+        self.record_btn.setToolTip(f"将监控数据连续写入 {TRACE_SUFFIX} 记录文件 (每个驱动器一个文件)")
+        self.monitor_stats_label = QLabel("")
+
+        layout.addWidget(QLabel("采样频率:"))
+        layout.addWidget(self.monitor_rate_spin)
+        layout.addWidget(self.monitor_max_rate_label)
+        layout.addWidget(self.monitor_btn)
+        layout.addWidget(self.record_btn)
+        layout.addWidget(self.monitor_stats_label)
+
+        self.monitor_btn.toggled.connect(self.toggle_monitoring)
+        self.record_btn.toggled.connect(self.toggle_recording)
 
-        char_format = QTextCharFormat()
-        char_format.setForeground(color_map.get(level, QColor("white")))
+    def _create_log_panel(self):
+        self.log_panel = LogPanel("输出日志")
+        return self.log_panel
 
-        self.log_output.setCurrentCharFormat(char_format)
-        self.log_output.append(log_line)  # Use append to automatically add a newline
-        self.log_output.ensureCursorVisible()
+    def log(self, level, message):
+        self.log_panel.append(level, message)
 
     def connect_device(self):
         port = self.port_combo.currentText()
         baudrate = int(self.baud_combo.currentText())
+        parity = self.parity_combo.currentData()
+        stopbits = int(self.stopbits_combo.currentText())
+        if self.connections.is_open(port):
+            self.log("warn", f"串口 {port} 已打开")
+            return
+        try:
+            slave_ids = parse_slave_ids(self.slave_ids_edit.text())
+        except ValueError as e:
+            QMessageBox.warning(self, "从站地址无效", str(e))
+            return
 
-        self.modbus_thread = QThread()
-        self.modbus_worker = ModbusWorker(port, baudrate, parity='N', stopbits=1, timeout=1)
-        self.modbus_worker.moveToThread(self.modbus_thread)
+        options = {} if self.simulator is None else {'client_factory': self.simulator.client}
+        self.connections.open(port, baudrate, slave_ids, parity, stopbits, read_holes=READ_HOLES,
+                              codecs=self.register_codecs, **options)
+        self._set_drives(self.connections.drives())
+        self._update_connection_controls()
+        self.log("info", f"正在尝试连接 {port} @ {format_line_settings((baudrate, parity, stopbits))}, "
+                         f"从站 {self.slave_ids_edit.text()}...")
+
+    def discover_drives(self):
+        """Searches every listed port that is not open for the drives in the slave address field; again to stop."""
+        if self.discovery.is_running():
+            self.discovery.cancel()
+            self.discover_btn.setEnabled(False)
+            return
+        try:
+            slave_ids = parse_slave_ids(self.slave_ids_edit.text())
+        except ValueError as e:
+            QMessageBox.warning(self, "从站地址无效", str(e))
+            return
+        self._refresh_ports()
+        ports = [self.port_combo.itemText(i) for i in range(self.port_combo.count())]
+        ports = [port for port in ports if not self.connections.is_open(port)]
+        if not ports:
+            self.log("warn", "没有可搜索的串口")
+            return
+        preferred = (int(self.baud_combo.currentText()), self.parity_combo.currentData(),
+                     int(self.stopbits_combo.currentText()))
+        client_factory = None if self.simulator is None else self.simulator.client
+        self.log("info", f"正在搜索驱动器: {', '.join(ports)}, 从站 {self.slave_ids_edit.text()}...")
+        self.discover_btn.setText("停止搜索")
+        self.discovery.start(ports, slave_ids, preferred, client_factory)
+
+    def on_drive_found(self, drive):
+        line_settings = (drive['baudrate'], drive['parity'], drive['stopbits'])
+        version = "未知" if drive['version'] is None else drive['version']
+        self.log("info", f"发现驱动器: {drive['port']} 从站 {drive['slave']} @ {format_line_settings(line_settings)}, "
+                         f"软件版本 {version}")
+
+    def on_discovery_port_finished(self, port, drives, error):
+        if error:
+            self.log("warn", f"{port}: {error}")
+
+    def on_discovery_finished(self, results, seconds):
+        """Selects the first port with drives and its line settings, ready to connect."""
+        self.discover_btn.setText("搜索驱动器")
+        self.discover_btn.setEnabled(True)
+        found = [(port, drives) for port, drives in results.items() if drives]
+        count = sum(len(drives) for _, drives in found)
+        if not found:
+            self.log("warn", f"未找到驱动器 (耗时 {seconds:.1f} s)")
+            return
+        self.log("info", f"搜索完毕: 在 {len(found)} 个串口上找到 {count} 个驱动器 (耗时 {seconds:.1f} s)")
+        port, drives = found[0]
+        self.port_combo.setCurrentText(port)
+        self.baud_combo.setCurrentText(str(drives[0]['baudrate']))
+        self.parity_combo.setCurrentIndex(self.parity_combo.findData(drives[0]['parity']))
+        self.stopbits_combo.setCurrentText(str(drives[0]['stopbits']))
+        self.slave_ids_edit.setText(",".join(str(drive['slave']) for drive in drives))
+
+    def _connect_manager_signals(self):
+        self.connections.connection_status.connect(self.on_connection_status)
+        self.connections.log_event.connect(self.log_panel.append_event)
+        self.log_panel.threshold_changed.connect(self.connections.set_log_level)
+        self.connections.set_log_level(self.log_panel.threshold())
+        self.connections.read_results.connect(self.on_read_results)
+        self.connections.write_result.connect(self.on_write_result)
+        self.connections.write_results.connect(self.on_write_results)
+        self.connections.snapshot_read.connect(self.on_snapshot_read)
+        self.connections.monitor_sample.connect(self.on_monitor_sample)
+        self.connections.monitor_stats.connect(self.on_monitor_stats)
+        self.connections.metrics_report.connect(self.on_metrics_report)
+
+    def _set_drives(self, drives):
+        """Makes drives the (port, slave_id) pairs on open ports, keeping the active drive if it is still one of them."""
+        self.drives = list(drives)
+        self._drive_values = {d: v for d, v in self._drive_values.items() if d in self.drives}
+        if self.register_model is not None:
+            self.register_model.set_drives(self.drives)
+        active = self.active_drive if self.active_drive in self.drives else (self.drives[0] if self.drives else None)
+        self.active_drive_combo.blockSignals(True)
+        self.active_drive_combo.clear()
+        for port, slave_id in self.drives:
+            self.active_drive_combo.addItem(f"{port} 从站 {slave_id}", (port, slave_id))
+        if active is not None:
+            self.active_drive_combo.setCurrentIndex(self.drives.index(active))
+        self.active_drive_combo.blockSignals(False)
+        self._set_active_drive(active)
+
+    def _on_active_drive_changed(self, index):
+        if index >= 0:
+            self._set_active_drive(self.active_drive_combo.itemData(index))
+
+    def _set_active_drive(self, drive):
+        """Shows the drive's last known values in the register widgets; the rest read as "not read"."""
+        if drive == self.active_drive:
+            return
+        self.active_drive = drive
+        if self.scope is not None:
+            self.scope.clear()
+        values = self._drive_values.get(drive, {})
+        self.tabs.setUpdatesEnabled(False)
+        try:
+            for reg_id, widget in self.register_widgets.items():
+                if reg_id in values:
+                    widget.set_value(values[reg_id])
+                elif widget.has_been_read:
+                    widget.clear_value()
+        finally:
+            self.tabs.setUpdatesEnabled(True)
 
-        self.modbus_thread.started.connect(self.modbus_worker.connect_device)
-        self.modbus_worker.connection_status.connect(self.on_connection_status)
-        self.modbus_worker.log_message.connect(self.log)
-        self.modbus_worker.read_result.connect(self.on_read_result)
-        self.modbus_worker.write_result.connect(self.on_write_result)
+    def disconnect_device(self):
+        self.connections.close(self.port_combo.currentText())
 
-        self.modbus_thread.start()
-        self.connect_btn.setEnabled(False)
-        self.log("info", f"正在尝试连接 {port} @ {baudrate}...")
+    def disconnect_all_devices(self):
+        self.connections.close_all()
 
-    def disconnect_device(self):
-        if self.modbus_thread and self.modbus_thread.isRunning():
-            # Direct call to worker method
-            self.modbus_worker.disconnect_device()
-            self.modbus_thread.quit()
-            self.modbus_thread.wait(2000)
-        self.on_connection_status(False, "手动断开")
-
-    def on_connection_status(self, is_connected, message):
-        self.status_light.set_status(is_connected)
-        self.connect_btn.setEnabled(not is_connected)
-        self.disconnect_btn.setEnabled(is_connected)
+    def on_connection_status(self, port, is_connected, message):
+        if not is_connected and self.connections.is_open(port):
+            # The port failed to open or dropped: release its worker
+            self.log("warn", f"{port}: {message}")
+            self.connections.close(port)
+            return
+        if not self.connections.is_open(port):
+            self._set_drives(self.connections.drives())
+            self._monitor_stats.pop(port, None)
+            self._metrics.pop(port, None)
+        self._update_connection_controls()
+        if not self.connections.connected_ports():
+            self.monitor_btn.setChecked(False)
+
+    def _update_connection_controls(self):
+        port = self.port_combo.currentText()
+        self.status_light.set_status(bool(self.connections.connected_ports()))
+        self.connect_btn.setEnabled(not self.connections.is_open(port))
+        self.disconnect_btn.setEnabled(self.connections.is_open(port))
+        self.disconnect_all_btn.setEnabled(bool(self.connections.drives()))
+
+    def _require_connection(self):
+        if self.connections.connected_ports() and self.active_drive is not None:
+            return True
+        self.log("warn", "请先连接设备")
+        return False
+
+    def _submit_read(self, configs, drives=None):
+        """Queues one read job per port; by default it reads the active drive."""
+        by_port = {}
+        for port, slave_id in ([self.active_drive] if drives is None else drives):
+            by_port.setdefault(port, []).append(slave_id)
+        for port, slave_ids in by_port.items():
+            self.connections.submit_read(port, slave_ids, configs, self.use_cache_check.isChecked())
+
+    def _submit_write(self, config, value, drive=None):
+        port, slave_id = self.active_drive if drive is None else drive
+        self.connections.submit_write(port, slave_id, config, value, self.verify_writes_check.isChecked())
+
+    def _submit_write_batch(self, writes, drive=None):
+        port, slave_id = self.active_drive if drive is None else drive
+        self.connections.submit_write_batch(port, slave_id, writes, self.verify_writes_check.isChecked())
 
     def read_single_register(self, config):
-        if self.modbus_worker: self.modbus_worker.read_logical_value(config)
+        if self.active_drive is not None: self._submit_read([config])
 
-    def write_single_register(self, config, value):
-        if self.modbus_worker: self.modbus_worker.write_logical_value(config, value)
+    def write_single_register(self, config, value, drive=None):
+        if self.active_drive is not None: self._submit_write(config, value, drive)
 
-    def on_read_result(self, reg_id, result):
-        if reg_id in self.register_widgets:
-            if isinstance(result, Exception):
-                self.log("warn", f"读取 {reg_id} 失败: {result}")
-            else:
-                self.register_widgets[reg_id].set_value(result)
+    def on_read_results(self, port, slave_id, results):
+        """
+        Reports every failed register, whether or not its tab has been built,
+        and records the values; a tab built later starts from them
+        (_build_tab_contents).
+        """
+        failed = [(reg_id, result) for reg_id, result in results.items() if isinstance(result, Exception)]
+        for reg_id, result in failed[:self.MAX_LOGGED_READ_ERRORS]:
+            self.log("warn", f"读取 {port} 从站{slave_id} {reg_id} 失败: {result}")
+        if len(failed) > self.MAX_LOGGED_READ_ERRORS:
+            self.log("warn", f"读取 {port} 从站{slave_id}: 另有 {len(failed) - self.MAX_LOGGED_READ_ERRORS} 个参数读取失败")
+        self._apply_values(results, (port, slave_id))
+
+    def toggle_monitoring(self, checked):
+        if not checked:
+            self.record_btn.setChecked(False)
+            self.monitor_btn.setText("开始监控")
+            self.monitor_stats_label.clear()
+            self.monitor_max_rate_label.clear()
+            self._monitor_stats.clear()
+            self.connections.stop_monitoring()
+            return
 
-    def on_write_result(self, reg_id, success, result):
+        if not self._require_connection():
+            self.monitor_btn.setChecked(False)
+            return
+        configs = [w.config for w in self._group_widgets(MONITOR_GROUP)
+                   if w.monitor_check is not None and w.monitor_check.isChecked()]
+        if not configs:
+            self.log("warn", "未选择任何监控寄存器")
+            self.monitor_btn.setChecked(False)
+            return
+        self.monitor_btn.setText("停止监控")
+        self._monitor_configs = configs
+        self._set_scope_channels(configs)
+        self.connections.start_monitoring(configs, float(self.monitor_rate_spin.value()))
+
+    def toggle_recording(self, checked):
+        if not checked:
+            self._stop_recording()
+            return
+        if not self.monitor_btn.isChecked():
+            self.log("warn", "请先开始监控")
+            self.record_btn.setChecked(False)
+            return
+        directory = QFileDialog.getExistingDirectory(self, "选择记录目录")
+        if not directory:
+            self.record_btn.setChecked(False)
+            return
+
+        channel_ids = [cfg['id'] for cfg in self._monitor_configs]
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        try:
+            for port in self.connections.connected_ports():
+                recorders = self._recorders[port] = {}
+                for drive_port, slave_id in self.drives:
+                    if drive_port == port:
+                        path = f"{directory}/trace_{stamp}_{port}_{slave_id}{TRACE_SUFFIX}"
+                        recorders[slave_id] = TraceRecorder(path, channel_ids)
+                        self.log("info", f"记录 {port} 从站{slave_id} -> {path}")
+        except OSError as e:
+            QMessageBox.critical(self, "记录失败", f"无法创建记录文件: {e}")
+            self.record_btn.setChecked(False)
+            return
+
+        for port, recorders in self._recorders.items():
+            def sink(port, slave_id, timestamp_ns, values, recorders=recorders):
+                recorder = recorders.get(slave_id)
+                if recorder is not None:
+                    recorder.append(timestamp_ns, values)
+            self._record_sinks[port] = sink
+            self.connections.connect_sample_sink(port, sink)
+        self.record_btn.setText("停止记录")
+
+    def _stop_recording(self):
+        for port, sink in self._record_sinks.items():
+            self.connections.disconnect_sample_sink(port, sink)
+        for recorders in self._recorders.values():
+            for recorder in recorders.values():
+                recorder.close()
+                self.log("info", f"记录已保存: {recorder.path} ({recorder.rows_written} 行, 丢弃 {recorder.dropped})")
+        self._record_sinks.clear()
+        self._recorders.clear()
+        self.record_btn.setText("开始记录")
+
+    def on_monitor_sample(self, port, slave_id, timestamp_ns, values):
+        self._apply_values(values, (port, slave_id))
+        if self.scope is not None and (port, slave_id) == self.active_drive:
+            self.scope.append(timestamp_ns, values)
+
+    def on_monitor_stats(self, port, stats):
+        self._monitor_stats[port] = stats
+        target_hz = min(st['target_hz'] for st in self._monitor_stats.values())
+        if target_hz < self.monitor_rate_spin.value():
+            self.monitor_max_rate_label.setText(f"总线可达 {target_hz:.1f} Hz")
+        else:
+            self.monitor_max_rate_label.clear()
+        text = " || ".join(
+            f"{p}: 目标 {st['target_hz']:.1f} Hz | 实际 {st['achieved_hz']:.1f} Hz | 抖动 {st['jitter_ms']:.1f} ms | "
+            f"丢失 {st['dropped']} | 错误 {st['errors']}" for p, st in self._monitor_stats.items())
+        recorders = [r for recorders in self._recorders.values() for r in recorders.values()]
+        if recorders:
+            text += (f" || 已记录 {sum(r.rows_written for r in recorders)} 行, "
+                     f"丢弃 {sum(r.dropped for r in recorders)}")
+        self.monitor_stats_label.setText(text)
+
+    def _apply_values(self, values, drive):
+        """
+        Records {id: value} read from drive (port, slave_id) and applies it to
+        the table model and, for the active drive, to the register widgets
+        with painting suspended, so a whole block or monitor cycle costs one
+        repaint. Exceptions are skipped; callers report them.
+        """
+        if drive not in self.drives:
+            return  # late result from a port that has been closed
+        known_values = self._drive_values.setdefault(drive, {})
+        for reg_id, value in values.items():
+            if not isinstance(value, Exception):
+                known_values[reg_id] = value
+        if drive == self.active_drive:
+            self.tabs.setUpdatesEnabled(False)
+            try:
+                for reg_id, value in values.items():
+                    widget = self.register_widgets.get(reg_id)
+                    if widget is not None and not isinstance(value, Exception):
+                        widget.set_value(value)
+            finally:
+                self.tabs.setUpdatesEnabled(True)
+        if self.register_model is not None:
+            self.register_model.update_values(values, drive)
+
+    def on_write_result(self, port, slave_id, reg_id, success, result):
+        drive = (port, slave_id)
         if success:
-            if reg_id in self.register_widgets:
+            if drive not in self.drives:
+                return
+            self._drive_values.setdefault(drive, {})[reg_id] = result
+            if drive == self.active_drive and reg_id in self.register_widgets:
                 self.register_widgets[reg_id].set_value(result)
+            if self.register_model is not None:
+                self.register_model.commit_value(reg_id, result, drive)
         else:
-            QMessageBox.critical(self, "写入失败", f"写入 {reg_id} 失败: {result}")
-            self.log("error", f"写入 {reg_id} 失败: {result}")
-
-    def read_all_registers(self, parent_widget):
-        if not (self.modbus_worker and self.disconnect_btn.isEnabled()):
-            self.log("warn", "请先连接设备")
+            if isinstance(result, WriteVerifyError):
+                # Show what the drive actually holds
+                self._apply_values({reg_id: result.actual}, drive)
+            QMessageBox.critical(self, "写入失败", f"写入 {port} 从站{slave_id} {reg_id} 失败: {result}")
+            self.log("error", f"写入 {port} 从站{slave_id} {reg_id} 失败: {result}")
+
+    def on_write_results(self, port, slave_id, results):
+        """Applies a batch write: accepted values like a read, failures in one message."""
+        drive = (port, slave_id)
+        written = {reg_id: v for reg_id, v in results.items() if not isinstance(v, Exception)}
+        failed = {reg_id: v for reg_id, v in results.items() if isinstance(v, Exception)}
+        if written and drive in self.drives:
+            self._apply_values(written, drive)
+            if self.register_model is not None:
+                for reg_id, value in written.items():
+                    self.register_model.commit_value(reg_id, value, drive)
+        stored = {reg_id: e.actual for reg_id, e in failed.items() if isinstance(e, WriteVerifyError)}
+        if stored:
+            # Verified writes that did not stick: show what the drive actually holds
+            self._apply_values(stored, drive)
+        self.log("info", f"批量写入 {port} 从站{slave_id}: 成功 {len(written)}, 失败 {len(failed)}")
+        if failed:
+            for reg_id, error in failed.items():
+                self.log("error", f"写入 {port} 从站{slave_id} {reg_id} 失败: {error}")
+            QMessageBox.critical(self, "写入失败", f"{port} 从站{slave_id}: {len(failed)} 个参数写入失败:\n"
+                                 + "\n".join(f"{reg_id}: {e}" for reg_id, e in failed.items()))
+
+    def read_all_registers(self, group_name):
+        if not self._require_connection():
             return
 
-        # Collect all register configurations from the current tab
-        configs_to_read = [w.config for w in parent_widget.findChildren(RegisterWidget)]
+        # All registers of the tab, straight from the catalog
+        configs_to_read = self.catalog.group_entries(group_name)
 
         if configs_to_read:
             self.log("info", f"开始批量读取 {len(configs_to_read)} 个寄存器...")
-            # Pass the whole list to the new worker method
-            self.modbus_worker.read_multiple_registers(configs_to_read)
+            # The whole tab is one job; the worker splits it into blocks
+            self._submit_read(configs_to_read)
 
-    def write_all_registers(self, parent_widget):
-        if not (self.modbus_worker and self.disconnect_btn.isEnabled()):
-            self.log("warn", "请先连接设备")
+    def write_all_registers(self, group_name):
+        if not self._require_connection():
             return
 
-        dirty_widgets = [w for w in parent_widget.findChildren(RegisterWidget) if w.is_dirty]
+        dirty_widgets = [w for w in self._group_widgets(group_name) if w.is_dirty]
         if not dirty_widgets:
             QMessageBox.information(self, "提示", "没有检测到已修改的参数。")
             return
@@ -1695,13 +2067,112 @@ class MainWindow(QMainWindow):
                                      QMessageBox.StandardButton.No)
 
         if reply == QMessageBox.StandardButton.Yes:
-            for widget in dirty_widgets:
-                self.write_single_register(widget.config, widget.get_value())
-                QApplication.processEvents()
-                time.sleep(0.05)
+            # One job: the worker merges adjacent registers into FC16 requests
+            self._submit_write_batch([(w.config, w.get_value()) for w in dirty_widgets])
+
+    def read_table_registers(self):
+        if not self._require_connection():
+            return
+        configs_to_read = self.register_table.visible_entries()
+        if configs_to_read:
+            self.log("info", f"开始批量读取 {len(configs_to_read)} 个寄存器 × {len(self.drives)} 个驱动器...")
+            # The table has a column per drive: one job per port, and the ports run in parallel
+            self._submit_read(configs_to_read, self.drives)
+
+    def write_table_registers(self):
+        if not self._require_connection():
+            return
+
+        visible = self.register_table.visible_entries()
+        pending = [(drive, entry, value) for drive in self.drives
+                   for entry, value in self.register_model.pending_writes(drive, visible)]
+        if not pending:
+            QMessageBox.information(self, "提示", "没有检测到已修改的参数。")
+            return
+
+        reply = QMessageBox.question(self, "确认写入",
+                                     f"将要写入 {len(pending)} 个已修改的参数，是否继续？",
+                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                                     QMessageBox.StandardButton.No)
+
+        if reply == QMessageBox.StandardButton.Yes:
+            by_drive = {}
+            for drive, entry, value in pending:
+                by_drive.setdefault(drive, []).append((entry, value))
+            for drive, writes in by_drive.items():
+                self._submit_write_batch(writes, drive)
+
+    def dump_drive(self):
+        if not self._require_connection():
+            return
+        port, slave_id = drive = self.active_drive
+        path, _ = QFileDialog.getSaveFileName(self, "导出参数快照", f"{port}_{slave_id}{SNAPSHOT_SUFFIX}",
+                                              f"参数快照 (*{SNAPSHOT_SUFFIX})")
+        if not path:
+            return
+        self._snapshot_paths[drive] = path
+        self.connections.submit_snapshot(port, slave_id, snapshot_entries(self.catalog))
+
+    def on_snapshot_read(self, port, slave_id, results):
+        drive = (port, slave_id)
+        path = self._snapshot_paths.pop(drive, None)
+        self._apply_values(results, drive)
+        if path is None:
+            return
+        failed = [reg_id for reg_id, v in results.items() if isinstance(v, Exception)]
+        if failed:
+            QMessageBox.critical(self, "导出失败", f"{len(failed)} 个参数读取失败, 未保存快照:\n" + ", ".join(failed[:20]))
+            return
+        entries = snapshot_entries(self.catalog)
+        snapshot = DriveSnapshot.from_values(entries, results, self.register_codecs, slave_id)
+        try:
+            snapshot.save(path)
+        except OSError as e:
+            QMessageBox.critical(self, "导出失败", f"无法保存 {path}: {e}")
+            return
+        self.log("info", f"已导出 {port} 从站{slave_id} 的 {len(entries)} 个参数到 {path}")
+
+    def restore_drive(self):
+        if not self._require_connection():
+            return
+        path, _ = QFileDialog.getOpenFileName(self, "导入参数快照", "", f"参数快照 (*{SNAPSHOT_SUFFIX})")
+        if not path:
+            return
+        try:
+            snapshot = DriveSnapshot.load(path)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "导入失败", f"无法读取 {path}: {e}")
+            return
+
+        entries = snapshot_entries(self.catalog)
+        if snapshot.layout != layout_hash(entries):
+            reply = QMessageBox.question(self, "参数表不一致",
+                                         "快照与当前参数表的寄存器定义不一致, 是否仍按地址写入匹配的参数？",
+                                         QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                                         QMessageBox.StandardButton.No)
+            if reply != QMessageBox.StandardButton.Yes:
+                return
+        writes = [(e, v) for e, v in snapshot.values(entries, self.register_codecs)
+                  if e.group not in RESTORE_SKIPPED_GROUPS]
+        port, slave_id = self.active_drive
+        reply = QMessageBox.question(self, "确认导入",
+                                     f"将要向 {port} 从站{slave_id} 写入 {len(writes)} 个参数 "
+                                     f"(不含{'、'.join(RESTORE_SKIPPED_GROUPS)}及命令、密码寄存器 "
+                                     f"{', '.join(RESTORE_SKIPPED_IDS)}), 是否继续？",
+                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                                     QMessageBox.StandardButton.No)
+        if reply == QMessageBox.StandardButton.Yes:
+            self.log("info", f"开始导入 {path}: {len(writes)} 个参数")
+            # Always verified: a restore must leave the drive exactly as the snapshot
+            self.connections.submit_write_batch(port, slave_id, writes, verify=True)
 
     def closeEvent(self, event):
-        self.disconnect_device()
+        self.discovery.wait()
+        self._stop_recording()
+        self.disconnect_all_devices()
+        self.log_panel.close_sinks()
+        if self.metrics_file is not None:
+            self.metrics_file.close()
         event.accept()
 
 # ==============================================================================
@@ -1713,7 +2184,12 @@ if __name__ == '__main__':
     # The classes need to be fully defined above, not just placeholders.
     # The following shows the intended logic assuming all classes are fully implemented in this file.
 
-    window = MainWindow()
+    simulator = None
+    if '--simulate' in sys.argv:
+        # Offline mode: drives 1-8 at 19200 bit/s, simulated in-process
+        from drive_simulator import SimulatedBus
+        simulator = SimulatedBus.with_drives(load_register_catalog(), range(1, 9), 19200)
+    window = MainWindow(prewarm_tabs='--prewarm-tabs' in sys.argv, simulator=simulator)
     window.show()
 
     sys.exit(app.exec())
\ No newline at end of file
@@ -0,0 +1,224 @@
+# port_discovery.py
+import time
+
+from PyQt6.QtCore import QObject, Qt, QThread, pyqtSignal, pyqtSlot
+from pymodbus.client import ModbusSerialClient
+from pymodbus.exceptions import ModbusIOException
+
+from block_planner import LinkTiming
+
+try:
+    from serial.tools import list_ports
+except ImportError:  # pyserial without its tools package: ports can still be typed in
+    list_ports = None
+
+# Line settings a drive can be set to (FU504 baud rate, FU503 parity, FU502 stop bits)
+BAUDRATES = (2400, 4800, 9600, 19200, 38400, 57600)
+PARITIES = ('N', 'E', 'O')
+STOPBITS = (1, 2)
+PARITY_NAMES = {'N': "无校验", 'O': "奇校验", 'E': "偶校验"}
+FACTORY_LINE_SETTINGS = (19200, 'N', 1)
+
+# Every drive has AU-00 (software version), so a reply to it identifies one
+IDENTITY_ADDRESS = 800
+# Reply allowance beyond the time on the wire (turnaround plus USB adapter latency)
+PROBE_MARGIN = 0.03
+
+
+def list_serial_ports():
+    """Device names of the serial ports present on this machine, sorted."""
+    if list_ports is None:
+        return []
+    return sorted(port.device for port in list_ports.comports())
+
+
+def candidate_line_settings(preferred=FACTORY_LINE_SETTINGS):
+    """
+    Every (baudrate, parity, stopbits) a drive can use, preferred first,
+    then the fastest first: those probes time out soonest.
+    """
+    candidates = [(b, p, s) for b in sorted(BAUDRATES, reverse=True) for p in PARITIES for s in STOPBITS]
+    if preferred in candidates:
+        candidates.remove(preferred)
+        candidates.insert(0, preferred)
+    return candidates
+
+
+def probe_timeout(line_settings):
+    """Reply timeout for one single-register read at line_settings."""
+    return LinkTiming(*line_settings).read_time(1) + PROBE_MARGIN
+
+
+def format_line_settings(line_settings):
+    baudrate, parity, stopbits = line_settings
+    return f"{baudrate} bit/s, {PARITY_NAMES.get(parity, parity)}, {stopbits} 停止位"
+
+
+def _probe_ids(port, line_settings, slave_ids, client_factory, cancelled, on_found):
+    """
+    Reads AU-00 from each of slave_ids at line_settings and returns the
+    drives that answered; None if the port cannot be opened with these
+    settings.
+    """
+    baudrate, parity, stopbits = line_settings
+    client = (client_factory or ModbusSerialClient)(
+        port=port,
+        baudrate=baudrate,
+        parity=parity,
+        stopbits=stopbits,
+        timeout=probe_timeout(line_settings),
+        retries=0
+    )
+    if not client.connect():
+        return None
+    found = []
+    try:
+        for slave_id in slave_ids:
+            if cancelled is not None and cancelled():
+                break
+            try:
+                rr = client.read_holding_registers(address=IDENTITY_ADDRESS, count=1, slave=slave_id)
+            except ModbusIOException:
+                continue  # no reply: nobody at this id, or not at these settings
+            except Exception:
+                continue  # a garbled reply says nothing about who sent it
+            drive = {
+                'port': port,
+                'baudrate': baudrate,
+                'parity': parity,
+                'stopbits': stopbits,
+                'slave': slave_id,
+                'version': None if rr.isError() else rr.registers[0],
+            }
+            found.append(drive)
+            if on_found is not None:
+                on_found(drive)
+    finally:
+        client.close()
+    return found
+
+
+def probe_port(port, slave_ids, candidates=None, client_factory=None, cancelled=None, on_found=None):
+    """
+    Looks for drives on one port by reading AU-00 with a timeout just
+    above the exchange's wire time. Any reply, an exception response
+    included, is a drive; noise that fails the CRC is not.
+
+    The first id in slave_ids (after a reset, the factory address) is
+    tried at every candidate line setting first; only if it is nowhere to
+    be found are the other ids tried, setting by setting. The search stops
+    at the first setting that found drives, since the drives on one line
+    share it, after trying the remaining ids there. Returns a list of
+    {'port', 'baudrate', 'parity', 'stopbits', 'slave', 'version'} dicts
+    (version None if AU-00 was refused); on_found is called with each as it
+    is found. Raises ConnectionError if the port cannot be opened at all.
+    Settings the port itself rejects (a pty has no even parity) are skipped.
+    """
+    slave_ids = list(slave_ids)
+    candidates = list(candidates or candidate_line_settings())
+    opened = False
+    for ids in (slave_ids[:1], slave_ids[1:]):
+        for line_settings in candidates:
+            if not ids or (cancelled is not None and cancelled()):
+                break
+            found = _probe_ids(port, line_settings, ids, client_factory, cancelled, on_found)
+            if found is None:
+                if not opened:
+                    raise ConnectionError(f"无法打开端口 {port}")
+                continue
+            opened = True
+            if found:
+                rest = [slave_id for slave_id in slave_ids if slave_id not in ids]
+                return found + (_probe_ids(port, line_settings, rest, client_factory, cancelled, on_found) or [])
+    return []
+
+
+class PortProber(QObject):
+    """Runs probe_port for one port on its own thread."""
+    drive_found = pyqtSignal(object)  # drive dict, see probe_port
+    finished = pyqtSignal(str, object, str)  # port, [drive dicts], error message ('' if none)
+
+    def __init__(self, port, slave_ids, candidates=None, client_factory=None):
+        super().__init__()
+        self.port = port
+        self.slave_ids = list(slave_ids)
+        self.candidates = candidates
+        self.client_factory = client_factory
+        self._cancelled = False
+
+    def cancel(self):
+        """Safe to call from any thread: the prober checks the flag before each probe."""
+        self._cancelled = True
+
+    @pyqtSlot()
+    def run(self):
+        drives, error = [], ''
+        try:
+            drives = probe_port(self.port, self.slave_ids, self.candidates, self.client_factory,
+                                cancelled=lambda: self._cancelled, on_found=self.drive_found.emit)
+        except Exception as e:
+            error = str(e)
+        self.finished.emit(self.port, drives, error)
+
+
+class PortDiscovery(QObject):
+    """
+    Probes several ports at once, one thread each (each port is its own
+    bus, so probes on different ports do not wait for one another).
+    port_finished reports every port as it completes, finished the
+    {port: [drive dicts]} of all of them.
+    """
+    drive_found = pyqtSignal(object)  # drive dict
+    port_finished = pyqtSignal(str, object, str)  # port, [drive dicts], error message
+    finished = pyqtSignal(object, float)  # {port: [drive dicts]}, seconds taken
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._probes = {}  # {port: (PortProber, QThread)}
+        self._results = {}
+        self._started = 0.0
+
+    def is_running(self):
+        return bool(self._probes)
+
+    def start(self, ports, slave_ids, preferred=FACTORY_LINE_SETTINGS, client_factory=None):
+        if self._probes:
+            raise RuntimeError("搜索正在进行")
+        self._results = {}
+        self._started = time.perf_counter()
+        candidates = candidate_line_settings(preferred)
+        for port in ports:
+            prober = PortProber(port, slave_ids, candidates, client_factory)
+            thread = QThread()
+            prober.moveToThread(thread)
+            thread.started.connect(prober.run)
+            # Direct, so the thread is stopping by the time _on_port_finished waits for it
+            prober.finished.connect(thread.quit, Qt.ConnectionType.DirectConnection)
+            prober.drive_found.connect(self.drive_found)
+            prober.finished.connect(self._on_port_finished)
+            thread.finished.connect(prober.deleteLater)
+            self._probes[port] = (prober, thread)
+            thread.start()
+        if not self._probes:
+            self.finished.emit({}, 0.0)
+
+    def cancel(self):
+        for prober, _ in self._probes.values():
+            prober.cancel()
+
+    def wait(self):
+        """Cancels the probes and blocks until their threads have stopped (on shutdown)."""
+        self.cancel()
+        for _, thread in list(self._probes.values()):
+            thread.quit()
+            thread.wait()
+
+    def _on_port_finished(self, port, drives, error):
+        probe = self._probes.pop(port, None)
+        if probe is not None:
+            probe[1].wait()
+            probe[1].deleteLater()
+        self._results[port] = drives
+        self.port_finished.emit(port, drives, error)
+        if not self._probes:
+            self.finished.emit(dict(self._results), time.perf_counter() - self._started)
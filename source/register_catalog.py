@@ -0,0 +1,227 @@
+# register_catalog.py
+import bisect
+import hashlib
+import os
+import pickle
+
+from block_planner import register_word_count
+
+REGISTER_TYPES = ('u16', 's16', 'enum16', 'bit_field', 'u32', 's32')
+# Value range used when a register has no "range" entry (what a QSpinBox can hold)
+DEFAULT_VALUE_RANGE = (-2147483648, 2147483647)
+DEFAULT_SUB_GROUP = '常规'
+# Command registers: writing one runs an action on the drive (electrical angle
+# identification, set origin, encoder reset, factory / Flash restore) that
+# changes other parameters, and the register clears itself afterwards
+COMMAND_REGISTER_IDS = ('AU-25', 'AU-41', 'AU-43', 'AU-49')
+# Password registers: writing one unlocks parameter areas
+PASSWORD_REGISTER_IDS = ('AU-01', 'AU-48')
+
+
+def parse_range(range_str):
+    """Parses "0-10000" or "-5000~+5000" into (min, max); raises ValueError if malformed."""
+    text = range_str.replace(' ', '').replace('+', '')
+    parts = text.split('~') if '~' in text else text.split('-')
+    if len(parts) != 2:
+        raise ValueError(f"Cannot parse range '{range_str}'")
+    return int(parts[0]), int(parts[1])
+
+
+def is_invalid_register(config):
+    """Reserved entries and registers without a documented address are not shown or read."""
+    return (config['name'] == "保留" or config.get('sub_group') == "保留项"
+            or (config.get('address') <= 0 and config.get('id') != "FU000"))
+
+
+class _Record:
+    """
+    Slotted record that can still be read like the original config dict
+    (record['id'], record.get('word_order', 'big'), 'range' in record).
+    Optional keys that were absent are stored as None.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        value = getattr(self, key, None)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        value = getattr(self, key, None)
+        return default if value is None else value
+
+    def __contains__(self, key):
+        return getattr(self, key, None) is not None
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+
+class BitField(_Record):
+    __slots__ = ('name', 'start_bit', 'length', 'type', 'options', 'mask', 'value_range')
+
+    def __init__(self, field):
+        self.name = field['name']
+        self.start_bit = field['start_bit']
+        self.length = field['length']
+        self.type = field['type']
+        self.options = field.get('options')
+        self.mask = (1 << self.length) - 1
+        self.value_range = (0, self.mask)
+
+
+class RegisterEntry(_Record):
+    __slots__ = ('id', 'name', 'group', 'sub_group', 'type', 'address', 'words', 'word_order',
+                 'read_only', 'effect', 'range', 'value_range', 'options', 'fields', 'tooltip',
+                 'note', 'valid')
+
+    def __init__(self, config):
+        if config['type'] not in REGISTER_TYPES:
+            raise ValueError(f"{config['id']}: unknown register type '{config['type']}'")
+        self.id = config['id']
+        self.name = config['name']
+        self.group = config['group']
+        self.sub_group = config.get('sub_group', DEFAULT_SUB_GROUP)
+        self.type = config['type']
+        self.address = config['address']
+        self.words = register_word_count(self.type)
+        self.word_order = config.get('word_order')
+        self.read_only = config.get('read_only', False)
+        self.effect = config.get('effect')
+        self.range = config.get('range')
+        try:
+            self.value_range = parse_range(self.range) if self.range else DEFAULT_VALUE_RANGE
+        except ValueError as e:
+            raise ValueError(f"{self.id}: {e}") from None
+        self.options = config.get('options')
+        self.fields = tuple(BitField(f) for f in config['fields']) if 'fields' in config else None
+        self.tooltip = config.get('tooltip')
+        self.note = config.get('note')
+        self.valid = not is_invalid_register(config)
+
+    @property
+    def end_address(self):
+        return self.address + self.words
+
+
+class RegisterCatalog:
+    """
+    Validated, indexed view of a register map, built once.
+
+    Entries keep declaration order. Lookups: by id (dict), by address
+    (bisect over valid entries, so any word of a 32-bit register finds it)
+    and by group / sub_group (in first-seen order, valid entries only).
+    """
+
+    def __init__(self, register_map):
+        self.entries = tuple(RegisterEntry(cfg) for cfg in register_map)
+        self._by_id = {}
+        for entry in self.entries:
+            if entry.id in self._by_id:
+                raise ValueError(f"Duplicate register id '{entry.id}'")
+            self._by_id[entry.id] = entry
+
+        self._by_address = sorted((e for e in self.entries if e.valid), key=lambda e: e.address)
+        self._starts = [e.address for e in self._by_address]
+
+        self._groups = {}
+        for entry in self.entries:
+            if entry.valid:
+                self._groups.setdefault(entry.group, {}).setdefault(entry.sub_group, []).append(entry)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __contains__(self, reg_id):
+        return reg_id in self._by_id
+
+    def __getitem__(self, reg_id):
+        return self._by_id[reg_id]
+
+    def get(self, reg_id, default=None):
+        return self._by_id.get(reg_id, default)
+
+    def at_address(self, address):
+        """Returns the valid entry whose words cover address, or None."""
+        i = bisect.bisect_right(self._starts, address) - 1
+        # A 32-bit register starting one word earlier may also cover it
+        for entry in self._by_address[max(0, i - 1): i + 1][::-1]:
+            if entry.address <= address < entry.end_address:
+                return entry
+        return None
+
+    def in_range(self, start, end):
+        """Returns the valid entries that overlap [start, end), sorted by address."""
+        lo = bisect.bisect_left(self._starts, start - 1)
+        hi = bisect.bisect_left(self._starts, end)
+        return [e for e in self._by_address[lo:hi] if e.end_address > start]
+
+    def valid_entries(self):
+        return list(self._by_address)
+
+    def group_names(self):
+        return list(self._groups)
+
+    def sub_groups(self, group):
+        """Returns {sub_group: [entries]} for group, in declaration order."""
+        return self._groups.get(group, {})
+
+    def group_entries(self, group):
+        return [e for entries in self.sub_groups(group).values() for e in entries]
+
+
+_SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Files whose contents determine the cached catalog: the tables and this module
+_CATALOG_SOURCES = ('registers.py', 'register_catalog.py')
+_catalog = None
+
+
+def _source_hash():
+    digest = hashlib.sha256()
+    for name in _CATALOG_SOURCES:
+        with open(os.path.join(_SOURCE_DIR, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def load_register_catalog(cache_dir=None):
+    """
+    Returns the RegisterCatalog for registers.REGISTER_MAP, building it on
+    first use only. The built catalog is pickled to cache_dir (default:
+    __pycache__ next to this module) under the hash of its source files, so
+    later processes skip importing and validating the tables. An unreadable
+    or unwritable cache only costs a rebuild.
+    """
+    global _catalog
+    if _catalog is not None:
+        return _catalog
+
+    if cache_dir is None:
+        cache_dir = os.path.join(_SOURCE_DIR, '__pycache__')
+    cache_path = os.path.join(cache_dir, f"register_catalog-{_source_hash()}.pickle")
+    try:
+        with open(cache_path, 'rb') as f:
+            _catalog = pickle.load(f)
+        return _catalog
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        pass
+
+    from registers import REGISTER_MAP
+    _catalog = RegisterCatalog(REGISTER_MAP)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(_catalog, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    return _catalog
@@ -0,0 +1,102 @@
+# register_codec.py
+import struct
+from operator import itemgetter
+
+from block_planner import register_word_count
+
+# Big-endian struct code of each register type's value (word order is handled separately)
+_VALUE_FORMATS = {
+    'u16': 'H',
+    's16': 'h',
+    'enum16': 'H',
+    'bit_field': 'H',
+    'u32': 'I',
+    's32': 'i',
+}
+
+
+class RegisterCodec:
+    """
+    Precompiled encoder/decoder for one register config: word width, struct
+    format and word order are resolved once instead of on every read.
+    """
+    __slots__ = ('id', 'address', 'words', 'fmt', 'swap_words', '_value', '_raw')
+
+    def __init__(self, config):
+        self.id = config['id']
+        self.address = config['address']
+        self.words = register_word_count(config['type'])
+        self.fmt = _VALUE_FORMATS[config['type']]
+        # 'little' word order puts the low word at the lower address
+        self.swap_words = self.words == 2 and config.get('word_order', 'big') == 'little'
+        self._value = struct.Struct('>' + self.fmt)
+        self._raw = struct.Struct('>%dH' % self.words)
+
+    def decode(self, registers):
+        if self.swap_words:
+            registers = (registers[1], registers[0])
+        return self._value.unpack(self._raw.pack(*registers))[0]
+
+    def encode(self, value):
+        """Returns the register words for value; raises struct.error if it does not fit."""
+        words = list(self._raw.unpack(self._value.pack(value)))
+        if self.swap_words:
+            words.reverse()
+        return words
+
+
+def compile_register_codecs(register_map):
+    """Builds {id: RegisterCodec} for every entry of a register map."""
+    return {cfg['id']: RegisterCodec(cfg) for cfg in register_map}
+
+
+class BlockCodec:
+    """
+    Decodes every register of a planned read block with one struct.unpack.
+
+    The block's words are reordered once (swapping the two words of
+    little-word-order 32-bit values), packed big-endian and unpacked with a
+    single format in which bridged gap words are pad bytes.
+    """
+    __slots__ = ('ids', '_start', '_order', '_raw', '_values', '_codecs')
+
+    def __init__(self, start, word_count, codecs):
+        codecs = sorted(codecs, key=lambda c: c.address)
+        self.ids = [c.id for c in codecs]
+        self._start = start
+        self._codecs = None
+
+        order = []
+        fmt = '>'
+        pos = start
+        for c in codecs:
+            if c.address < pos:
+                # Overlapping definitions cannot share one format; decode one by one
+                self._codecs = codecs
+                return
+            gap = c.address - pos
+            if gap:
+                fmt += '%dx' % (2 * gap)
+                order.extend(range(pos - start, c.address - start))
+            offset = c.address - start
+            order.extend((offset + 1, offset) if c.swap_words else range(offset, offset + c.words))
+            fmt += c.fmt
+            pos = c.address + c.words
+        tail = start + word_count - pos
+        if tail > 0:
+            fmt += '%dx' % (2 * tail)
+            order.extend(range(pos - start, word_count))
+
+        self._order = itemgetter(*order) if len(order) > 1 else (lambda regs: (regs[order[0]],))
+        self._raw = struct.Struct('>%dH' % len(order))
+        self._values = struct.Struct(fmt)
+
+    def decode_into(self, registers, results):
+        """Stores {id: value} for the block's registers into results."""
+        if self._codecs is not None:
+            for c in self._codecs:
+                offset = c.address - self._start
+                results[c.id] = c.decode(registers[offset: offset + c.words])
+            return
+        values = self._values.unpack(self._raw.pack(*self._order(registers)))
+        results.update(zip(self.ids, values))
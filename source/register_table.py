@@ -0,0 +1,277 @@
+# register_table.py
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, QRegularExpression
+from PyQt6.QtGui import QFont, QColor
+from PyQt6.QtWidgets import (QStyledItemDelegate, QComboBox, QSpinBox, QTableView, QHeaderView, QWidget,
+                             QHBoxLayout, QAbstractItemView)
+
+ENTRY_ROLE = Qt.ItemDataRole.UserRole + 1  # the row's RegisterEntry
+GROUP_ROLE = Qt.ItemDataRole.UserRole + 2  # the row's group name, for filtering
+
+
+def format_value(entry, value):
+    if value is None:
+        return ""
+    if entry.options and value in entry.options:
+        return f"({value}) {entry.options[value]}"
+    if entry.type == 'bit_field':
+        return f"0x{value:04X}"
+    return str(value)
+
+
+class RegisterTableModel(QAbstractTableModel):
+    """
+    One row per register, one value column per drive. A drive is any
+    hashable key; (port, slave_id) pairs are labelled with both.
+
+    Values live in flat per-drive lists indexed by row, so applying a block
+    or monitor cycle is a dict lookup per register plus one dataChanged per
+    run of adjacent rows; the view repaints only what is visible. Edits are
+    kept as pending values (shown bold) until written.
+    """
+    INFO_COLUMNS = ('ID', '名称', '地址', '范围', '生效')
+
+    def __init__(self, entries, drives=(), parent=None):
+        super().__init__(parent)
+        self._entries = list(entries)
+        self._rows = {e.id: row for row, e in enumerate(self._entries)}
+        self._drives = list(drives)
+        self._values = {drive: [None] * len(self._entries) for drive in self._drives}
+        self._pending = {}  # (row, drive) -> edited value
+        self._bold = QFont()
+        self._bold.setBold(True)
+
+    # --- Qt model interface ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._entries)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.INFO_COLUMNS) + len(self._drives)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation != Qt.Orientation.Horizontal or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if section < len(self.INFO_COLUMNS):
+            return self.INFO_COLUMNS[section]
+        drive = self._drives[section - len(self.INFO_COLUMNS)]
+        if isinstance(drive, tuple):
+            return f"{drive[0]} 驱动器 {drive[1]}"
+        return f"驱动器 {drive}"
+
+    def flags(self, index):
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        drive = self.drive_for_column(index.column())
+        # Only values that have been read can be edited, so a write never
+        # clobbers bits or settings the user has not seen
+        if (drive is not None and not self._entries[index.row()].read_only
+                and self._values[drive][index.row()] is not None):
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        entry = self._entries[row]
+        if role == ENTRY_ROLE:
+            return entry
+        if role == GROUP_ROLE:
+            return entry.group
+
+        drive = self.drive_for_column(column)
+        if drive is None:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return (entry.id, entry.name, entry.address, entry.range or "", entry.effect or "")[column]
+            if role == Qt.ItemDataRole.ToolTipRole:
+                return entry.tooltip
+            return None
+
+        pending = self._pending.get((row, drive))
+        value = pending if pending is not None else self._values[drive][row]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return format_value(entry, value)
+        if role == Qt.ItemDataRole.EditRole:
+            return value
+        if role == Qt.ItemDataRole.FontRole and pending is not None:
+            return self._bold
+        if role == Qt.ItemDataRole.ForegroundRole and entry.read_only:
+            return QColor("#555555")
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        drive = self.drive_for_column(index.column())
+        if role != Qt.ItemDataRole.EditRole or drive is None or value is None:
+            return False
+        row = index.row()
+        if value == self._values[drive][row]:
+            self._pending.pop((row, drive), None)
+        else:
+            self._pending[(row, drive)] = value
+        self.dataChanged.emit(index, index)
+        return True
+
+    def set_drives(self, drives):
+        """Replaces the value columns; values and edits of drives that stay are kept."""
+        self.beginResetModel()
+        self._drives = list(drives)
+        self._values = {drive: self._values.get(drive) or [None] * len(self._entries) for drive in self._drives}
+        self._pending = {key: value for key, value in self._pending.items() if key[1] in self._values}
+        self.endResetModel()
+
+    # --- Value updates ---
+    def drive_for_column(self, column):
+        offset = column - len(self.INFO_COLUMNS)
+        return self._drives[offset] if 0 <= offset < len(self._drives) else None
+
+    def row_for_id(self, reg_id):
+        return self._rows.get(reg_id)
+
+    def update_values(self, values, drive):
+        """Stores {id: value} for one drive; exceptions and unknown ids are skipped."""
+        column_values = self._values.get(drive)
+        if column_values is None:
+            return
+        rows = []
+        for reg_id, value in values.items():
+            row = self._rows.get(reg_id)
+            if row is not None and not isinstance(value, Exception):
+                column_values[row] = value
+                rows.append(row)
+        if not rows:
+            return
+        column = len(self.INFO_COLUMNS) + self._drives.index(drive)
+        rows.sort()
+        run_start = prev = rows[0]
+        for row in rows[1:] + [None]:
+            if row is not None and row <= prev + 1:
+                prev = row
+                continue
+            self.dataChanged.emit(self.index(run_start, column), self.index(prev, column),
+                                  [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
+            run_start = prev = row
+
+    def pending_writes(self, drive, entries=None):
+        """Returns [(entry, value)] edited but not yet written, optionally limited to entries."""
+        wanted = None if entries is None else {e.id for e in entries}
+        return [(self._entries[row], value) for (row, key), value in sorted(self._pending.items())
+                if key == drive and (wanted is None or self._entries[row].id in wanted)]
+
+    def commit_value(self, reg_id, value, drive):
+        """Records a value the drive accepted and drops the pending edit for it."""
+        row = self._rows.get(reg_id)
+        if row is None or drive not in self._values:
+            return
+        self._pending.pop((row, drive), None)
+        self.update_values({reg_id: value}, drive)
+
+
+class BitFieldEditor(QWidget):
+    """Inline editor for a bit_field register: one combo box per field."""
+
+    def __init__(self, entry, parent=None):
+        super().__init__(parent)
+        self.setAutoFillBackground(True)
+        self._entry = entry
+        self._value = 0
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(2)
+        self._combos = []
+        for field in entry.fields:
+            combo = QComboBox()
+            combo.setToolTip(field.name)
+            for val, desc in (field.options or {v: str(v) for v in range(field.mask + 1)}).items():
+                combo.addItem(f"{field.name}: {desc}", val)
+            layout.addWidget(combo)
+            self._combos.append((field, combo))
+
+    def set_value(self, value):
+        self._value = value or 0
+        for field, combo in self._combos:
+            index = combo.findData((self._value >> field.start_bit) & field.mask)
+            if index != -1:
+                combo.setCurrentIndex(index)
+
+    def value(self):
+        # Bits not covered by any field keep the value that was read
+        val = self._value
+        for field, combo in self._combos:
+            val &= ~(field.mask << field.start_bit)
+            val |= (combo.currentData() & field.mask) << field.start_bit
+        return val
+
+
+class RegisterValueDelegate(QStyledItemDelegate):
+    """Editors by register type: enum -> combo box, bit_field -> BitFieldEditor, else range-limited spin box."""
+
+    def createEditor(self, parent, option, index):
+        entry = index.data(ENTRY_ROLE)
+        if entry.type == 'bit_field':
+            return BitFieldEditor(entry, parent)
+        if entry.options:
+            editor = QComboBox(parent)
+            for val, desc in entry.options.items():
+                editor.addItem(f"({val}) {desc}", val)
+            return editor
+        editor = QSpinBox(parent)
+        editor.setRange(*entry.value_range)
+        return editor
+
+    def setEditorData(self, editor, index):
+        value = index.data(Qt.ItemDataRole.EditRole)
+        if isinstance(editor, BitFieldEditor):
+            editor.set_value(value)
+        elif isinstance(editor, QComboBox):
+            i = editor.findData(value)
+            if i != -1:
+                editor.setCurrentIndex(i)
+        elif value is not None:
+            editor.setValue(int(value))
+
+    def setModelData(self, editor, model, index):
+        if isinstance(editor, BitFieldEditor):
+            model.setData(index, editor.value())
+        elif isinstance(editor, QComboBox):
+            model.setData(index, editor.currentData())
+        else:
+            editor.interpretText()
+            model.setData(index, editor.value())
+
+    def updateEditorGeometry(self, editor, option, index):
+        rect = option.rect
+        rect.setWidth(max(rect.width(), editor.sizeHint().width()))
+        editor.setGeometry(rect)
+
+
+class RegisterTableView(QTableView):
+    """Table over a RegisterTableModel with a group filter; rows have a fixed height so only visible rows are laid out."""
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(model)
+        self.proxy.setFilterRole(GROUP_ROLE)
+        self.setModel(self.proxy)
+        self.setItemDelegate(RegisterValueDelegate(self))
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.DoubleClicked
+                             | QAbstractItemView.EditTrigger.EditKeyPressed)
+        self.setAlternatingRowColors(True)
+        self.verticalHeader().setVisible(False)
+        self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.verticalHeader().setDefaultSectionSize(24)
+        header = self.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        header.setStretchLastSection(True)
+        self.setColumnWidth(0, 90)
+        self.setColumnWidth(1, 260)
+        self.setColumnWidth(2, 60)
+        self.setColumnWidth(3, 150)
+        self.setColumnWidth(4, 100)
+
+    def set_group_filter(self, group):
+        """Shows only rows of group; an empty string shows everything."""
+        pattern = f"^{QRegularExpression.escape(group)}$" if group else ""
+        self.proxy.setFilterRegularExpression(pattern)
+
+    def visible_entries(self):
+        return [self.proxy.index(row, 0).data(ENTRY_ROLE) for row in range(self.proxy.rowCount())]
@@ -929,7 +929,3 @@ REGISTER_MAP.extend(POSITION_PARAMETERS)
 REGISTER_MAP.extend(IO_PARAMETERS)
 REGISTER_MAP.extend(COMMUNICATION_PARAMETERS)
 
-REGISTER_MAP.sort(key=lambda x: x['address'])
-for element in REGISTER_MAP:
-    print(element)
-
@@ -0,0 +1,74 @@
+# retry_policy.py
+import random
+
+
+class RttEstimator:
+    """
+    Round-trip estimate of one drive, after Jacobson/Karels (RFC 6298):
+    a smoothed RTT and its mean deviation, updated with every answered
+    request, give the timeout srtt + 4 * rttvar.
+
+    Samples are the time a reply took beyond its modeled wire time (the
+    drive's turnaround plus host and driver latency), so one estimate
+    serves requests of any size: timeout(wire_time) adds the wire time of
+    the request at hand back on. Until the first sample the timeout is
+    max_timeout. Every timeout doubles the next one (up to max_timeout)
+    until a reply is measured again.
+    """
+    ALPHA = 1 / 8
+    BETA = 1 / 4
+    K = 4
+
+    def __init__(self, min_timeout=0.05, max_timeout=1.0, granularity=0.001):
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.granularity = granularity
+        self.srtt = None
+        self.rttvar = None
+        self.backoff = 1
+
+    def update(self, sample):
+        sample = max(0.0, sample)
+        if self.srtt is None:
+            self.srtt = sample
+            self.rttvar = sample / 2
+        else:
+            self.rttvar = (1 - self.BETA) * self.rttvar + self.BETA * abs(self.srtt - sample)
+            self.srtt = (1 - self.ALPHA) * self.srtt + self.ALPHA * sample
+        self.backoff = 1
+
+    def on_timeout(self):
+        self.backoff = min(self.backoff * 2, 64)
+
+    def rto(self):
+        """Allowance beyond the wire time, in seconds (None before the first sample)."""
+        if self.srtt is None:
+            return None
+        return self.srtt + max(self.granularity, self.K * self.rttvar)
+
+    def timeout(self, wire_time=0.0):
+        rto = self.rto()
+        if rto is None:
+            return self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, (wire_time + rto) * self.backoff))
+
+
+class RetryPolicy:
+    """
+    How often a request whose reply was lost or corrupted is sent again
+    (exception responses are answers and are never retried), and how long
+    to wait first: exponential backoff from base_delay, capped at
+    max_delay, with each delay shortened by a random fraction of up to
+    `jitter` so drives that missed the same glitch do not retry in step.
+    """
+
+    def __init__(self, max_retries=2, base_delay=0.005, max_delay=0.1, jitter=0.5):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    def delay(self, attempt):
+        """Seconds to wait before retry number attempt (1-based)."""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return delay * (1 - self.jitter * random.random())
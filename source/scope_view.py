@@ -0,0 +1,174 @@
+# scope_view.py
+import numpy as np
+from PyQt6.QtCore import QTimer, QPointF, QRectF
+from PyQt6.QtGui import QColor, QPainter, QPen, QPolygonF
+from PyQt6.QtWidgets import QWidget
+
+TRACE_COLORS = ('#F1C40F', '#2ECC71', '#3498DB', '#E74C3C', '#9B59B6', '#1ABC9C', '#E67E22', '#ECF0F1')
+
+
+class ScopeBuffer:
+    """
+    Fixed-size ring of samples for a set of channels: one int64 array of
+    monotonic ns timestamps and one float64 row per channel (NaN for
+    samples whose register could not be read). Nothing is allocated per
+    sample.
+    """
+
+    def __init__(self, channel_ids, capacity=65536):
+        self.channel_ids = list(channel_ids)
+        self.capacity = capacity
+        self.times = np.zeros(capacity, dtype=np.int64)
+        self.values = np.full((len(self.channel_ids), capacity), np.nan)
+        self.count = 0  # samples appended so far
+
+    def append(self, timestamp_ns, values):
+        i = self.count % self.capacity
+        self.times[i] = timestamp_ns
+        for row, reg_id in enumerate(self.channel_ids):
+            value = values.get(reg_id)
+            self.values[row, i] = np.nan if value is None or isinstance(value, Exception) else value
+        self.count += 1
+
+    def clear(self):
+        self.count = 0
+
+    def latest_time(self):
+        return int(self.times[(self.count - 1) % self.capacity]) if self.count else None
+
+    def window(self, start_ns):
+        """Returns (times, values) of the samples at or after start_ns, oldest first; copies only the window."""
+        if self.count <= self.capacity:
+            times = self.times[:self.count]
+            i = np.searchsorted(times, start_ns)
+            return times[i:], self.values[:, i:self.count]
+        # Wrapped: [head:] holds the older samples, [:head] the newer ones
+        head = self.count % self.capacity
+        i = np.searchsorted(self.times[head:], start_ns)
+        if i < self.capacity - head:
+            return (np.concatenate((self.times[head + i:], self.times[:head])),
+                    np.concatenate((self.values[:, head + i:], self.values[:, :head]), axis=1))
+        j = np.searchsorted(self.times[:head], start_ns)
+        return self.times[j:head], self.values[:, j:head]
+
+
+def minmax_decimate(times, values, t0, t1, width):
+    """
+    Reduces samples to at most `width` pixel columns over [t0, t1]: for each
+    column that holds samples, the min and max of every channel in it
+    (NaNs ignored). Returns (columns, mins, maxs); the cost depends on the
+    samples in the window, and what is drawn on the width only.
+    """
+    if len(times) == 0 or width <= 0:
+        empty = np.empty((values.shape[0], 0))
+        return np.empty(0, dtype=np.int64), empty, empty
+    span = max(1, t1 - t0)
+    columns = np.clip((times - t0) * width // span, 0, width - 1)
+    starts = np.flatnonzero(np.concatenate(([True], columns[1:] != columns[:-1])))
+    with np.errstate(invalid='ignore'):
+        mins = np.fmin.reduceat(values, starts, axis=1)
+        maxs = np.fmax.reduceat(values, starts, axis=1)
+    return columns[starts], mins, maxs
+
+
+class ScopeWidget(QWidget):
+    """
+    Live traces of the monitor channels over the last `window_seconds`.
+
+    Samples only go into the ring buffer; a frame timer repaints when new
+    samples have arrived, so redraw cost is bounded by the frame rate and
+    the widget width, not by the sample rate or history length. Each trace
+    is scaled to its own range in the window, shown in the legend.
+    """
+
+    def __init__(self, capacity=65536, frame_rate=30, parent=None):
+        super().__init__(parent)
+        self.setMinimumHeight(240)
+        self.capacity = capacity
+        self.window_seconds = 10.0
+        self.buffer = ScopeBuffer([], capacity)
+        self._labels = {}
+        self._hidden = set()
+        self._drawn_count = 0
+
+        self._frame_timer = QTimer(self)
+        self._frame_timer.timeout.connect(self._on_frame)
+        self._frame_timer.start(max(1, round(1000 / frame_rate)))
+
+    def set_channels(self, channels):
+        """channels: [(id, label)]. Starts a new, empty buffer."""
+        self._labels = dict(channels)
+        self.buffer = ScopeBuffer(list(self._labels), self.capacity)
+        self._hidden &= set(self._labels)
+        self._drawn_count = -1
+
+    def set_channel_visible(self, reg_id, visible):
+        if visible:
+            self._hidden.discard(reg_id)
+        else:
+            self._hidden.add(reg_id)
+        self.update()
+
+    def set_window_seconds(self, seconds):
+        self.window_seconds = seconds
+        self.update()
+
+    def append(self, timestamp_ns, values):
+        self.buffer.append(timestamp_ns, values)
+
+    def clear(self):
+        self.buffer.clear()
+        self._drawn_count = -1
+
+    def _on_frame(self):
+        if self.buffer.count != self._drawn_count and self.isVisible():
+            self.update()
+
+    def paintEvent(self, event):
+        self._drawn_count = self.buffer.count
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#1E1E1E"))
+        plot = QRectF(self.rect()).adjusted(8, 8, -8, -8)
+        width = int(plot.width())
+
+        painter.setPen(QPen(QColor("#3A3A3A"), 1))
+        for k in range(1, 10):
+            x = plot.left() + plot.width() * k / 10
+            painter.drawLine(QPointF(x, plot.top()), QPointF(x, plot.bottom()))
+        for k in range(1, 4):
+            y = plot.top() + plot.height() * k / 4
+            painter.drawLine(QPointF(plot.left(), y), QPointF(plot.right(), y))
+
+        t1 = self.buffer.latest_time()
+        if t1 is None or width <= 0:
+            return
+        t0 = t1 - int(self.window_seconds * 1e9)
+        times, values = self.buffer.window(t0)
+        columns, mins, maxs = minmax_decimate(times, values, t0, t1, width)
+
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+        legend_y = plot.top() + 14
+        for row, reg_id in enumerate(self.buffer.channel_ids):
+            if reg_id in self._hidden:
+                continue
+            color = QColor(TRACE_COLORS[row % len(TRACE_COLORS)])
+            valid = ~np.isnan(mins[row])
+            if not valid.any():
+                continue
+            lo, hi = float(mins[row][valid].min()), float(maxs[row][valid].max())
+            scale = plot.height() / (hi - lo) if hi > lo else 0.0
+            mid = plot.center().y()
+
+            # Two points per column (max, then min) draw the envelope of the samples in it
+            xs = plot.left() + columns[valid].astype(float)
+            y_max = plot.bottom() - (maxs[row][valid] - lo) * scale if scale else np.full(len(xs), mid)
+            y_min = plot.bottom() - (mins[row][valid] - lo) * scale if scale else np.full(len(xs), mid)
+            points = [QPointF(x, y) for x, a, b in zip(xs.tolist(), y_max.tolist(), y_min.tolist())
+                      for y in (a, b)]
+            painter.setPen(QPen(color, 1))
+            painter.drawPolyline(QPolygonF(points))
+
+            last = values[row, -1] if values.shape[1] else np.nan
+            painter.drawText(QPointF(plot.left() + 4, legend_y),
+                             f"{self._labels.get(reg_id, reg_id)}: {last:g}  [{lo:g} .. {hi:g}]")
+            legend_y += 16
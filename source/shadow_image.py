@@ -0,0 +1,106 @@
+# shadow_image.py
+import time
+from array import array
+
+from register_catalog import COMMAND_REGISTER_IDS
+
+# Where a shadow word came from
+SOURCE_UNKNOWN = 0
+SOURCE_READ = 1
+SOURCE_WRITTEN = 2
+
+
+class ShadowImage:
+    """
+    Last known raw words of one drive, indexed by register address.
+
+    Next to each word it keeps the time it was obtained (time.monotonic)
+    and its source (read from or written to the drive; unknown words have
+    never been seen or were invalidated). The arrays grow to the highest
+    address stored.
+    """
+    __slots__ = ('words', 'stamps', 'sources')
+
+    def __init__(self, size=0):
+        self.words = array('H', bytes(2 * size))
+        self.stamps = array('d', bytes(8 * size))
+        self.sources = bytearray(size)
+
+    def __len__(self):
+        return len(self.sources)
+
+    def _grow(self, end):
+        extra = end - len(self.sources)
+        if extra > 0:
+            self.words.frombytes(bytes(2 * extra))
+            self.stamps.frombytes(bytes(8 * extra))
+            self.sources.extend(bytes(extra))
+
+    def store(self, start, words, source, now=None):
+        """Records words at start..start+len(words) as obtained now from source."""
+        count = len(words)
+        if not count:
+            return
+        end = start + count
+        self._grow(end)
+        if now is None:
+            now = time.monotonic()
+        self.words[start:end] = array('H', words)
+        self.stamps[start:end] = array('d', (now,)) * count
+        self.sources[start:end] = bytes((source,)) * count
+
+    def invalidate(self, start=0, count=None):
+        """Forgets count words from start (default: everything from start on)."""
+        end = len(self.sources) if count is None else min(start + count, len(self.sources))
+        if end > start:
+            self.sources[start:end] = bytes(end - start)
+
+    def get(self, start, count, max_age=None, now=None):
+        """
+        Returns the count words from start if every one of them is known and
+        at most max_age seconds old (None: any age), otherwise None.
+        """
+        end = start + count
+        if end > len(self.sources) or not all(self.sources[start:end]):
+            return None
+        if max_age is not None:
+            if now is None:
+                now = time.monotonic()
+            if now - min(self.stamps[start:end]) > max_age:
+                return None
+        return self.words[start:end].tolist()
+
+
+class CachePolicy:
+    """
+    Decides how old a shadow value may be and still be served instead of a
+    bus read: 0 means never cached, None means fresh until the register is
+    written or the drive is reconnected.
+
+    Defaults: SU-xx monitor values and other read-only status registers
+    (fault history, ...) are set by the drive and never cached, nor are
+    command registers, which clear themselves once the command ran;
+    configuration registers only change when we write them, so they stay
+    fresh.
+    """
+
+    def __init__(self, never_cached=('SU-',) + COMMAND_REGISTER_IDS, status_max_age=0, config_max_age=None):
+        self.never_cached = tuple(never_cached)
+        self.status_max_age = status_max_age
+        self.config_max_age = config_max_age
+        self._max_ages = {}  # id -> max age, resolved once per register
+
+    def max_age(self, config):
+        reg_id = config['id']
+        try:
+            return self._max_ages[reg_id]
+        except KeyError:
+            pass
+        if reg_id.startswith(self.never_cached):
+            max_age = 0
+        elif config.get('read_only', False):
+            max_age = self.status_max_age
+        else:
+            max_age = self.config_max_age
+        self._max_ages[reg_id] = max_age
+        return max_age
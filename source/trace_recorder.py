@@ -0,0 +1,195 @@
+# trace_recorder.py
+import mmap
+import struct
+import sys
+import threading
+from array import array
+
+TRACE_MAGIC = b'HSXT'
+TRACE_VERSION = 1
+TRACE_SUFFIX = '.hsxt'
+# Stored for samples whose register could not be read
+MISSING = -2 ** 63
+
+# magic, version, channel count, header size (channel ids follow, zero-padded)
+_FILE_HEADER = struct.Struct('<4sHHI')
+# magic, row count, reserved; columns follow: timestamps, then one per channel
+_CHUNK_HEADER = struct.Struct('<4sIQ')
+_CHUNK_MAGIC = b'CHNK'
+
+
+def _le(column):
+    if sys.byteorder != 'little':
+        column = array('q', column)
+        column.byteswap()
+    return column
+
+
+class TraceRecorder:
+    """
+    Appends monitor samples of a fixed set of channels (register ids) to a
+    columnar trace file.
+
+    append() only copies one row into a preallocated ring of column arrays
+    and returns, so it can be called from the polling thread; a dedicated
+    writer thread drains the ring into chunks (a header plus one int64
+    column of monotonic ns timestamps and one int64 column per channel).
+    If the writer falls behind and the ring fills up, new rows are dropped
+    and counted rather than blocking the caller. Columns are 8-byte aligned,
+    so TraceFile can map them without copying.
+    """
+
+    def __init__(self, path, channel_ids, capacity=65536, chunk_rows=4096, flush_interval=1.0):
+        self.path = path
+        self.channel_ids = list(channel_ids)
+        self.capacity = capacity
+        self.chunk_rows = min(chunk_rows, capacity)
+        self.flush_interval = flush_interval
+        self.rows_written = 0
+        self.dropped = 0
+
+        self._columns = [array('q', bytes(8 * capacity)) for _ in range(len(self.channel_ids) + 1)]
+        self._head = 0  # next row to fill
+        self._count = 0  # rows waiting for the writer
+        self._cond = threading.Condition()
+        self._closing = False
+
+        ids = '\n'.join(self.channel_ids).encode('utf-8')
+        header_size = -(-(_FILE_HEADER.size + len(ids)) // 8) * 8
+        self._file = open(path, 'wb')
+        self._file.write(_FILE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, len(self.channel_ids), header_size))
+        self._file.write(ids.ljust(header_size - _FILE_HEADER.size, b'\0'))
+        self._writer = threading.Thread(target=self._run, name=f"TraceRecorder({path})", daemon=True)
+        self._writer.start()
+
+    def append(self, timestamp_ns, values):
+        """Queues one sample ({id: value or exception}); never waits for the disk."""
+        with self._cond:
+            if self._closing:
+                return
+            if self._count == self.capacity:
+                self.dropped += 1
+                return
+            head = self._head
+            self._columns[0][head] = timestamp_ns
+            for column, reg_id in zip(self._columns[1:], self.channel_ids):
+                value = values.get(reg_id)
+                column[head] = MISSING if value is None or isinstance(value, Exception) else value
+            self._head = (head + 1) % self.capacity
+            self._count += 1
+            if self._count >= self.chunk_rows:
+                self._cond.notify()
+
+    def close(self):
+        """Writes the remaining rows and closes the file."""
+        with self._cond:
+            if self._closing:
+                return
+            self._closing = True
+            self._cond.notify()
+        self._writer.join()
+        self._file.close()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._closing and self._count < self.chunk_rows:
+                    self._cond.wait(self.flush_interval)
+                count = min(self._count, self.chunk_rows)
+                start = (self._head - self._count) % self.capacity
+                closing = self._closing
+            if count:
+                # The rows [start, start + count) are not touched by append
+                # until _count is lowered, so they are read without the lock
+                self._write_chunk(start, count)
+                with self._cond:
+                    self._count -= count
+                self.rows_written += count
+            elif closing:
+                return
+
+    def _write_chunk(self, start, count):
+        end = start + count
+        parts = [_CHUNK_HEADER.pack(_CHUNK_MAGIC, count, 0)]
+        for column in self._columns:
+            if end <= self.capacity:
+                parts.append(_le(column[start:end]).tobytes())
+            else:
+                parts.append(_le(column[start:] + column[:end - self.capacity]).tobytes())
+        self._file.write(b''.join(parts))
+        self._file.flush()
+
+
+class TraceFile:
+    """
+    Read access to a trace file through mmap: opening only walks the chunk
+    headers, and chunk columns are int64 memoryviews into the mapping
+    (release them before close()). A chunk cut short by a crash ends the
+    trace.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        magic, version, channels, header_size = _FILE_HEADER.unpack_from(self._map)
+        if magic != TRACE_MAGIC:
+            raise ValueError("不是监控记录文件")
+        if version != TRACE_VERSION:
+            raise ValueError(f"不支持的记录版本 {version}")
+        ids = bytes(self._map[_FILE_HEADER.size:header_size]).rstrip(b'\0').decode('utf-8')
+        self.channel_ids = ids.split('\n') if channels else []
+
+        self._chunks = []  # (offset of the first column, rows)
+        offset = header_size
+        columns = len(self.channel_ids) + 1
+        while offset + _CHUNK_HEADER.size <= len(self._map):
+            magic, rows, _ = _CHUNK_HEADER.unpack_from(self._map, offset)
+            end = offset + _CHUNK_HEADER.size + 8 * rows * columns
+            if magic != _CHUNK_MAGIC or end > len(self._map):
+                break
+            self._chunks.append((offset + _CHUNK_HEADER.size, rows))
+            offset = end
+
+    def __len__(self):
+        return sum(rows for _, rows in self._chunks)
+
+    def close(self):
+        self._view.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _column_views(self, index):
+        for offset, rows in self._chunks:
+            start = offset + 8 * rows * index
+            yield self._view[start:start + 8 * rows]
+
+    def chunk_columns(self, channel_id=None):
+        """Yields each chunk's column (timestamps if channel_id is None) as an int64 memoryview, without copying."""
+        index = 0 if channel_id is None else self.channel_ids.index(channel_id) + 1
+        for view in self._column_views(index):
+            yield view.cast('q')
+
+    def timestamps(self):
+        """All timestamps (monotonic ns) as one array."""
+        return self._join(self._column_views(0))
+
+    def column(self, channel_id):
+        """All values of one channel as one array; MISSING marks failed reads."""
+        return self._join(self._column_views(self.channel_ids.index(channel_id) + 1))
+
+    @staticmethod
+    def _join(views):
+        result = array('q')
+        for view in views:
+            result.frombytes(view)
+            view.release()
+        if sys.byteorder != 'little':
+            result.byteswap()
+        return result